@@ -0,0 +1,254 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+def select_reference(y_matrix):
+    """
+    Select the run that is most representative of a set of chromatograms.
+
+    The reference is the run with the highest correlation to the median
+    chromatogram of all runs.
+
+    Args:
+        y_matrix (numpy.ndarray): Chromatograms on a common axis, shape (runs, points)
+
+    Returns:
+        int: Index of the reference run
+    """
+    y_matrix = np.asarray(y_matrix, dtype=float)
+    median = np.median(y_matrix, axis=0)
+    centered = y_matrix - y_matrix.mean(axis=1, keepdims=True)
+    median = median - median.mean()
+    norms = np.linalg.norm(centered, axis=1) * np.linalg.norm(median)
+    corr = centered @ median / np.where(norms > 0, norms, 1.0)
+    return int(np.argmax(corr))
+
+
+def estimate_shifts(y_matrix, reference, max_shift=None):
+    """
+    Estimate the shift of every run against a reference via FFT cross-correlation.
+
+    All runs are transformed in one batched FFT. The integer lag of the
+    correlation maximum is refined to sub-sample precision by parabolic
+    interpolation.
+
+    Args:
+        y_matrix (numpy.ndarray): Chromatograms on a common axis, shape (runs, points)
+        reference (numpy.ndarray): Reference chromatogram, shape (points,)
+        max_shift (int, optional): Maximum absolute shift in points
+
+    Returns:
+        numpy.ndarray: Shifts in points, positive if the run lags the reference
+    """
+    y_matrix = np.atleast_2d(np.asarray(y_matrix, dtype=float))
+    reference = np.asarray(reference, dtype=float)
+    n = y_matrix.shape[1]
+    if max_shift is None:
+        max_shift = n // 2
+    max_shift = int(min(max_shift, n - 1))
+
+    # Zero padding to 2n avoids circular wrap-around of the correlation
+    n_fft = 2 * n
+    runs = y_matrix - y_matrix.mean(axis=1, keepdims=True)
+    ref = reference - reference.mean()
+    spectrum = np.fft.rfft(runs, n=n_fft, axis=1) * np.conj(np.fft.rfft(ref, n=n_fft))
+    corr = np.fft.irfft(spectrum, n=n_fft, axis=1)
+
+    # Reorder lags to -max_shift ... +max_shift
+    lags = np.arange(-max_shift, max_shift + 1)
+    window = corr[:, lags % n_fft]
+    best = np.argmax(window, axis=1)
+
+    # Parabolic sub-sample refinement
+    rows = np.arange(len(best))
+    inner = (best > 0) & (best < len(lags) - 1)
+    left = window[rows, np.maximum(best - 1, 0)]
+    center = window[rows, best]
+    right = window[rows, np.minimum(best + 1, len(lags) - 1)]
+    denominator = left - 2 * center + right
+    offset = np.where(inner & (denominator != 0), 0.5 * (left - right) / np.where(denominator != 0, denominator, 1.0), 0.0)
+
+    return lags[best] + offset
+
+
+def apply_shifts(y_matrix, shifts, fill_value=np.nan):
+    """
+    Shift every run by a (fractional) number of points.
+
+    Args:
+        y_matrix (numpy.ndarray): Chromatograms, shape (runs, points)
+        shifts (numpy.ndarray): Shift per run in points, as from estimate_shifts
+        fill_value (float): Value for points shifted in from outside
+
+    Returns:
+        numpy.ndarray: Shifted chromatograms, shape (runs, points)
+    """
+    y_matrix = np.atleast_2d(np.asarray(y_matrix, dtype=float))
+    n = y_matrix.shape[1]
+    source = np.arange(n)[np.newaxis, :] + np.asarray(shifts, dtype=float)[:, np.newaxis]
+
+    left = np.clip(np.floor(source).astype(int), 0, n - 2)
+    weight = source - left
+    rows = np.arange(len(y_matrix))[:, np.newaxis]
+    aligned = y_matrix[rows, left] * (1.0 - weight) + y_matrix[rows, left + 1] * weight
+    aligned[(source < 0) | (source > n - 1)] = fill_value
+    return aligned
+
+
+def cow_warp(y, reference, segment_length=50, slack=5):
+    """
+    Correlation optimized warping (COW) of one run onto a reference.
+
+    The reference is divided into segments of segment_length points. The
+    corresponding segment boundaries in the run may move by up to slack
+    points per segment; the boundary positions maximizing the summed
+    segment correlations are found by dynamic programming. Only boundary
+    positions within the band reachable under the slack constraint are
+    evaluated.
+
+    Args:
+        y (numpy.ndarray): Run to warp, shape (points,)
+        reference (numpy.ndarray): Reference, same length as y
+        segment_length (int): Segment length in points
+        slack (int): Maximum change of a segment length in points
+
+    Returns:
+        tuple: (warped, boundaries) with the warped run and the optimal
+            boundary positions in the run
+    """
+    y = np.asarray(y, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    n = len(reference)
+    if len(y) != n:
+        raise ValueError("Run and reference must have the same length.")
+
+    ref_bounds = np.arange(0, n, segment_length)
+    if ref_bounds[-1] != n - 1:
+        # A short remainder is merged into the last full segment
+        if len(ref_bounds) > 1 and n - 1 - ref_bounds[-1] < segment_length // 2:
+            ref_bounds = ref_bounds[:-1]
+        ref_bounds = np.append(ref_bounds, n - 1)
+    n_segments = len(ref_bounds) - 1
+    if n_segments < 1:
+        return y.copy(), ref_bounds
+
+    # Band of feasible positions for every boundary
+    low = np.empty(n_segments + 1, dtype=int)
+    high = np.empty(n_segments + 1, dtype=int)
+    for k in range(n_segments + 1):
+        from_start = k * slack
+        from_end = (n_segments - k) * slack
+        low[k] = max(ref_bounds[k] - min(from_start, from_end), k)
+        high[k] = min(ref_bounds[k] + min(from_start, from_end), n - 1 - (n_segments - k))
+
+    scores = [np.array([0.0])]
+    back = [np.array([0])]
+
+    for k in range(1, n_segments + 1):
+        ref_len = ref_bounds[k] - ref_bounds[k - 1]
+        ref_seg = reference[ref_bounds[k - 1]:ref_bounds[k] + 1]
+        ref_seg = ref_seg - ref_seg.mean()
+        ref_norm = np.linalg.norm(ref_seg)
+        t = np.arange(ref_len + 1)
+
+        positions = np.arange(low[k], high[k] + 1)
+        best_score = np.full(len(positions), -np.inf)
+        best_prev = np.zeros(len(positions), dtype=int)
+
+        for u in range(-slack, slack + 1):
+            seg_len = ref_len + u
+            if seg_len < 1:
+                continue
+            starts = positions - seg_len
+            valid = (starts >= low[k - 1]) & (starts <= high[k - 1])
+            if not np.any(valid):
+                continue
+            prev_scores = scores[k - 1][starts[valid] - low[k - 1]]
+
+            # Interpolate each candidate run segment onto the reference segment length
+            sample_pos = starts[valid][:, np.newaxis] + t[np.newaxis, :] * (seg_len / ref_len)
+            left = np.minimum(np.floor(sample_pos).astype(int), n - 2)
+            weight = sample_pos - left
+            segments = y[left] * (1.0 - weight) + y[left + 1] * weight
+            segments = segments - segments.mean(axis=1, keepdims=True)
+            norms = np.linalg.norm(segments, axis=1) * ref_norm
+            corr = segments @ ref_seg / np.where(norms > 0, norms, 1.0)
+
+            total = prev_scores + corr
+            idx = np.flatnonzero(valid)
+            better = total > best_score[idx]
+            best_score[idx[better]] = total[better]
+            best_prev[idx[better]] = starts[valid][better]
+
+        scores.append(best_score)
+        back.append(best_prev)
+
+    # Backtrack from the fixed end point
+    boundaries = np.empty(n_segments + 1, dtype=int)
+    boundaries[-1] = n - 1
+    for k in range(n_segments, 0, -1):
+        boundaries[k - 1] = back[k][boundaries[k] - low[k]]
+
+    # Piecewise linear warp: reference positions -> run positions
+    source = np.interp(np.arange(n), ref_bounds, boundaries)
+    warped = np.interp(source, np.arange(n), y)
+    return warped, boundaries
+
+
+def _cow_worker(args):
+    y, reference, segment_length, slack = args
+    return cow_warp(y, reference, segment_length, slack)
+
+
+def align_runs(y_matrix, reference=None, method="shift", max_shift=None,
+               segment_length=50, slack=5, n_jobs=None):
+    """
+    Align a set of chromatograms against a reference run.
+
+    Args:
+        y_matrix (numpy.ndarray): Chromatograms on a common axis, shape (runs, points)
+        reference (int or numpy.ndarray, optional): Index of the reference run
+            or a reference chromatogram. If None, select_reference is used.
+        method (str): "shift" (FFT cross-correlation, one rigid shift per run)
+            or "cow" (correlation optimized warping)
+        max_shift (int, optional): Maximum shift in points for "shift"
+        segment_length (int): Segment length for "cow"
+        slack (int): Slack for "cow"
+        n_jobs (int, optional): Worker processes for "cow". If None, all CPUs
+            are used; 1 runs in the calling process.
+
+    Returns:
+        dict: Aligned chromatograms ("aligned"), the reference index or None
+            ("reference_index"), and per-run "shifts" or "boundaries"
+    """
+    y_matrix = np.atleast_2d(np.asarray(y_matrix, dtype=float))
+
+    reference_index = None
+    if reference is None:
+        reference = select_reference(y_matrix)
+    if np.isscalar(reference):
+        reference_index = int(reference)
+        reference = y_matrix[reference_index]
+
+    if method == "cow":
+        jobs = [(y, reference, segment_length, slack) for y in y_matrix]
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(jobs) == 1:
+            results = [_cow_worker(job) for job in jobs]
+        else:
+            chunksize = max(1, len(jobs) // (4 * n_jobs))
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(_cow_worker, jobs, chunksize=chunksize))
+        return {
+            "aligned": np.array([r[0] for r in results]),
+            "boundaries": np.array([r[1] for r in results]),
+            "reference_index": reference_index,
+        }
+
+    shifts = estimate_shifts(y_matrix, reference, max_shift=max_shift)
+    return {
+        "aligned": apply_shifts(y_matrix, shifts),
+        "shifts": shifts,
+        "reference_index": reference_index,
+    }
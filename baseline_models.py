@@ -0,0 +1,366 @@
+import numpy as np
+
+from resampling import axis_key
+
+
+def polynomial_basis(x, degree):
+    """
+    Vandermonde basis 1, x, x^2, ..., x^degree.
+
+    Args:
+        x (numpy.ndarray): X-axis values
+        degree (int): Highest power
+
+    Returns:
+        numpy.ndarray: Basis, shape (degree + 1, points)
+    """
+    x = np.asarray(x, dtype=float)
+    basis = np.empty((degree + 1, len(x)))
+    basis[0] = 1.0
+    for i in range(1, degree + 1):
+        # Each power from the previous one instead of x ** i
+        np.multiply(basis[i - 1], x, out=basis[i])
+    return basis
+
+
+def bspline_basis(x, n_basis, degree=3):
+    """
+    Clamped B-spline basis with uniformly spaced knots over the x range.
+
+    Evaluated with the Cox-de Boor recursion for all points at once. The
+    basis functions sum to 1 everywhere, so the coefficients are roughly
+    the baseline values at n_basis points spread over the axis.
+
+    Args:
+        x (numpy.ndarray): X-axis values
+        n_basis (int): Number of basis functions (>= degree + 1)
+        degree (int): Spline degree (3 = cubic)
+
+    Returns:
+        numpy.ndarray: Basis, shape (n_basis, points)
+    """
+    if n_basis < degree + 1:
+        raise ValueError(f"A degree {degree} spline needs at least {degree + 1} coefficients.")
+    x = np.asarray(x, dtype=float)
+    low, high = x.min(), x.max()
+    inner = np.linspace(low, high, n_basis - degree + 1)
+    knots = np.concatenate([np.full(degree, low), inner, np.full(degree, high)])
+
+    basis = ((x >= knots[:-1, np.newaxis]) & (x < knots[1:, np.newaxis])).astype(float)
+    # The last non-empty interval also contains its right end
+    last = np.flatnonzero(knots[1:] > knots[:-1])
+    if len(last):
+        basis[last[-1], x == high] = 1.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for k in range(1, degree + 1):
+            n = len(knots) - k - 1
+            left_span = (knots[k:k + n] - knots[:n])[:, np.newaxis]
+            right_span = (knots[k + 1:k + 1 + n] - knots[1:1 + n])[:, np.newaxis]
+            left = np.where(left_span > 0, (x - knots[:n, np.newaxis]) / left_span, 0.0)
+            right = np.where(right_span > 0, (knots[k + 1:k + 1 + n, np.newaxis] - x) / right_span, 0.0)
+            basis = left * basis[:-1] + right * basis[1:]
+    return basis
+
+
+def piecewise_linear_basis(x, breakpoints, origin=0.0):
+    """
+    Basis of continuous piecewise linear functions (hinge functions).
+
+    The rows are 1, x - origin and max(0, x - b) for every breakpoint b, so
+    a baseline is an offset, a start slope and one slope change per breakpoint.
+
+    Args:
+        x (numpy.ndarray): X-axis values
+        breakpoints (array-like): Positions where the slope changes
+        origin (float): Position of the offset
+
+    Returns:
+        numpy.ndarray: Basis, shape (len(breakpoints) + 2, points)
+    """
+    x = np.asarray(x, dtype=float)
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    basis = np.empty((len(breakpoints) + 2, len(x)))
+    basis[0] = 1.0
+    basis[1] = x - origin
+    np.maximum(x - breakpoints[:, np.newaxis], 0.0, out=basis[2:])
+    return basis
+
+
+class BaselineModel:
+    """
+    Base class for baseline models used by the spectral data generator.
+
+    Every baseline is a linear combination of basis functions of x: the
+    basis matrix (basis functions x points) depends only on the axis and
+    on the shape parameters of the model (e.g. the decay rate or the
+    polynomial degree), the amplitudes are coefficients. Basis matrices
+    are cached per axis and shape, so repeated spectra on the same axis
+    only pay for one matrix product, and a whole batch of baselines with
+    different coefficients comes from a single (batch x coefficients) by
+    (coefficients x points) product.
+
+    A basis is only cached when the same axis and shape are requested a
+    second time, so spectra whose axis or shape parameters change with
+    every call (e.g. varied decay rates or jittered sampling) do not fill
+    the cache. The cache is limited to max_cache_bytes; the oldest entries
+    are dropped first.
+    """
+
+    default_params = {}
+
+    # Cached basis matrices shared by all models
+    max_cached_bases = 32
+    max_cache_bytes = 256 * 2 ** 20
+    _basis_cache = {}
+    _cache_bytes = 0
+    # Keys requested once so far (without their basis), oldest first
+    _seen_keys = {}
+    max_seen_keys = 256
+
+    def __init__(self, params=None):
+        """
+        Initialize the baseline model.
+
+        Args:
+            params (dict, optional): Model-specific parameters (other keys are ignored)
+        """
+        self.params = self.default_params.copy()
+        if params:
+            self.params.update({k: v for k, v in params.items() if k in self.default_params})
+
+    def shape_key(self):
+        """Parameters that determine the basis matrix (hashable)."""
+        return ()
+
+    def build_basis(self, x):
+        """Compute the basis matrix, shape (basis functions, points)."""
+        raise NotImplementedError("Subclasses must implement build_basis")
+
+    def coefficients(self):
+        """Coefficients of the baseline described by the parameters."""
+        raise NotImplementedError("Subclasses must implement coefficients")
+
+    def basis(self, x):
+        """
+        Get the (cached) basis matrix for an axis.
+
+        Args:
+            x (numpy.ndarray): X-axis values
+
+        Returns:
+            numpy.ndarray: Basis matrix, shape (basis functions, points); do not modify
+        """
+        key = (type(self).__name__, self.shape_key(), axis_key(x))
+        basis = BaselineModel._basis_cache.get(key)
+        if basis is None:
+            basis = self.build_basis(x)
+            basis.setflags(write=False)
+            self._store_basis(key, basis)
+        return basis
+
+    @classmethod
+    def _store_basis(cls, key, basis):
+        """Cache a basis on its second request, within the size limits."""
+        seen = BaselineModel._seen_keys
+        if seen.pop(key, None) is None:
+            if len(seen) >= cls.max_seen_keys:
+                seen.pop(next(iter(seen)))
+            seen[key] = True
+            return
+        if basis.nbytes > cls.max_cache_bytes:
+            return
+
+        cache = BaselineModel._basis_cache
+        while cache and (len(cache) >= cls.max_cached_bases
+                         or BaselineModel._cache_bytes + basis.nbytes > cls.max_cache_bytes):
+            BaselineModel._cache_bytes -= cache.pop(next(iter(cache))).nbytes
+        cache[key] = basis
+        BaselineModel._cache_bytes += basis.nbytes
+
+    @staticmethod
+    def clear_cache():
+        """Drop all cached basis matrices."""
+        BaselineModel._basis_cache.clear()
+        BaselineModel._seen_keys.clear()
+        BaselineModel._cache_bytes = 0
+
+    def evaluate(self, x, coeffs=None):
+        """
+        Evaluate the baseline(s) on an axis.
+
+        Args:
+            x (numpy.ndarray): X-axis values
+            coeffs (array-like, optional): Coefficients, shape (basis functions,)
+                for one baseline or (batch, basis functions) for a batch.
+                If None, the coefficients from the parameters are used.
+
+        Returns:
+            numpy.ndarray: Baseline, shape (points,) or (batch, points)
+        """
+        coeffs = self.coefficients() if coeffs is None else np.asarray(coeffs, dtype=float)
+        return coeffs @ self.basis(x)
+
+
+class FlatBaseline(BaselineModel):
+    """Zero baseline."""
+
+    def build_basis(self, x):
+        return np.zeros((1, len(x)))
+
+    def coefficients(self):
+        return np.zeros(1)
+
+
+class PolynomialBaseline(BaselineModel):
+    """Polynomial baseline c0 + c1*x + c2*x^2 + ..."""
+
+    default_params = {
+        "polynomial_coeffs": [0.0, 0.0],
+    }
+
+    def shape_key(self):
+        return (len(self.params["polynomial_coeffs"]) - 1,)
+
+    def build_basis(self, x):
+        return polynomial_basis(x, len(self.params["polynomial_coeffs"]) - 1)
+
+    def coefficients(self):
+        return np.asarray(self.params["polynomial_coeffs"], dtype=float)
+
+
+class ExponentialBaseline(BaselineModel):
+    """Exponential baseline a * exp(-b*x); the decay b is a shape parameter."""
+
+    default_params = {
+        "exp_amplitude": 0.1,
+        "exp_decay": 0.5,
+    }
+
+    def shape_key(self):
+        return (float(self.params["exp_decay"]),)
+
+    def build_basis(self, x):
+        return np.exp(-self.params["exp_decay"] * np.asarray(x, dtype=float))[np.newaxis, :]
+
+    def coefficients(self):
+        return np.array([self.params["exp_amplitude"]], dtype=float)
+
+
+class SinusoidalBaseline(BaselineModel):
+    """
+    Sinusoidal baseline a * sin(2*pi*f*x + p).
+
+    Written as a*cos(p) * sin(2*pi*f*x) + a*sin(p) * cos(2*pi*f*x), so
+    amplitude and phase are coefficients and only the frequency shapes
+    the basis.
+    """
+
+    default_params = {
+        "sin_amplitude": 0.05,
+        "sin_frequency": 0.5,
+        "sin_phase": 0.0,
+    }
+
+    def shape_key(self):
+        return (float(self.params["sin_frequency"]),)
+
+    def build_basis(self, x):
+        angle = 2 * np.pi * self.params["sin_frequency"] * np.asarray(x, dtype=float)
+        return np.vstack([np.sin(angle), np.cos(angle)])
+
+    def coefficients(self):
+        amp, phase = self.params["sin_amplitude"], self.params["sin_phase"]
+        return np.array([amp * np.cos(phase), amp * np.sin(phase)])
+
+
+class SplineBaseline(BaselineModel):
+    """Smooth drift as a B-spline with uniformly spaced knots over the axis."""
+
+    default_params = {
+        "spline_coeffs": [0.05, 0.08, 0.04, 0.06, 0.03, 0.05],
+        "spline_degree": 3,
+    }
+
+    def shape_key(self):
+        return (len(self.params["spline_coeffs"]), int(self.params["spline_degree"]))
+
+    def build_basis(self, x):
+        return bspline_basis(x, len(self.params["spline_coeffs"]), int(self.params["spline_degree"]))
+
+    def coefficients(self):
+        return np.asarray(self.params["spline_coeffs"], dtype=float)
+
+
+class PiecewiseBaseline(BaselineModel):
+    """
+    Continuous piecewise linear drift.
+
+    Starts at piecewise_offset at the beginning of the axis and changes its
+    slope at every breakpoint (len(piecewise_slopes) = len(breakpoints) + 1).
+    """
+
+    default_params = {
+        "piecewise_offset": 0.05,
+        "piecewise_breakpoints": [3.0, 7.0],
+        "piecewise_slopes": [0.01, -0.005, 0.01],
+    }
+
+    def shape_key(self):
+        return tuple(float(b) for b in self.params["piecewise_breakpoints"])
+
+    def build_basis(self, x):
+        x = np.asarray(x, dtype=float)
+        return piecewise_linear_basis(x, self.params["piecewise_breakpoints"], origin=x.min())
+
+    def coefficients(self):
+        slopes = np.asarray(self.params["piecewise_slopes"], dtype=float)
+        if len(slopes) != len(self.params["piecewise_breakpoints"]) + 1:
+            raise ValueError("piecewise_slopes needs one slope more than piecewise_breakpoints.")
+        return np.concatenate([[self.params["piecewise_offset"], slopes[0]], np.diff(slopes)])
+
+
+# Registry of available baseline types
+BASELINE_MODELS = {
+    "polynomial": PolynomialBaseline,
+    "exponential": ExponentialBaseline,
+    "sinusoidal": SinusoidalBaseline,
+    "spline": SplineBaseline,
+    "piecewise": PiecewiseBaseline,
+}
+
+
+def create_baseline_model(baseline_type, params=None):
+    """
+    Create a baseline model from its name.
+
+    Args:
+        baseline_type (str): Name of the baseline type
+        params (dict, optional): Baseline parameters (e.g. the generator's baseline_params)
+
+    Returns:
+        BaselineModel: The baseline model (unknown types give a flat baseline)
+    """
+    return BASELINE_MODELS.get(baseline_type, FlatBaseline)(params)
+
+
+# Example: batched baselines compared with one evaluation per spectrum
+if __name__ == "__main__":
+    import time
+
+    x = np.linspace(0, 10, 100_000)
+    model = create_baseline_model("polynomial", {"polynomial_coeffs": [0.05, -0.01, 0.001, -1e-5]})
+    rng = np.random.default_rng(0)
+    batch = model.coefficients() * rng.uniform(0.8, 1.2, (500, 4))
+
+    start = time.perf_counter()
+    looped = np.array([sum(c * x ** i for i, c in enumerate(coeffs)) for coeffs in batch])
+    print(f"Loop over x ** i: {time.perf_counter() - start:.3f} s")
+    start = time.perf_counter()
+    batched = model.evaluate(x, batch)
+    print(f"Cached basis, one matrix product: {time.perf_counter() - start:.3f} s, "
+          f"max. difference {np.abs(batched - looped).max():.2e}")
+
+    for name in BASELINE_MODELS:
+        baseline = create_baseline_model(name).evaluate(x)
+        print(f"{name:<12} min {baseline.min():.4f}  max {baseline.max():.4f}")
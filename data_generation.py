@@ -1,14 +1,10 @@
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 import os
-from scipy.stats import norm
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Image, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from PIL import Image as PILImage
-import shutil
+import time
+
+from noise_models import create_noise_model
+from baseline_models import create_baseline_model
+from peak_profiles import gaussian_profiles, lorentzian_profiles, voigt_profiles, sum_profiles
 
 
 class SpectralDataGenerator:
@@ -17,6 +13,12 @@ class SpectralDataGenerator:
     such as peaks, baseline drift, and noise.
     """
 
+    # Methods measured by enable_profiling
+    PROFILED_STAGES = (
+        "generate_spectrum", "generate_x_axis", "generate_baseline", "generate_peaks",
+        "add_noise", "add_artifacts", "save_spectrum", "plot_spectrum", "generate_pdf_report",
+    )
+
     def __init__(self, params=None):
         """
         Initialize the spectral data generator with parameters.
@@ -30,16 +32,25 @@ class SpectralDataGenerator:
             "x_min": 0.0,  # Start of x range
             "x_max": 10.0,  # End of x range
             "num_points": 1000,  # Number of data points
+            "x_sampling": "uniform",  # uniform, jittered (uniform grid with timing jitter) or random
+            "sampling_jitter": 0.3,  # For jittered: max. jitter as a fraction of the nominal step
+            "x_offset": 0.0,  # Time offset of the sampling window
+            "vary_sampling": False,  # Whether _vary_parameters also varies num_points and x_offset
 
             # Baseline parameters
-            "baseline_type": "polynomial",  # polynomial, exponential, or sinusoidal
+            "baseline_type": "polynomial",  # polynomial, exponential, sinusoidal, spline or piecewise
             "baseline_params": {
                 "polynomial_coeffs": [0.05, -0.01, 0.001],  # For polynomial: [c0, c1, c2, ...]
                 "exp_amplitude": 0.1,  # For exponential
                 "exp_decay": 0.5,  # For exponential
                 "sin_amplitude": 0.05,  # For sinusoidal
                 "sin_frequency": 0.5,  # For sinusoidal
-                "sin_phase": 0.0  # For sinusoidal
+                "sin_phase": 0.0,  # For sinusoidal
+                "spline_coeffs": [0.05, 0.08, 0.04, 0.06, 0.03, 0.05],  # For spline: B-spline coefficients
+                "spline_degree": 3,  # For spline
+                "piecewise_offset": 0.05,  # For piecewise: value at the start of the axis
+                "piecewise_breakpoints": [3.0, 7.0],  # For piecewise: positions of slope changes
+                "piecewise_slopes": [0.01, -0.005, 0.01]  # For piecewise: one slope per segment
             },
 
             # Peak parameters
@@ -52,10 +63,23 @@ class SpectralDataGenerator:
             "max_peak_height": 1.0,  # Maximum random peak height
             "min_peak_width": 0.05,  # Minimum random peak width
             "max_peak_width": 0.2,  # Maximum random peak width
+            "peak_lorentz_widths": None,  # Lorentzian HWHM of voigt peaks. If None, will be randomly generated
+            "min_lorentz_width": 0.02,  # Minimum random Lorentzian width (voigt)
+            "max_lorentz_width": 0.1,  # Maximum random Lorentzian width (voigt)
+            "voigt_method": "faddeeva",  # faddeeva (exact), pseudo (TCH pseudo-Voigt) or table (lookup table)
+            "peak_synthesis": "direct",  # direct (exact) or fft (FFT convolution for many peaks on uniform axes)
+            # Options of dense_synthesis.FFTPeakSynthesizer; in fft mode all peak widths are
+            # rounded to a grid with relative spacing width_tolerance
+            "fft_synthesis_params": {"width_tolerance": 0.02},
 
             # Noise parameters
             "noise_level": 0.01,  # Gaussian noise standard deviation
-            "noise_type": "gaussian",  # gaussian or poisson
+            "noise_type": "gaussian",  # gaussian, poisson, poisson_gaussian, colored, pink, drift or a list
+            "noise_params": {
+                "read_noise": 0.005,  # For poisson_gaussian: Gaussian read noise
+                "alpha": 1.0,  # For colored: spectral exponent of 1/f^alpha noise
+                "normal_threshold": 1000.0,  # For poisson: counts above which a normal approximation is used
+            },
 
             # Artifact parameters
             "add_spikes": False,  # Whether to add sharp spikes
@@ -69,9 +93,19 @@ class SpectralDataGenerator:
 
         # Update with user-provided parameters
         self.params = self.default_params.copy()
+        self.params["baseline_params"] = self.default_params["baseline_params"].copy()
+        self.params["noise_params"] = self.default_params["noise_params"].copy()
         if params:
             self.update_params(params)
 
+        # Optional StageProfiler (see enable_profiling); closed on disable if created here
+        self.profiler = None
+        self._owns_profiler = False
+
+        # FFT peak synthesizer and its options, created on first use (see _get_fft_synthesizer)
+        self._fft_synthesizer = None
+        self._fft_synthesizer_options = None
+
         # Create output directory structure
         self._create_output_directories()
 
@@ -96,6 +130,49 @@ class SpectralDataGenerator:
         if not os.path.exists(images_dir):
             os.makedirs(images_dir)
 
+    def enable_profiling(self, profiler=None, trace_memory=True):
+        """
+        Measure wall time, CPU time and allocations of the generation stages.
+
+        The methods in PROFILED_STAGES are wrapped on this instance only;
+        without profiling nothing is wrapped, so there is no overhead.
+
+        Args:
+            profiler (StageProfiler, optional): Profiler to record into.
+                If None, a new one is created and closed again by
+                disable_profiling (which stops tracemalloc if it started it).
+            trace_memory (bool): Whether a new profiler measures allocations
+
+        Returns:
+            StageProfiler: The profiler with the records
+        """
+        from stage_profiler import StageProfiler
+
+        self.disable_profiling()
+        self._owns_profiler = profiler is None
+        self.profiler = profiler or StageProfiler(trace_memory=trace_memory)
+        self.profiler.instrument(self, self.PROFILED_STAGES)
+        return self.profiler
+
+    def disable_profiling(self):
+        """
+        Remove the profiling wrappers.
+
+        A profiler created by enable_profiling is closed; its records stay
+        available. A profiler passed in by the caller is left open.
+
+        Returns:
+            StageProfiler: The profiler that was used (or None)
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.uninstrument(self, self.PROFILED_STAGES)
+            if self._owns_profiler:
+                profiler.close()
+            self.profiler = None
+            self._owns_profiler = False
+        return profiler
+
     def update_params(self, new_params):
         """
         Update parameters with new values.
@@ -105,8 +182,8 @@ class SpectralDataGenerator:
         """
         # Update top-level parameters
         for key, value in new_params.items():
-            if key == "baseline_params" and isinstance(value, dict):
-                # Update nested baseline parameters
+            if key in ("baseline_params", "noise_params", "fft_synthesis_params") and isinstance(value, dict):
+                # Update nested baseline/noise/FFT synthesis parameters
                 if key not in self.params:
                     self.params[key] = {}
                 for subkey, subvalue in value.items():
@@ -116,57 +193,88 @@ class SpectralDataGenerator:
 
     def generate_x_axis(self):
         """
-        Generate evenly spaced x-axis values.
+        Generate x-axis values.
+
+        With "x_sampling" set to "uniform" the points are evenly spaced. The
+        "jittered" mode perturbs every point of the even grid by up to
+        "sampling_jitter" nominal steps, "random" draws sorted random
+        sampling times. The whole window is shifted by "x_offset".
 
         Returns:
-            numpy.ndarray: X-axis values
+            numpy.ndarray: X-axis values (strictly increasing)
         """
-        return np.linspace(
-            self.params["x_min"],
-            self.params["x_max"],
-            self.params["num_points"]
-        )
+        x_min = self.params["x_min"] + self.params["x_offset"]
+        x_max = self.params["x_max"] + self.params["x_offset"]
+        num_points = self.params["num_points"]
+        sampling = self.params["x_sampling"]
+
+        x = np.linspace(x_min, x_max, num_points)
+
+        if sampling == "jittered" and num_points > 2:
+            step = (x_max - x_min) / (num_points - 1)
+            jitter = min(self.params["sampling_jitter"], 0.49) * step
+            x[1:-1] += np.random.uniform(-jitter, jitter, num_points - 2)
+        elif sampling == "random" and num_points > 2:
+            x[1:-1] = np.sort(np.random.uniform(x_min, x_max, num_points - 2))
+
+        return x
+
+    def get_baseline_model(self):
+        """
+        Get the baseline model for the current baseline parameters.
+
+        Returns:
+            BaselineModel: The baseline model
+        """
+        return create_baseline_model(self.params["baseline_type"], self.params["baseline_params"])
 
     def generate_baseline(self, x):
         """
         Generate baseline based on specified type.
 
+        The basis functions of the baseline type (powers of x, exponential,
+        sine/cosine, splines, hinge functions) are cached per x-axis, see
+        baseline_models.
+
         Args:
             x (numpy.ndarray): X-axis values
 
         Returns:
             numpy.ndarray: Baseline values
         """
-        baseline_type = self.params["baseline_type"]
-        baseline_params = self.params["baseline_params"]
-
-        if baseline_type == "polynomial":
-            # Polynomial baseline: c0 + c1*x + c2*x^2 + ...
-            coeffs = baseline_params.get("polynomial_coeffs", [0.0, 0.0])
-            baseline = np.zeros_like(x)
-            for i, coeff in enumerate(coeffs):
-                baseline += coeff * x ** i
-
-        elif baseline_type == "exponential":
-            # Exponential baseline: a * exp(-b*x)
-            amp = baseline_params.get("exp_amplitude", 0.1)
-            decay = baseline_params.get("exp_decay", 0.5)
-            baseline = amp * np.exp(-decay * x)
-
-        elif baseline_type == "sinusoidal":
-            # Sinusoidal baseline: a * sin(f*x + p)
-            amp = baseline_params.get("sin_amplitude", 0.05)
-            freq = baseline_params.get("sin_frequency", 0.5)
-            phase = baseline_params.get("sin_phase", 0.0)
-            baseline = amp * np.sin(2 * np.pi * freq * x + phase)
-
-        else:
-            # Default to flat baseline
-            baseline = np.zeros_like(x)
+        baseline = self.get_baseline_model().evaluate(x)
 
         # Ensure baseline is non-negative
         return np.maximum(baseline, 0)
 
+    def generate_baseline_batch(self, x, coeffs=None, batch_size=1, variation=0.2, rng=None):
+        """
+        Generate a batch of baselines with one matrix product.
+
+        All baselines share the baseline type and its shape parameters
+        (e.g. decay rate, frequency, knots) and differ in their coefficients.
+
+        Args:
+            x (numpy.ndarray): X-axis values
+            coeffs (array-like, optional): Coefficients, shape (batch, basis
+                functions). If None, batch_size coefficient sets are drawn by
+                scaling the current coefficients by a random factor in
+                [1 - variation, 1 + variation].
+            batch_size (int): Number of baselines if coeffs is None
+            variation (float): Relative coefficient variation if coeffs is None
+            rng (numpy.random.Generator, optional): Random generator. If None,
+                the global numpy random state is used.
+
+        Returns:
+            numpy.ndarray: Baselines with shape (batch, points)
+        """
+        model = self.get_baseline_model()
+        if coeffs is None:
+            rng = np.random if rng is None else rng
+            base = model.coefficients()
+            coeffs = base * rng.uniform(1 - variation, 1 + variation, (batch_size, len(base)))
+        return np.maximum(model.evaluate(x, np.atleast_2d(coeffs)), 0)
+
     def generate_gaussian_peak(self, x, position, height, width):
         """
         Generate a Gaussian peak.
@@ -180,7 +288,7 @@ class SpectralDataGenerator:
         Returns:
             numpy.ndarray: Gaussian peak values
         """
-        return height * np.exp(-0.5 * ((x - position) / width) ** 2)
+        return gaussian_profiles(x, position, height, width)[0]
 
     def generate_lorentzian_peak(self, x, position, height, width):
         """
@@ -190,36 +298,51 @@ class SpectralDataGenerator:
             x (numpy.ndarray): X-axis values
             position (float): Peak center position
             height (float): Peak height
-            width (float): Peak width (FWHM)
+            width (float): Peak width (HWHM)
 
         Returns:
             numpy.ndarray: Lorentzian peak values
         """
-        return height * (width ** 2 / ((x - position) ** 2 + width ** 2))
+        return lorentzian_profiles(x, position, height, width)[0]
 
-    def generate_voigt_peak(self, x, position, height, width, mixing=0.5):
+    def generate_voigt_peak(self, x, position, height, width, lorentz_width=None):
         """
         Generate a Voigt peak (convolution of Gaussian and Lorentzian).
-        Approximated as a weighted sum.
+
+        The Gaussian and Lorentzian widths are independent; the evaluation
+        method is selected by the "voigt_method" parameter.
 
         Args:
             x (numpy.ndarray): X-axis values
             position (float): Peak center position
             height (float): Peak height
-            width (float): Peak width
-            mixing (float): Mixing parameter between Gaussian and Lorentzian (0-1)
+            width (float): Gaussian width (sigma)
+            lorentz_width (float, optional): Lorentzian width (HWHM). If None,
+                the Gaussian width is used.
 
         Returns:
             numpy.ndarray: Voigt peak values
         """
-        gaussian = self.generate_gaussian_peak(x, position, height, width)
-        lorentzian = self.generate_lorentzian_peak(x, position, height, width)
-        return mixing * gaussian + (1 - mixing) * lorentzian
+        if lorentz_width is None:
+            lorentz_width = width
+        return voigt_profiles(
+            x, position, height, width, lorentz_width,
+            method=self.params["voigt_method"]
+        )[0]
 
     def generate_peaks(self, x):
         """
         Generate peaks based on specified parameters.
 
+        Peaks of the same type are evaluated together, vectorized over
+        peaks and points in blocks of bounded size. With peak_synthesis "fft" on a uniform axis,
+        peaks are synthesized by FFT convolution (see dense_synthesis). The
+        widths are then rounded to a grid with relative spacing
+        fft_synthesis_params["width_tolerance"] (2 % by default), so that
+        many peaks share a kernel; the peak information holds the rounded
+        widths, and the spectrum matches it up to the phase interpolation
+        error of the synthesizer (1e-4 of the peak height by default).
+
         Args:
             x (numpy.ndarray): X-axis values
 
@@ -265,43 +388,108 @@ class SpectralDataGenerator:
 
         # Ensure all arrays have the same length
         num_peaks = min(len(peak_positions), len(peak_heights), len(peak_widths))
+        peak_positions = np.asarray(peak_positions[:num_peaks], dtype=float)
+        peak_heights = np.asarray(peak_heights[:num_peaks], dtype=float)
+        peak_widths = np.asarray(peak_widths[:num_peaks], dtype=float)
+
+        # Determine peak types
+        peak_types = self.params["peak_types"]
+        types = np.array([peak_types[i % len(peak_types)] for i in range(num_peaks)], dtype=object)
+
+        # Lorentzian widths are only needed for voigt peaks
+        lorentz_widths = None
+        if np.any(types == "voigt"):
+            if self.params["peak_lorentz_widths"] is None:
+                lorentz_widths = np.random.uniform(
+                    self.params["min_lorentz_width"],
+                    self.params["max_lorentz_width"],
+                    num_peaks
+                )
+            else:
+                lorentz_widths = np.resize(
+                    np.asarray(self.params["peak_lorentz_widths"], dtype=float), num_peaks
+                )
+
+        # Dense signals on a uniform axis: all peaks of a width group via one FFT convolution
+        synthesizer = self._get_fft_synthesizer(x) if num_peaks else None
+        if synthesizer is not None:
+            # Shared widths make the groups large enough for the FFT to pay off
+            peak_widths = synthesizer.quantize_widths(peak_widths)
+            if lorentz_widths is not None:
+                lorentz_widths = synthesizer.quantize_widths(lorentz_widths)
 
         # Initialize the peaks array
-        peaks = np.zeros_like(x)
+        peaks = np.zeros_like(x, dtype=float)
 
-        # Generate each peak
+        if synthesizer is not None:
+            peaks += synthesizer.synthesize(x, types, peak_positions, peak_heights, peak_widths, lorentz_widths)
+        else:
+            # All peaks of one type at once, in blocks of bounded memory
+            peaks += sum_profiles(x, types, peak_positions, peak_heights, peak_widths, lorentz_widths,
+                                  voigt_method=self.params["voigt_method"])
+
+        # Save peak information
         for i in range(num_peaks):
-            position = peak_positions[i]
-            height = peak_heights[i]
-            width = peak_widths[i]
-
-            # Determine peak type
-            peak_types = self.params["peak_types"]
-            peak_type = peak_types[i % len(peak_types)]
-
-            # Generate peak based on type
-            if peak_type == "gaussian":
-                peak = self.generate_gaussian_peak(x, position, height, width)
-            elif peak_type == "lorentzian":
-                peak = self.generate_lorentzian_peak(x, position, height, width)
-            elif peak_type == "voigt":
-                peak = self.generate_voigt_peak(x, position, height, width)
-            else:
-                # Default to gaussian
-                peak = self.generate_gaussian_peak(x, position, height, width)
+            info = {
+                "type": types[i],
+                "position": peak_positions[i],
+                "height": peak_heights[i],
+                "width": peak_widths[i]
+            }
+            if types[i] == "voigt":
+                info["lorentz_width"] = lorentz_widths[i]
+            peak_info.append(info)
 
-            # Add peak to total
-            peaks += peak
+        return peaks, peak_info
 
-            # Save peak information
-            peak_info.append({
-                "type": peak_type,
-                "position": position,
-                "height": height,
-                "width": width
-            })
+    def _get_fft_synthesizer(self, x):
+        """
+        Get the FFT peak synthesizer if peak_synthesis is "fft" and x is uniform.
 
-        return peaks, peak_info
+        The synthesizer is kept between spectra, so its kernel cache is reused.
+
+        Args:
+            x (numpy.ndarray): X-axis values
+
+        Returns:
+            FFTPeakSynthesizer: The synthesizer, or None for direct evaluation
+        """
+        if self.params["peak_synthesis"] != "fft":
+            return None
+        from dense_synthesis import FFTPeakSynthesizer, uniform_grid
+
+        if uniform_grid(x) is None:
+            # Jittered and random sampling: fall back to direct evaluation
+            return None
+        options = dict(self.params["fft_synthesis_params"], voigt_method=self.params["voigt_method"])
+        if self._fft_synthesizer is None or self._fft_synthesizer_options != options:
+            self._fft_synthesizer = FFTPeakSynthesizer(**options)
+            self._fft_synthesizer_options = options
+        return self._fft_synthesizer
+
+    def get_noise_model(self):
+        """
+        Get the noise model for the current noise parameters.
+
+        The model is cached and only rebuilt when the noise parameters change.
+
+        Returns:
+            NoiseModel: The noise model
+        """
+        noise_type = self.params["noise_type"]
+        key = (
+            tuple(noise_type) if isinstance(noise_type, (list, tuple)) else noise_type,
+            self.params["noise_level"],
+            tuple(sorted(self.params["noise_params"].items())),
+        )
+        if getattr(self, "_noise_model_key", None) != key:
+            self._noise_model = create_noise_model(
+                noise_type,
+                self.params["noise_level"],
+                self.params["noise_params"]
+            )
+            self._noise_model_key = key
+        return self._noise_model
 
     def add_noise(self, y):
         """
@@ -313,23 +501,28 @@ class SpectralDataGenerator:
         Returns:
             numpy.ndarray: Y-axis values with noise
         """
-        noise_level = self.params["noise_level"]
-        noise_type = self.params["noise_type"]
-
-        if noise_level <= 0:
+        if self.params["noise_level"] <= 0:
             return y
 
-        if noise_type == "gaussian":
-            # Gaussian noise
-            noise = np.random.normal(0, noise_level, size=len(y))
-        elif noise_type == "poisson":
-            # Poisson noise (scaled by signal intensity)
-            noise = np.random.poisson(np.maximum(y, 0) / noise_level) * noise_level - y
-        else:
-            # Default to gaussian
-            noise = np.random.normal(0, noise_level, size=len(y))
+        return self.get_noise_model().apply(y)
+
+    def add_noise_batch(self, y_batch, rng=None):
+        """
+        Add noise to a batch of spectra in a single call.
 
-        return y + noise
+        Args:
+            y_batch (numpy.ndarray): Clean spectra with shape (batch, points)
+            rng (numpy.random.Generator, optional): Random generator. If None,
+                the global numpy random state is used.
+
+        Returns:
+            numpy.ndarray: Noisy spectra with shape (batch, points)
+        """
+        y_batch = np.atleast_2d(y_batch)
+        if self.params["noise_level"] <= 0:
+            return y_batch
+
+        return self.get_noise_model().apply(y_batch, rng)
 
     def add_artifacts(self, x, y):
         """
@@ -403,9 +596,12 @@ class SpectralDataGenerator:
         Returns:
             str: Saved filename
         """
+        # pandas is only needed for writing files, so it is imported here
+        import pandas as pd
+
         # Generate filename if not provided
         if filename is None:
-            timestamp = pd.Timestamp.now().strftime("%Y%m%d%H%M%S")
+            timestamp = time.strftime("%Y%m%d%H%M%S")
             filename = f"{self.params['file_prefix']}-{timestamp}.csv"
 
         # Ensure the filename has a .csv extension
@@ -469,6 +665,9 @@ class SpectralDataGenerator:
         Returns:
             matplotlib.figure.Figure: The figure object
         """
+        # matplotlib is only needed for plotting, so it is imported here
+        import matplotlib.pyplot as plt
+
         # Create figure
         fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -555,7 +754,7 @@ class SpectralDataGenerator:
         # Save if requested
         if save:
             if filename is None:
-                timestamp = pd.Timestamp.now().strftime("%Y%m%d%H%M%S")
+                timestamp = time.strftime("%Y%m%d%H%M%S")
                 filename = f"{self.params['file_prefix']}-{timestamp}.png"
 
             # Ensure the filename has a .png extension
@@ -588,6 +787,10 @@ class SpectralDataGenerator:
         plot_filepaths = []
 
         for i in range(n_spectra):
+            if self.profiler is not None:
+                # Attribute the following stages to this spectrum
+                self.profiler.spectrum = i + 1
+
             # Optionally vary parameters
             if vary_params and i > 0:
                 self._vary_parameters(i)
@@ -614,6 +817,9 @@ class SpectralDataGenerator:
                 if filepath:
                     plot_filepaths.append(filepath)
 
+        if self.profiler is not None:
+            self.profiler.spectrum = None
+
         # Generate PDF report with all plots
         if save and plot:
             self.generate_pdf_report(plot_filepaths)
@@ -630,6 +836,13 @@ class SpectralDataGenerator:
         Returns:
             str: Path to the generated PDF file
         """
+        # reportlab and PIL are only needed for the report, so they are imported here
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Image, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import inch
+        from PIL import Image as PILImage
+
         pdf_path = os.path.join(self.params["output_dir"], "report.pdf")
 
         # If no image filepaths provided, find all PNGs in the images directory
@@ -739,6 +952,16 @@ class SpectralDataGenerator:
             self.params["baseline_params"]["sin_amplitude"] *= np.random.uniform(0.8, 1.2)
             self.params["baseline_params"]["sin_frequency"] *= np.random.uniform(0.9, 1.1)
             self.params["baseline_params"]["sin_phase"] += np.random.uniform(-0.2, 0.2)
+        elif self.params["baseline_type"] == "spline":
+            # Vary spline coefficients slightly
+            coeffs = np.asarray(self.params["baseline_params"]["spline_coeffs"], dtype=float)
+            coeffs *= np.random.uniform(0.8, 1.2, len(coeffs))
+            self.params["baseline_params"]["spline_coeffs"] = coeffs.tolist()
+        elif self.params["baseline_type"] == "piecewise":
+            # Vary the slopes of the drift segments
+            slopes = np.asarray(self.params["baseline_params"]["piecewise_slopes"], dtype=float)
+            slopes *= np.random.uniform(0.8, 1.2, len(slopes))
+            self.params["baseline_params"]["piecewise_slopes"] = slopes.tolist()
 
         # Vary number of peaks (but not too much)
         orig_num_peaks = self.params["num_peaks"]
@@ -765,6 +988,14 @@ class SpectralDataGenerator:
         if np.random.random() < 0.2:
             self.params["add_spikes"] = not self.params["add_spikes"]
 
+        # Optionally vary sampling rate and time offset like different instruments
+        if self.params["vary_sampling"]:
+            if not hasattr(self, "_orig_num_points"):
+                self._orig_num_points = self.params["num_points"]
+            self.params["num_points"] = int(self._orig_num_points * np.random.uniform(0.7, 1.3))
+            step = (self.params["x_max"] - self.params["x_min"]) / self._orig_num_points
+            self.params["x_offset"] = np.random.uniform(-5, 5) * step
+
 
 # Main program to generate the dataset
 if __name__ == "__main__":
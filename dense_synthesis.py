@@ -0,0 +1,291 @@
+import numpy as np
+
+from peak_profiles import gaussian_profiles, lorentzian_profiles, voigt_profiles, sum_profiles
+
+
+def uniform_grid(x, rtol=1e-6):
+    """
+    Check whether an axis is uniformly spaced.
+
+    Args:
+        x (numpy.ndarray): X-axis values
+        rtol (float): Allowed deviation of a step from the mean step (relative)
+
+    Returns:
+        tuple: (x0, dx) for a uniform, increasing axis with at least 2 points, else None
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < 2:
+        return None
+    dx = (x[-1] - x[0]) / (len(x) - 1)
+    if dx <= 0 or np.abs(np.diff(x) - dx).max() > rtol * dx:
+        return None
+    return x[0], dx
+
+
+def _profiles(peak_type, x, positions, heights, widths, lorentz_widths, voigt_method):
+    """Evaluate peaks of one type directly (peaks x points)."""
+    if peak_type == "lorentzian":
+        return lorentzian_profiles(x, positions, heights, widths)
+    if peak_type == "voigt":
+        return voigt_profiles(x, positions, heights, widths, lorentz_widths, method=voigt_method)
+    return gaussian_profiles(x, positions, heights, widths)
+
+
+class FFTPeakSynthesizer:
+    """
+    Synthesis of many peaks on a uniform grid by FFT convolution.
+
+    On a uniform grid, peaks with the same shape and width are shifted and
+    scaled copies of one kernel, so their sum is the convolution of an
+    impulse train with that kernel. Peaks are grouped by type and width
+    bin (widths within a relative width_tolerance share one kernel with
+    the mean width of the group, exact if all widths are equal, e.g. after
+    quantize_widths). The sub-sample position of every peak is resolved
+    with up to `oversample` kernel phases: each peak's height is split
+    linearly between the two nearest phases, every phase gets its own
+    impulse train, and all phases of a group are combined in the frequency
+    domain before one inverse FFT. Wide peaks need fewer phases, so the
+    number of phases per group is the smallest one that keeps the
+    interpolation error below phase_tolerance. The kernel spectra are
+    cached, so a group costs O(phases * n log n) instead of O(peaks * n).
+
+    Accuracy per peak, relative to its height: the linear split between
+    phases deviates by at most (dx / phases)^2 * c / 8 with the curvature
+    c = 1 / sigma^2 (Gaussian) or 2 / gamma^2 (Lorentzian), i.e. below
+    phase_tolerance unless the phase count is capped by oversample (then
+    below 0.05 % for sigma >= 2 samples). Unequal widths within a bin add
+    up to about 0.74 * width_tolerance for Gaussians. The errors of
+    overlapping peaks add up. Lorentzian and Voigt kernels span the whole
+    signal, so their tails are not truncated. Groups with fewer than
+    min_fft_peaks peaks, or for which a rough cost estimate (profile
+    evaluations vs. FFT length and phases) favours it, are evaluated
+    exactly with the direct method.
+    """
+
+    def __init__(self, oversample=8, width_tolerance=0.005, min_fft_peaks=4, gaussian_cutoff=8.0,
+                 voigt_method="faddeeva", max_cached_kernels=64, phase_tolerance=1e-4):
+        """
+        Initialize the synthesizer.
+
+        Args:
+            oversample (int): Maximum number of kernel phases per sample (sub-sample resolution)
+            width_tolerance (float): Relative width of a width bin
+            min_fft_peaks (int): Smaller groups are always evaluated directly
+            gaussian_cutoff (float): Gaussian kernels are truncated at this many sigma
+            voigt_method (str): Method for Voigt kernels (see peak_profiles.voigt_profiles)
+            max_cached_kernels (int): Maximum number of cached kernel spectra
+            phase_tolerance (float): Allowed phase interpolation error relative to the peak height
+        """
+        self.oversample = int(oversample)
+        self.width_tolerance = width_tolerance
+        self.min_fft_peaks = min_fft_peaks
+        self.gaussian_cutoff = gaussian_cutoff
+        self.voigt_method = voigt_method
+        self.max_cached_kernels = max_cached_kernels
+        self.phase_tolerance = phase_tolerance
+        self._kernels = {}
+
+    def _width_bins(self, widths):
+        """Log-spaced width bin of every width."""
+        return np.round(np.log(widths) / np.log1p(self.width_tolerance)).astype(np.int64)
+
+    def quantize_widths(self, widths):
+        """
+        Round widths to the centres of their width bins.
+
+        Peaks with quantized widths share their kernel exactly, so the
+        width term of the error bound vanishes.
+
+        Args:
+            widths (array-like): Widths
+
+        Returns:
+            numpy.ndarray: Widths, each a power of (1 + width_tolerance) (zero widths are kept)
+        """
+        widths = np.asarray(widths, dtype=float)
+        positive = widths > 0
+        quantized = widths.copy()
+        quantized[positive] = np.exp(self._width_bins(widths[positive]) * np.log1p(self.width_tolerance))
+        return quantized
+
+    def _phase_count(self, peak_type, width, lorentz_width, dx):
+        """Number of kernel phases needed for phase_tolerance."""
+        if peak_type == "lorentzian":
+            curvature = 2.0 / width ** 2
+        elif peak_type == "voigt":
+            # Conservative: the sharper of both components
+            curvature = max(1.0 / width ** 2 if width > 0 else 0.0,
+                            2.0 / lorentz_width ** 2 if lorentz_width > 0 else 0.0)
+        else:
+            curvature = 1.0 / width ** 2
+        needed = dx * np.sqrt(curvature / (8.0 * self.phase_tolerance))
+        return int(min(self.oversample, max(1, np.ceil(needed))))
+
+    def _kernel_spectra(self, peak_type, width, lorentz_width, dx, half, nfft, n_phases, phases):
+        """
+        Get the (cached) spectra of the kernel phases, shape (n_phases, nfft // 2 + 1).
+
+        Only the rows of the requested phases are returned.
+        """
+        key = (peak_type, width, lorentz_width, dx, half, nfft, n_phases, self.voigt_method)
+        spectra = self._kernels.get(key)
+        if spectra is None:
+            if len(self._kernels) >= self.max_cached_kernels:
+                self._kernels.pop(next(iter(self._kernels)))
+            offsets = np.arange(-half, half + 1) * dx
+            # Phase p is the kernel of a peak p / n_phases samples right of its grid point
+            shifts = np.arange(n_phases) * dx / n_phases
+            kernels = _profiles(peak_type, offsets, shifts, np.ones(n_phases), np.full(n_phases, width),
+                                np.full(n_phases, lorentz_width), self.voigt_method)
+            spectra = np.fft.rfft(kernels, n=nfft, axis=-1)
+            self._kernels[key] = spectra
+        return spectra[phases]
+
+    def _plan_group(self, peak_type, width, lorentz_width, positions, x0, dx, n):
+        """
+        Phases, impulse positions and FFT size of one width group.
+
+        Returns:
+            dict: n_phases, coarse (grid index), phase, frac, dx, low, length, half and nfft
+        """
+        n_phases = self._phase_count(peak_type, width, lorentz_width, dx)
+        # Fine grid index of every peak, split linearly between two neighbouring phases
+        fine = (positions - x0) / dx * n_phases
+        lower = np.floor(fine).astype(np.int64)
+        coarse, phase = np.divmod(np.concatenate([lower, lower + 1]), n_phases)
+
+        low = min(0, coarse.min())
+        length = max(n - 1, coarse.max()) - low + 1
+        if peak_type == "gaussian":
+            half = int(np.ceil(self.gaussian_cutoff * width / dx)) + 1
+        else:
+            # Long tails: the kernel reaches every output sample from every impulse
+            half = length
+        # Wrapped-around parts of the circular convolution stay outside the kept samples
+        nfft = 1 << int(np.ceil(np.log2(max(length + half, 2 * half) + 1)))
+        return {"n_phases": n_phases, "coarse": coarse, "phase": phase, "frac": fine - lower,
+                "dx": dx, "low": low, "length": length, "half": half, "nfft": nfft}
+
+    def _fft_is_cheaper(self, peak_type, count, plan, n):
+        """Compare the estimated costs of FFT and direct evaluation of a group."""
+        if count < self.min_fft_peaks:
+            return False
+        direct = count * n * self._direct_cost(peak_type)
+        transforms = len(np.unique(plan["phase"])) + 2
+        return direct > transforms * plan["nfft"] * np.log2(plan["nfft"])
+
+    def _direct_cost(self, peak_type):
+        """Rough cost of one directly evaluated profile value, in FFT operations per element."""
+        if peak_type == "voigt":
+            return {"pseudo": 20.0, "table": 40.0}.get(self.voigt_method, 80.0)
+        return 6.0 if peak_type == "lorentzian" else 10.0
+
+    def _synthesize_group(self, peak_type, width, lorentz_width, heights, plan, n, out):
+        """Add one width group to out via FFT convolution."""
+        n_phases, dx, low, length, half, nfft = (plan[key] for key in
+                                                 ("n_phases", "dx", "low", "length", "half", "nfft"))
+        frac, coarse = plan["frac"], plan["coarse"]
+        weights = np.concatenate([heights * (1.0 - frac), heights * frac])
+
+        phases, phase_code = np.unique(plan["phase"], return_inverse=True)
+        trains = np.bincount(phase_code.ravel() * length + (coarse - low), weights=weights,
+                             minlength=len(phases) * length).reshape(len(phases), length)
+
+        spectrum = np.einsum("pk,pk->k", np.fft.rfft(trains, n=nfft, axis=-1),
+                             self._kernel_spectra(peak_type, width, lorentz_width, dx, half, nfft, n_phases,
+                                                  phases))
+        result = np.fft.irfft(spectrum, n=nfft)
+        start = half - low
+        out += result[start:start + n]
+
+    def synthesize(self, x, types, positions, heights, widths, lorentz_widths=None):
+        """
+        Sum of all peaks on a uniform axis.
+
+        Args:
+            x (numpy.ndarray): Uniform x-axis values
+            types (array-like): Peak type per peak ("gaussian", "lorentzian" or "voigt")
+            positions (array-like): Peak center positions
+            heights (array-like): Peak heights
+            widths (array-like): Gaussian sigma (gaussian, voigt) or HWHM (lorentzian)
+            lorentz_widths (array-like, optional): Lorentzian HWHM of voigt peaks
+
+        Returns:
+            numpy.ndarray: Summed peaks, shape (points,)
+        """
+        grid = uniform_grid(x)
+        if grid is None:
+            raise ValueError("FFT synthesis needs a uniformly spaced, increasing x-axis.")
+        x0, dx = grid
+        n = len(x)
+        types = np.asarray(types).astype(str)
+        positions = np.asarray(positions, dtype=float)
+        heights = np.asarray(heights, dtype=float)
+        widths = np.asarray(widths, dtype=float)
+        lorentz_widths = (np.zeros(len(positions)) if lorentz_widths is None
+                          else np.broadcast_to(np.asarray(lorentz_widths, dtype=float), positions.shape))
+
+        out = np.zeros(n)
+        for peak_type in np.unique(types):
+            of_type = np.flatnonzero(types == peak_type)
+            if peak_type not in ("lorentzian", "voigt"):
+                # Unknown types are Gaussian, as in SpectralDataGenerator.generate_peaks
+                peak_type = "gaussian"
+            width_bins = self._width_bins(widths[of_type])
+            if peak_type == "voigt":
+                lorentz_bins = self._width_bins(lorentz_widths[of_type])
+            else:
+                lorentz_bins = np.zeros(len(of_type), dtype=np.int64)
+            groups = np.stack([width_bins, lorentz_bins], axis=1)
+            _, group_codes, counts = np.unique(groups, axis=0, return_inverse=True, return_counts=True)
+            group_codes = group_codes.ravel()
+
+            direct = []
+            for code in range(len(counts)):
+                idx = of_type[group_codes == code]
+                if counts[code] < self.min_fft_peaks:
+                    direct.append(idx)
+                    continue
+                # The mean width of the group is exact when all widths are equal
+                width, lorentz_width = float(widths[idx].mean()), float(lorentz_widths[idx].mean())
+                plan = self._plan_group(peak_type, width, lorentz_width, positions[idx], x0, dx, n)
+                if self._fft_is_cheaper(peak_type, len(idx), plan, n):
+                    self._synthesize_group(peak_type, width, lorentz_width, heights[idx], plan, n, out)
+                else:
+                    direct.append(idx)
+
+            # Small groups: exact direct evaluation, all together in blocks of bounded size
+            if direct:
+                idx = np.concatenate(direct)
+                out += sum_profiles(x, np.full(len(idx), peak_type), positions[idx], heights[idx], widths[idx],
+                                    lorentz_widths[idx], self.voigt_method)
+        return out
+
+
+# Example: MS-like signal with thousands of narrow peaks
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1000, 200_000)
+    n_peaks = 3000
+    positions = rng.uniform(0, 1000, n_peaks)
+    heights = rng.uniform(0.1, 1.0, n_peaks)
+    # Constant resolution in a few widths, as for centroided MS data
+    widths = rng.choice([0.02, 0.03, 0.05], n_peaks) * rng.uniform(0.999, 1.001, n_peaks)
+    types = np.where(rng.random(n_peaks) < 0.8, "gaussian", "lorentzian")
+
+    # Rounded widths are part of the data, so both methods see the same peaks
+    synthesizer = FFTPeakSynthesizer()
+    widths = synthesizer.quantize_widths(widths)
+
+    start = time.perf_counter()
+    direct = sum_profiles(x, types, positions, heights, widths)
+    print(f"Direct: {time.perf_counter() - start:.2f} s")
+
+    for attempt in ("first call", "cached kernels"):
+        start = time.perf_counter()
+        fast = synthesizer.synthesize(x, types, positions, heights, widths)
+        print(f"FFT ({attempt}): {time.perf_counter() - start:.2f} s")
+    print(f"Max. error: {np.abs(fast - direct).max():.2e} (max. height {heights.max():.2f})")
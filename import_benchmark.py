@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import time
+import subprocess
+import statistics
+import functools
+
+# Modules whose import must stay light, with the heavy dependencies they must
+# not pull in at import time and a wall-clock budget in seconds
+IMPORT_CHECKS = {
+    "noise_models": {
+        "forbidden": ["pandas", "matplotlib", "scipy", "reportlab", "PIL"],
+        "budget": 0.5,
+    },
+    "peak_profiles": {
+        "forbidden": ["pandas", "matplotlib", "scipy", "reportlab", "PIL"],
+        "budget": 0.5,
+    },
+    "baseline_models": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "dense_synthesis": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "data_generation": {
+        "forbidden": ["pandas", "matplotlib", "scipy", "reportlab", "PIL"],
+        "budget": 0.5,
+    },
+    "resampling": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "alignment": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "chunked_processing": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "peak_store": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "peak_evaluation": {
+        "forbidden": ["pandas", "matplotlib", "scipy"],
+        "budget": 0.5,
+    },
+    "kiToolbox.KIToolboxAPI": {
+        "forbidden": ["requests", "urllib3", "tqdm", "numpy"],
+        "budget": 0.3,
+    },
+}
+
+# Standard library packages are not reported (Python >= 3.10)
+_STDLIB = frozenset(getattr(sys, "stdlib_module_names", ()))
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _baseline_packages(cwd):
+    """Top-level packages that a bare interpreter has already loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", "import sys, json; print(json.dumps(sorted(sys.modules)))"],
+        cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+    return frozenset(name.split(".")[0] for name in json.loads(output))
+
+
+def measure_import(module, repeats=5, cwd=None):
+    """
+    Measure the import time of a module in fresh interpreter processes.
+
+    Every run starts a new interpreter so that nothing is cached in
+    sys.modules; the median of the runs is reported.
+
+    Args:
+        module (str): Module name, e.g. "data_generation"
+        repeats (int): Number of interpreter runs
+        cwd (str, optional): Working directory (default: directory of this file)
+
+    Returns:
+        dict: Median import time in seconds and the top-level packages loaded by the import
+    """
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    times = []
+    loaded = set()
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result["elapsed"])
+        loaded = {name.split(".")[0] for name in result["modules"]}
+
+    return {
+        "module": module,
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "loaded_packages": sorted(name for name in loaded - _baseline_packages(cwd)
+                                  if not name.startswith("_") and name not in _STDLIB),
+    }
+
+
+def run_import_checks(checks=None, repeats=5, budget_factor=1.0):
+    """
+    Check import time and eagerly loaded dependencies of all modules.
+
+    Args:
+        checks (dict, optional): Checks as in IMPORT_CHECKS
+        repeats (int): Number of interpreter runs per module
+        budget_factor (float): Scaling of all time budgets (e.g. for slow machines)
+
+    Returns:
+        tuple: (results, failures) - one result dict per module and a list of error messages
+    """
+    checks = checks or IMPORT_CHECKS
+    results = []
+    failures = []
+    for module, check in checks.items():
+        result = measure_import(module, repeats)
+        results.append(result)
+
+        eager = sorted(set(check["forbidden"]) & set(result["loaded_packages"]))
+        if eager:
+            failures.append(f"{module}: imports {', '.join(eager)} at import time")
+        budget = check["budget"] * budget_factor
+        if result["median_s"] > budget:
+            failures.append(f"{module}: import takes {result['median_s']:.3f} s (budget {budget:.3f} s)")
+    return results, failures
+
+
+# Main program: print the import times and exit with status 1 on regressions
+if __name__ == "__main__":
+    budget_factor = float(os.environ.get("IMPORT_BUDGET_FACTOR", "1.0"))
+    start = time.perf_counter()
+    results, failures = run_import_checks(budget_factor=budget_factor)
+
+    print(f"{'Module':<26} {'median ms':>10} {'min ms':>8}  loaded packages")
+    for result in results:
+        print(f"{result['module']:<26} {result['median_s'] * 1000:>10.1f} {result['min_s'] * 1000:>8.1f}  "
+              f"{', '.join(result['loaded_packages'])}")
+    print(f"\nTotal benchmark time: {time.perf_counter() - start:.1f} s")
+
+    if failures:
+        print("\nImport regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("All import checks passed.")
@@ -1,8 +1,22 @@
 import os
 import json
-import requests
-from tqdm import tqdm
-from typing import Dict, Any, Optional
+import time
+import hashlib
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Callable, TYPE_CHECKING
+
+from kiToolbox.ResponseCache import ResponseCache, make_cache_key
+from kiToolbox.SingleFlight import SingleFlight
+from kiToolbox.JsonExtractor import extract_json, validate_schema
+from kiToolbox.RateLimiter import TokenBucket, AdaptiveConcurrencyLimiter, RetryPolicy
+from kiToolbox.LlmMetrics import (MetricsCollector, JsonlTraceHook, create_timed_adapter, percentile,
+                                  reset_connect_timing, get_connect_timing)
+
+if TYPE_CHECKING:
+    # requests wird erst beim Erstellen der Session importiert (kurze Importzeit)
+    import requests
 
 
 def get_token(token_filepath: str) -> str:
@@ -19,12 +33,22 @@ def get_token(token_filepath: str) -> str:
     return token
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Schätzt die Anzahl der Tokens eines Textes (ca. 4 Zeichen pro Token).
+    """
+    return len(text) // 4 + 1
+
+
 class BaseLlmAPI:
     """
     Basisklasse für alle LLM-API-Wrapper.
     Definiert die grundlegende Struktur und gemeinsame Funktionalität.
     """
 
+    # Fehler bei der Anfrage als "Fehler: ..."-Text zurückgeben statt sie weiterzureichen
+    _error_as_text = True
+
     def __init__(self, params: Dict[str, Any]):
         """
         Initialisiert die Basis-API mit den übergebenen Parametern.
@@ -34,11 +58,135 @@ class BaseLlmAPI:
                 - token_filepath (str): Pfad zur Datei mit dem API-Token
                 - model (str, optional): Zu verwendendes Modell
                 - base_url (str, optional): Basis-URL der API
+                - timeout (float, optional): Timeout pro Anfrage in Sekunden (Standard: 120)
+                - pool_connections (int, optional): Anzahl der Hosts, für die Verbindungen
+                  vorgehalten werden (Standard: 10)
+                - pool_maxsize (int, optional): Maximale Anzahl offener Verbindungen
+                  pro Host (Standard: 10)
+                - pool_block (bool, optional): Blockiert bei erreichtem Limit pro Host,
+                  statt zusätzliche Verbindungen zu öffnen (Standard: False)
+                - keep_alive (bool, optional): Verbindungen zwischen Anfragen
+                  wiederverwenden (Standard: True)
+                - max_concurrency (int, optional): Maximale Anzahl gleichzeitiger
+                  asynchroner Anfragen (Standard: 10)
+                - cache (ResponseCache, optional): Antwort-Cache für identische Anfragen
+                - cache_path (str, optional): Pfad einer SQLite-Datei; erzeugt einen
+                  ResponseCache, falls kein cache übergeben wurde
+                - cache_ttl (float, optional): Lebensdauer der Cache-Einträge in Sekunden
+                - cache_max_entries (int, optional): Maximale Anzahl Cache-Einträge
+                - cache_max_bytes (int, optional): Maximale Gesamtgröße des Caches in Bytes
+                - single_flight (bool, optional): Gleichzeitige identische Anfragen zu
+                  einer HTTP-Anfrage bündeln (Standard: True)
+                - rate_limit (float, optional): Maximale Anfragen pro Sekunde (Standard: unbegrenzt)
+                - rate_burst (float, optional): Erlaubte Burst-Größe des Rate-Limiters
+                - max_retries (int, optional): Wiederholungen bei 429/5xx, Timeouts und
+                  Verbindungsfehlern (Standard: 3)
+                - retry_base_delay (float, optional): Basiswartezeit des Backoffs in Sekunden (Standard: 1)
+                - retry_max_delay (float, optional): Maximale Wartezeit in Sekunden (Standard: 60)
+                - adaptive_concurrency (bool, optional): Gleichzeitige Anfragen per AIMD an die
+                  Kapazität des Dienstes anpassen (Standard: False)
+                - latency_target (float, optional): Latenz in Sekunden, ab der die adaptive
+                  Begrenzung drosselt
+                - metrics (MetricsCollector, optional): Gemeinsamer Kennzahlen-Sammler
+                  (Standard: eigener Sammler pro Instanz, siehe self.metrics)
+                - metrics_callback (callable, optional): Erhält jedes Anfrage-Ereignis als Dictionary
+                - trace_path (str, optional): JSONL-Datei, in die jedes Anfrage-Ereignis geschrieben wird
         """
         self.token = get_token(params["token_filepath"])
         self.model = params.get("model", self._get_default_model())
         self.base_url = params.get("base_url", self._get_default_url())
         self.headers = self._get_headers()
+        self.timeout = params.get("timeout", 120)  # 2 Minuten Timeout
+        self.session = self._create_session(params)
+        self.max_concurrency = params.get("max_concurrency", 10)
+        self._executor = None
+        self._async_semaphore = None
+        self._async_loop = None
+
+        # Instrumentierung: ein Ereignis pro answer_question-Aufruf
+        self.metrics = params.get("metrics")
+        self._owns_metrics = self.metrics is None
+        if self.metrics is None:
+            self.metrics = MetricsCollector()
+        if params.get("metrics_callback"):
+            self.metrics.add_hook(params["metrics_callback"])
+        if params.get("trace_path"):
+            self.metrics.add_hook(JsonlTraceHook(params["trace_path"]))
+        self._call_local = threading.local()
+
+        self.cache = params.get("cache")
+        if self.cache is None and params.get("cache_path"):
+            self.cache = ResponseCache(
+                params["cache_path"],
+                ttl=params.get("cache_ttl"),
+                max_entries=params.get("cache_max_entries", 100000),
+                max_bytes=params.get("cache_max_bytes")
+            )
+        self.single_flight = SingleFlight() if params.get("single_flight", True) else None
+
+        self.rate_limiter = None
+        if params.get("rate_limit"):
+            self.rate_limiter = TokenBucket(params["rate_limit"], params.get("rate_burst"))
+        self.retry_policy = RetryPolicy(
+            max_retries=params.get("max_retries", 3),
+            base_delay=params.get("retry_base_delay", 1.0),
+            max_delay=params.get("retry_max_delay", 60.0)
+        )
+        self.concurrency_limiter = None
+        if params.get("adaptive_concurrency", False):
+            self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+                initial=min(4, self.max_concurrency),
+                maximum=self.max_concurrency,
+                latency_target=params.get("latency_target")
+            )
+
+    def _create_session(self, params: Dict[str, Any]) -> "requests.Session":
+        """
+        Erstellt eine persistente HTTP-Session mit Connection-Pool.
+
+        Alle Anfragen dieser Instanz laufen über die Session, sodass
+        TCP- und TLS-Verbindungen per Keep-Alive wiederverwendet werden.
+        Neue Verbindungen werden für die Kennzahlen zeitlich erfasst.
+
+        Args:
+            params (dict): Die Parameter aus __init__
+
+        Returns:
+            requests.Session: Die konfigurierte Session
+        """
+        import requests
+
+        session = requests.Session()
+        adapter = create_timed_adapter(
+            pool_connections=params.get("pool_connections", 10),
+            pool_maxsize=params.get("pool_maxsize", 10),
+            pool_block=params.get("pool_block", False)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+        if not params.get("keep_alive", True):
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self):
+        """
+        Schließt die Session und alle offenen Verbindungen.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.cache is not None:
+            self.cache.close()
+        if self._owns_metrics:
+            self.metrics.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _get_default_model(self) -> str:
         """
@@ -75,42 +223,204 @@ class BaseLlmAPI:
         """
         raise NotImplementedError("Subclasses must implement _extract_response_text")
 
-    def answer_question(self, params: Dict[str, Any]) -> str:
+    def _get_request_key(self, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Bestimmt den inhaltsbasierten Schlüssel einer Anfrage für Cache und Single-Flight.
+
+        Returns None, wenn Anfragen nicht als identisch gelten dürfen: bei
+        gesetztem "bypass_cache" (z.B. für Läufe mit Temperatur > 0, deren
+        Antworten variieren sollen) und bei Anfragen in einem Thread, deren
+        Antwort vom Gesprächsverlauf abhängt.
+        """
+        if params.get("bypass_cache", False):
+            return None
+        payload = self._create_request_payload(params)
+        if "thread" in payload:
+            return None
+        # Parameter, die die Antwort beeinflussen, aber ggf. nicht in der Payload stehen
+        key_payload = dict(payload)
+        for name in ("temperature", "max_tokens"):
+            if name in params:
+                key_payload.setdefault(name, params[name])
+        model = payload.get("model", params.get("model", self.model))
+        return make_cache_key(f"{self.__class__.__name__}:{self.base_url}:{model}", key_payload)
+
+    def _send_question(self, params: Dict[str, Any]) -> str:
+        """
+        Sendet eine Frage an die API und gibt den Antworttext zurück.
+        Fehler werden als Exception weitergereicht. Unterklassen mit
+        abweichendem Protokoll überschreiben diese Methode.
+
+        Args:
+            params (dict): Parameter wie bei answer_question
+
+        Returns:
+            str: Die Antwort des Modells
+        """
+        # Erstelle Payload für die Anfrage
+        payload = self._create_request_payload(params)
+
+        # Sende Anfrage an die API (über die persistente Session)
+        response = self.session.post(
+            self.base_url,
+            json=payload,
+            timeout=self.timeout
+        )
+
+        # Überprüfe auf Fehler
+        self._observe_response(response)
+        response.raise_for_status()
+        self._count_response_bytes(len(response.content))
+        json_response = response.json()
+
+        # Extrahiere die Antwort
+        return self._extract_response_text(json_response)
+
+    def answer_question(self, params: Dict[str, Any], raise_errors: bool = False) -> str:
         """
         Stellt eine Frage an die API und gibt die Antwort zurück.
 
+        Ist ein Cache konfiguriert, werden identische Anfragen aus dem Cache
+        beantwortet; nur erfolgreiche Antworten werden gespeichert.
+
         Args:
             params (dict): Ein Dictionary mit den folgenden Parametern:
                 - prompt (str): Die zu stellende Frage
                 - model (str, optional): Zu verwendendes Modell
                 - max_tokens (int, optional): Maximale Anzahl der Tokens in der Antwort
                 - temperature (float, optional): Temperatur für die Antwortgenerierung
+                - bypass_cache (bool, optional): Cache für diese Anfrage umgehen
+            raise_errors (bool): Fehler immer weiterreichen, statt sie als
+                "Fehler: ..."-Text zurückzugeben
+
+        Jeder Aufruf erzeugt ein Ereignis für self.metrics (Cache-Status,
+        Wiederholungen, Verbindungs-, Erstbyte- und Gesamtzeit, Größen).
 
         Returns:
             str: Die Antwort des Modells
         """
-        # Erstelle Payload für die Anfrage
-        payload = self._create_request_payload(params)
-
+        call = {
+            "time": time.time(),
+            "api": self.__class__.__name__,
+            "model": params.get("model", self.model),
+            "cache": None,
+            "shared": False,
+            "retries": 0,
+            "status": None,
+            "first_byte_s": None,
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "error": None,
+        }
+        previous_call = getattr(self._call_local, "call", None)
+        self._call_local.call = call
+        reset_connect_timing()
+        start = time.perf_counter()
         try:
-            # Sende Anfrage an die API
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=120  # 2 Minuten Timeout
-            )
+            request_key = self._get_request_key(params)
+            cache_key = request_key if self.cache is not None else None
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                call["cache"] = "miss" if cached is None else "hit"
+                if cached is not None:
+                    return cached
+
+            def fetch() -> str:
+                call["shared"] = False
+                return self._fetch_answer(params, cache_key)
+
+            try:
+                # Gleichzeitige identische Anfragen teilen sich einen HTTP-Aufruf
+                if request_key is not None and self.single_flight is not None:
+                    call["shared"] = True
+                    return self.single_flight.do(request_key, fetch)
+                return fetch()
+            except Exception as e:
+                call["error"] = f"{e.__class__.__name__}: {e}"
+                # Überlastfehler, die auch nach allen Wiederholungen bestehen bleiben,
+                # werden immer weitergereicht und nicht in eine Antwort umgewandelt
+                if raise_errors or not self._error_as_text or self.retry_policy.is_retryable(e):
+                    raise
+                print(f"Fehler bei der API-Anfrage: {e}")
+                return f"Fehler: {e}"
+        finally:
+            self._call_local.call = previous_call
+            call["connections"], call["connect_s"] = get_connect_timing()
+            call["total_s"] = time.perf_counter() - start
+            self.metrics.record(call)
+
+    def _current_call(self) -> Optional[Dict[str, Any]]:
+        """
+        Gibt das Kennzahlen-Ereignis der im aktuellen Thread laufenden Anfrage zurück.
+        """
+        return getattr(self._call_local, "call", None)
 
-            # Überprüfe auf Fehler
-            response.raise_for_status()
-            json_response = response.json()
+    def _observe_response(self, response: "requests.Response"):
+        """
+        Erfasst Status, Zeit bis zum ersten Byte (Eingang der Header) und
+        Anfragegröße einer HTTP-Antwort für die Kennzahlen.
+        """
+        call = self._current_call()
+        if call is None:
+            return
+        call["status"] = response.status_code
+        call["first_byte_s"] = response.elapsed.total_seconds()
+        body = response.request.body if response.request is not None else None
+        call["request_bytes"] += len(body) if body else 0
+
+    def _count_response_bytes(self, num_bytes: int):
+        """
+        Addiert empfangene Bytes zur Antwortgröße der laufenden Anfrage.
+        """
+        call = self._current_call()
+        if call is not None:
+            call["response_bytes"] += num_bytes
 
-            # Extrahiere die Antwort
-            return self._extract_response_text(json_response)
+    def _send_with_retries(self, params: Dict[str, Any]) -> str:
+        """
+        Sendet eine Anfrage unter Beachtung von Rate-Limit und adaptiver
+        Nebenläufigkeit und wiederholt sie bei vorübergehender Überlast
+        (429, 5xx, Timeouts, Verbindungsfehler) mit exponentiellem Backoff.
 
-        except Exception as e:
-            print(f"Fehler bei der API-Anfrage: {e}")
-            return f"Fehler: {e}"
+        Raises:
+            Exception: Der letzte Fehler, wenn alle Wiederholungen fehlschlagen
+                oder der Fehler nicht wiederholbar ist
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.concurrency_limiter is not None:
+                self.concurrency_limiter.acquire()
+
+            start = time.perf_counter()
+            error = None
+            try:
+                return self._send_question(params)
+            except Exception as e:
+                error = e
+                raise_now = not self.retry_policy.is_retryable(e) or attempt >= self.retry_policy.max_retries
+                if raise_now:
+                    raise
+            finally:
+                if self.concurrency_limiter is not None:
+                    overloaded = error is not None and self.retry_policy.is_retryable(error)
+                    self.concurrency_limiter.release(time.perf_counter() - start, overloaded)
+
+            call = self._current_call()
+            if call is not None:
+                call["retries"] += 1
+            time.sleep(self.retry_policy.get_delay(attempt, error))
+            attempt += 1
+
+    def _fetch_answer(self, params: Dict[str, Any], cache_key: Optional[str]) -> str:
+        """
+        Sendet die Anfrage und speichert eine erfolgreiche Antwort im Cache.
+        """
+        response_text = self._send_with_retries(params)
+        if cache_key is not None:
+            self.cache.set(cache_key, response_text)
+        return response_text
 
     def generate_qa(self, params: Dict[str, Any]) -> Dict[str, str]:
         """
@@ -136,6 +446,57 @@ class BaseLlmAPI:
             "answer": response_text
         }
 
+    def _build_conversion_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Erstellt die Chat-Parameter für eine Dictionary-Konvertierung.
+
+        Args:
+            params (dict): Parameter wie bei dict_to_dict
+
+        Returns:
+            dict: Parameter für answer_question
+        """
+        input_dict_str = json.dumps(params["input_dict"], ensure_ascii=False, indent=2)
+        prompt = f"{params['conversion_prompt']}\n\nEingabe-Dictionary:\n{input_dict_str}\n\nGib nur das resultierende JSON zurück, ohne zusätzlichen Text."
+
+        chat_params = {
+            "prompt": prompt,
+            "model": params.get("model", self.model),
+            "temperature": params.get("temperature", 0.2)  # Niedrigere Temperatur für präzisere Antworten
+        }
+        if "bypass_cache" in params:
+            chat_params["bypass_cache"] = params["bypass_cache"]
+        return chat_params
+
+    def _parse_conversion_response(self, response: str, schema: Optional[Dict[str, Any]] = None,
+                                   raise_errors: bool = False) -> Dict[str, Any]:
+        """
+        Extrahiert das konvertierte Dictionary aus einer Modellantwort.
+
+        Gesucht wird das erste ausgewogene JSON-Objekt, bevorzugt innerhalb
+        von Codeblöcken; Fließtext davor oder danach sowie weitere Objekte
+        stören nicht.
+
+        Args:
+            response (str): Die Antwort des Modells
+            schema (dict, optional): Schema, dem das Ergebnis entsprechen muss
+                (siehe JsonExtractor.validate_schema)
+            raise_errors (bool): ValueError auslösen, statt ein Fehler-Dictionary
+                zurückzugeben
+
+        Returns:
+            dict: Das konvertierte Dictionary oder ein Fehler-Dictionary
+        """
+        api_name = self.__class__.__name__
+
+        result = extract_json(response, dict(schema or {}, type="object"))
+        if result is None:
+            if raise_errors:
+                raise ValueError(f"Kein gültiges JSON-Dictionary in der {api_name}-Antwort gefunden.")
+            print(f"Kein gültiges JSON-Dictionary in der {api_name}-Antwort gefunden.")
+            return {"error": "Konvertierung fehlgeschlagen", "raw_response": response}
+        return result
+
     def dict_to_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Konvertiert ein Eingabe-Dictionary in ein anderes Format basierend auf einer KI-Antwort.
@@ -145,6 +506,7 @@ class BaseLlmAPI:
                 - input_dict (dict): Das zu konvertierende Eingabe-Dictionary
                 - conversion_prompt (str): Anleitung für die Konvertierung
                 - model (str, optional): Zu verwendende Modell
+                - schema (dict, optional): Schema, dem das Ergebnis entsprechen muss
 
         Returns:
             dict: Das konvertierte Dictionary
@@ -152,30 +514,410 @@ class BaseLlmAPI:
         api_name = self.__class__.__name__
         print(f"Converting dictionary with {api_name}...")
 
-        input_dict_str = json.dumps(params["input_dict"], ensure_ascii=False, indent=2)
-        prompt = f"{params['conversion_prompt']}\n\nEingabe-Dictionary:\n{input_dict_str}\n\nGib nur das resultierende JSON zurück, ohne zusätzlichen Text."
+        response = self.answer_question(self._build_conversion_params(params))
+        return self._parse_conversion_response(response, params.get("schema"))
 
+    def _pack_inputs(self, input_dicts: List[Dict[str, Any]], conversion_prompt: str,
+                     pack_size: int, max_prompt_tokens: int) -> List[List[int]]:
+        """
+        Teilt die Eingaben in Pakete auf, die pack_size Einträge und das
+        Token-Budget max_prompt_tokens nicht überschreiten.
+
+        Returns:
+            list: Liste von Index-Listen, eine pro Paket
+        """
+        base_tokens = estimate_tokens(conversion_prompt) + 100  # Prompt und Anweisungen
+        packs: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = base_tokens
+
+        for i, input_dict in enumerate(input_dicts):
+            item_tokens = estimate_tokens(json.dumps({"id": i, "input": input_dict}, ensure_ascii=False))
+            if current and (len(current) >= pack_size or current_tokens + item_tokens > max_prompt_tokens):
+                packs.append(current)
+                current, current_tokens = [], base_tokens
+            current.append(i)
+            current_tokens += item_tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    def _build_packed_params(self, params: Dict[str, Any], indices: List[int]) -> Dict[str, Any]:
+        """
+        Erstellt die Chat-Parameter für ein Paket mehrerer Eingabe-Dictionaries.
+        """
+        items = [{"id": i, "input": params["input_dicts"][i]} for i in indices]
+        items_str = json.dumps(items, ensure_ascii=False, indent=2)
+        prompt = (
+            f"{params['conversion_prompt']}\n\n"
+            f"Wende die Konvertierung auf jedes Element der folgenden Liste einzeln an.\n"
+            f"Eingabe-Liste:\n{items_str}\n\n"
+            f"Gib nur ein JSON-Array zurück, ohne zusätzlichen Text. Jedes Element hat die Form "
+            f'{{"id": <id des Eingabe-Elements>, "result": <resultierendes Dictionary>}}.'
+        )
         chat_params = {
             "prompt": prompt,
             "model": params.get("model", self.model),
-            "temperature": params.get("temperature", 0.2)  # Niedrigere Temperatur für präzisere Antworten
+            "temperature": params.get("temperature", 0.2)
         }
+        if "bypass_cache" in params:
+            chat_params["bypass_cache"] = params["bypass_cache"]
+        return chat_params
+
+    def _parse_packed_response(self, response: str, indices: List[int],
+                               schema: Optional[Dict[str, Any]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Ordnet die Elemente einer gepackten Antwort ihren Eingabe-IDs zu.
+
+        Returns:
+            dict: ID -> resultierendes Dictionary, nur für gültige Elemente
+        """
+        items = extract_json(response, {"type": "array"})
+        if items is None:
+            return {}
+
+        item_schema = dict(schema or {}, type="object")
+        expected = set(indices)
+        results = {}
+        for item in items:
+            if not isinstance(item, dict) or not validate_schema(item.get("result"), item_schema):
+                continue
+            item_id = item.get("id")
+            if isinstance(item_id, int) and item_id in expected:
+                results[item_id] = item["result"]
+        return results
+
+    def dict_to_dict_packed(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Konvertiert viele Dictionaries, indem mehrere Eingaben in eine Anfrage gepackt werden.
+
+        Die Eingaben werden als JSON-Array mit IDs gesendet, sodass der
+        Konvertierungs-Prompt nur einmal pro Paket übertragen wird. Elemente,
+        die in der Antwort fehlen oder ungültig sind, werden einzeln per
+        dict_to_dict nachgefordert. Scheitert dagegen die Anfrage selbst
+        (z.B. Überlast nach allen Wiederholungen), wird der Fehler
+        weitergereicht, statt die Last durch Einzelanfragen zu vervielfachen.
+
+        Args:
+            params (dict): Ein Dictionary mit folgenden Schlüsseln:
+                - input_dicts (list): Die zu konvertierenden Eingabe-Dictionaries
+                - conversion_prompt (str): Anleitung für die Konvertierung
+                - model (str, optional): Zu verwendendes Modell
+                - pack_size (int, optional): Maximale Anzahl Eingaben pro Anfrage (Standard: 10)
+                - max_prompt_tokens (int, optional): Geschätztes Token-Budget pro Anfrage (Standard: 6000)
+                - max_workers (int, optional): Anzahl parallel gesendeter Pakete (Standard: max_concurrency)
 
-        response = self.answer_question(chat_params)
+        Returns:
+            list: Konvertierte Dictionaries in Eingabereihenfolge
 
-        # Versuche, aus der Antwort ein Dictionary zu extrahieren
+        Raises:
+            Exception: Der Fehler der ersten gescheiterten Paket-Anfrage
+        """
+        input_dicts = params["input_dicts"]
+        packs = self._pack_inputs(
+            input_dicts,
+            params["conversion_prompt"],
+            params.get("pack_size", 10),
+            params.get("max_prompt_tokens", 6000)
+        )
+        print(f"Converting {len(input_dicts)} dictionaries in {len(packs)} packed requests "
+              f"with {self.__class__.__name__}...")
+
+        def convert_pack(indices: List[int]) -> Dict[int, Dict[str, Any]]:
+            # Anfragefehler (auch Überlast nach allen Wiederholungen) werden weitergereicht
+            response = self.answer_question(self._build_packed_params(params, indices), raise_errors=True)
+            return self._parse_packed_response(response, indices, params.get("schema"))
+
+        single_params = {k: v for k, v in params.items() if k != "input_dicts"}
+
+        def convert_single(i: int) -> Dict[str, Any]:
+            return self.dict_to_dict(dict(single_params, input_dict=input_dicts[i]))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(input_dicts)
+        executor = ThreadPoolExecutor(max_workers=params.get("max_workers", self.max_concurrency))
         try:
-            # Suche nach JSON-Blöcken in der Antwort
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                print(f"Kein gültiges JSON-Dictionary in der {api_name}-Antwort gefunden.")
-                return {"error": "Konvertierung fehlgeschlagen", "raw_response": response}
-
-        except json.JSONDecodeError:
-            print(f"Konnte das Antwort-Dictionary von {api_name} nicht analysieren.")
-            return {"error": "JSON-Parsing fehlgeschlagen", "raw_response": response}
\ No newline at end of file
+            for pack_results in executor.map(convert_pack, packs):
+                for i, result in pack_results.items():
+                    results[i] = result
+
+            # Nur fehlende oder ungültige Elemente einzeln nachfordern, über denselben Pool
+            failed = [i for i, result in enumerate(results) if result is None]
+            if failed:
+                print(f"{len(failed)} Elemente werden einzeln nachgefordert.")
+                for i, result in zip(failed, executor.map(convert_single, failed)):
+                    results[i] = result
+        finally:
+            # Bei einem Fehler keine weiteren Pakete mehr senden
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        """
+        Gibt die Semaphore zurück, die gleichzeitige asynchrone Anfragen begrenzt.
+        Sie wird pro Event-Loop neu erzeugt.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_semaphore is None or self._async_loop is not loop:
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        return self._async_semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Gibt den Thread-Pool für blockierende HTTP-Aufrufe zurück.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=f"{self.__class__.__name__}-worker"
+            )
+        return self._executor
+
+    async def _run_async(self, func, params: Dict[str, Any], timeout: Optional[float] = None):
+        """
+        Führt einen blockierenden API-Aufruf nebenläufig aus.
+
+        Die Anzahl gleichzeitiger Aufrufe ist durch max_concurrency begrenzt.
+        Wird die aufrufende Task abgebrochen, bevor der Aufruf gestartet wurde,
+        wird er nicht mehr gesendet; ein bereits laufender Aufruf wird zu Ende
+        geführt, sein Ergebnis aber verworfen.
+
+        Args:
+            func: Die synchrone Methode (z.B. self.answer_question)
+            params (dict): Parameter für die Methode
+            timeout (float, optional): Timeout in Sekunden (Standard: self.timeout)
+
+        Raises:
+            asyncio.TimeoutError: Wenn der Aufruf das Timeout überschreitet
+        """
+        timeout = self.timeout if timeout is None else timeout
+        async with self._get_async_semaphore():
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), func, params)
+            return await asyncio.wait_for(future, timeout)
+
+    async def answer_question_async(self, params: Dict[str, Any], timeout: Optional[float] = None) -> str:
+        """
+        Asynchrone Variante von answer_question.
+
+        Verwendet dieselben Hooks (_create_request_payload, _extract_response_text)
+        bzw. die _send_question-Implementierung der Unterklasse.
+
+        Args:
+            params (dict): Parameter wie bei answer_question
+            timeout (float, optional): Timeout pro Anfrage in Sekunden
+
+        Returns:
+            str: Die Antwort des Modells
+        """
+        return await self._run_async(self.answer_question, params, timeout)
+
+    async def generate_qa_async(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, str]:
+        """
+        Asynchrone Variante von generate_qa.
+
+        Args:
+            params (dict): Parameter wie bei generate_qa
+            timeout (float, optional): Timeout pro Anfrage in Sekunden
+
+        Returns:
+            dict: Dictionary mit Frage und Antwort
+        """
+        response_text = await self.answer_question_async(params, timeout)
+        return {
+            "question": params["prompt"],
+            "answer": response_text
+        }
+
+    async def dict_to_dict_async(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Asynchrone Variante von dict_to_dict.
+
+        Args:
+            params (dict): Parameter wie bei dict_to_dict
+            timeout (float, optional): Timeout pro Anfrage in Sekunden
+
+        Returns:
+            dict: Das konvertierte Dictionary
+        """
+        response = await self.answer_question_async(self._build_conversion_params(params), timeout)
+        return self._parse_conversion_response(response, params.get("schema"))
+
+    def _run_batch(self, func: Callable[[Dict[str, Any]], Any], params_list: List[Dict[str, Any]],
+                   max_workers: Optional[int] = None, output_path: Optional[str] = None,
+                   resume: bool = True, show_progress: bool = True,
+                   description: str = "Batch") -> List[Any]:
+        """
+        Verteilt viele Anfragen auf einen begrenzten Thread-Pool.
+
+        Die Ergebnisse werden in Eingabereihenfolge zurückgegeben. Mit
+        output_path wird jedes erfolgreiche Ergebnis sofort als JSON-Zeile
+        ({"index", "result", "latency"}) angehängt; bei resume=True werden
+        bereits gespeicherte Indizes beim nächsten Lauf übersprungen, sodass
+        ein Abbruch nur die noch offenen Anfragen kostet. Fehlgeschlagene
+        Anfragen werden nicht gespeichert und beim nächsten Lauf wiederholt.
+
+        Die erste Zeile der Datei enthält einen Fingerabdruck (SHA-256 über
+        Modell, Batch-Art und params_list). Passt er beim Fortsetzen nicht
+        zur aktuellen Eingabe, wird abgebrochen, statt Ergebnisse anderer
+        Eingaben per Index zu übernehmen. Mit resume=False wird die Datei
+        neu angelegt.
+
+        Durchsatz und Latenz-Perzentile des Laufs stehen danach in
+        self.last_batch_stats.
+
+        Args:
+            func: Synchrone Funktion, die ein Parameter-Dictionary verarbeitet
+            params_list (list): Liste der Parameter-Dictionaries
+            max_workers (int, optional): Anzahl Worker (Standard: max_concurrency)
+            output_path (str, optional): Pfad der JSONL-Ergebnisdatei
+            resume (bool): Bereits gespeicherte Ergebnisse wiederverwenden;
+                False überschreibt output_path
+            show_progress (bool): Fortschrittsbalken anzeigen
+            description (str): Beschriftung des Fortschrittsbalkens
+
+        Returns:
+            list: Ergebnisse in Eingabereihenfolge; fehlgeschlagene Einträge
+                als {"error": ...}
+
+        Raises:
+            ValueError: Wenn output_path zu einer anderen Eingabe gehört
+        """
+        results: List[Any] = [None] * len(params_list)
+        done = set()
+        canonical = json.dumps({"model": self.model, "batch": description, "params_list": params_list},
+                               sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        header = {"batch": description, "total": len(params_list),
+                  "fingerprint": hashlib.sha256(canonical.encode("utf-8")).hexdigest()}
+        append = False
+
+        # Bereits gespeicherte Ergebnisse laden
+        if output_path and resume and os.path.isfile(output_path) and os.path.getsize(output_path) > 0:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                try:
+                    stored = json.loads(f.readline())
+                except json.JSONDecodeError:
+                    stored = None
+                if not isinstance(stored, dict) or stored.get("fingerprint") != header["fingerprint"]:
+                    raise ValueError(f"'{output_path}' gehört zu einer anderen Eingabe oder einem anderen "
+                                     f"Modell; mit resume=False neu beginnen oder eine andere Datei wählen.")
+                append = True
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # z.B. abgeschnittene letzte Zeile nach Absturz
+                    index = record.get("index")
+                    if isinstance(index, int) and 0 <= index < len(params_list):
+                        results[index] = record["result"]
+                        done.add(index)
+
+        pending = [i for i in range(len(params_list)) if i not in done]
+        latencies: List[float] = []
+        errors = 0
+
+        def timed_call(index: int):
+            start = time.perf_counter()
+            result = func(params_list[index])
+            return result, time.perf_counter() - start
+
+        from tqdm import tqdm
+
+        output_file = None
+        if output_path:
+            output_file = open(output_path, 'a' if append else 'w', encoding='utf-8')
+            if not append:
+                output_file.write(json.dumps(header, ensure_ascii=False) + "\n")
+                output_file.flush()
+        progress = tqdm(total=len(params_list), initial=len(done), desc=description,
+                        disable=not show_progress)
+        start_time = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_concurrency) as executor:
+                futures = {executor.submit(timed_call, i): i for i in pending}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        result, latency = future.result()
+                    except Exception as e:
+                        errors += 1
+                        results[index] = {"error": str(e)}
+                    else:
+                        results[index] = result
+                        latencies.append(latency)
+                        if output_file:
+                            record = {"index": index, "result": result, "latency": round(latency, 4)}
+                            output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                            output_file.flush()
+                    progress.update(1)
+                    if len(latencies) % 10 == 1:
+                        sorted_latencies = sorted(latencies)
+                        progress.set_postfix(p50=f"{percentile(sorted_latencies, 50):.2f}s",
+                                             errors=errors)
+        finally:
+            progress.close()
+            if output_file:
+                output_file.close()
+
+        elapsed = time.perf_counter() - start_time
+        sorted_latencies = sorted(latencies)
+        self.last_batch_stats = {
+            "total": len(params_list),
+            "resumed": len(done),
+            "completed": len(latencies),
+            "errors": errors,
+            "elapsed_s": elapsed,
+            "throughput_per_s": len(latencies) / elapsed if elapsed > 0 else None,
+            "latency_p50_s": percentile(sorted_latencies, 50),
+            "latency_p90_s": percentile(sorted_latencies, 90),
+            "latency_p99_s": percentile(sorted_latencies, 99),
+        }
+        return results
+
+    def generate_qa_batch(self, params_list: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                          output_path: Optional[str] = None, resume: bool = True,
+                          show_progress: bool = True) -> List[Dict[str, str]]:
+        """
+        Generiert viele Frage-Antwort-Paare parallel.
+
+        Args:
+            params_list (list): Parameter wie bei generate_qa, je Prompt ein Dictionary
+            max_workers (int, optional): Anzahl Worker (Standard: max_concurrency)
+            output_path (str, optional): JSONL-Datei, in die Ergebnisse laufend geschrieben werden
+            resume (bool): Bereits in output_path vorhandene Ergebnisse überspringen (False: Datei neu anlegen)
+            show_progress (bool): Fortschrittsbalken anzeigen
+
+        Returns:
+            list: Frage-Antwort-Dictionaries in Eingabereihenfolge
+        """
+        # Fehler auslösen statt als Antwort zurückgeben, damit sie nicht gespeichert werden
+        def qa(params: Dict[str, Any]) -> Dict[str, str]:
+            return {"question": params["prompt"], "answer": self.answer_question(params, raise_errors=True)}
+
+        return self._run_batch(qa, params_list, max_workers, output_path, resume, show_progress,
+                               description="QA-Paare")
+
+    def dict_to_dict_batch(self, params_list: List[Dict[str, Any]], max_workers: Optional[int] = None,
+                           output_path: Optional[str] = None, resume: bool = True,
+                           show_progress: bool = True) -> List[Dict[str, Any]]:
+        """
+        Konvertiert viele Dictionaries parallel.
+
+        Args:
+            params_list (list): Parameter wie bei dict_to_dict, je Eingabe ein Dictionary
+            max_workers (int, optional): Anzahl Worker (Standard: max_concurrency)
+            output_path (str, optional): JSONL-Datei, in die Ergebnisse laufend geschrieben werden
+            resume (bool): Bereits in output_path vorhandene Ergebnisse überspringen (False: Datei neu anlegen)
+            show_progress (bool): Fortschrittsbalken anzeigen
+
+        Returns:
+            list: Konvertierte Dictionaries in Eingabereihenfolge
+        """
+        # Anfrage- und Parsing-Fehler auslösen, damit sie nicht gespeichert werden
+        def convert(params: Dict[str, Any]) -> Dict[str, Any]:
+            response = self.answer_question(self._build_conversion_params(params), raise_errors=True)
+            return self._parse_conversion_response(response, params.get("schema"), raise_errors=True)
+
+        return self._run_batch(convert, params_list, max_workers, output_path, resume, show_progress,
+                               description="Dictionaries")
\ No newline at end of file
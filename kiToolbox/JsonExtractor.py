@@ -0,0 +1,426 @@
+import re
+import json
+import bisect
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# Zeichen, die innerhalb eines Strings einzeln betrachtet werden müssen
+_STRING_SPECIAL = re.compile(r'["\\\n]')
+_DECODER = json.JSONDecoder()
+# Klammern, hinter denen JSON beginnen kann; nur dort lohnt raw_decode, dessen
+# Fehlermeldung den Text bis zur Fehlerstelle durchzählt
+_JSON_START = re.compile(r'\{\s*["}]|\[\s*["{\[\]\-0-9tfnNI]')
+
+
+class _Frame:
+    """Eine geöffnete Klammer: möglicher Beginn eines JSON-Werts."""
+
+    __slots__ = ("start", "closer", "state", "children")
+
+    def __init__(self, start: int, closer: str):
+        self.start = start
+        self.closer = closer
+        # Erwartetes nächstes Element: "first", "key", "colon", "value" oder "after"
+        self.state = "first"
+        # Abgeschlossene, noch nicht geparste innere Kandidaten: (Start, Ende, Tiefe, Kinder)
+        self.children: List[tuple] = []
+
+
+class JsonExtractor:
+    """
+    Inkrementeller Extraktor für JSON-Objekte und -Arrays aus LLM-Antworten.
+
+    Der Text wird in einem Durchlauf Zeichen für Zeichen gelesen; dabei
+    werden Klammerebenen sowie Strings und Escape-Sequenzen verfolgt, sodass
+    ausgewogene Top-Level-Objekte ({...}) und -Arrays ([...]) gefunden werden,
+    auch wenn sie von Fließtext oder Markdown-Codeblöcken (```json ... ```)
+    umgeben sind oder mehrere davon in einer Antwort stehen. Mit feed()
+    können gestreamte Teiltexte verarbeitet werden, sobald sie eintreffen.
+
+    Jede öffnende Klammer ist ein Kandidat auf einem Stapel. Die grobe
+    JSON-Syntax (Schlüssel, Doppelpunkte, Kommas) wird mitgeprüft: verletzt
+    ein Zeichen sie (z.B. "{siehe"), werden der Kandidat und alle umgebenden
+    sofort verworfen, und innerhalb verworfener Kandidaten werden nur noch
+    Klammern gezählt. Innere Werte werden so geliefert, sobald sie
+    abgeschlossen sind, statt erst bei finish(); innere Kandidaten gültiger
+    Werte werden nur geparst, wenn der umgebende Wert sich als ungültig erweist.
+    """
+
+    def __init__(self):
+        self._frames: List[_Frame] = []
+        self._pos = 0
+        self._text, self._text_start = "", 0
+        # (Start, Ende) abgeschlossener, aber ungültiger Kandidaten; None: nicht aufzeichnen
+        self._failed_spans: Optional[List[tuple]] = None
+        self._reset_state()
+
+    def _reset_state(self):
+        """Leert den Stapel, behält aber die Textposition."""
+        self._frames.clear()
+        # Kandidaten unterhalb dieses Index sind ungültig, die darüber noch möglich
+        self._first_valid = 0
+        # Text ab dem äußersten gültigen Kandidaten (Position self._base), in Stücken;
+        # der aktuelle Teiltext ist bis self._recorded übernommen (None: nicht aufzeichnen)
+        self._buffer: List[str] = []
+        self._base = self._pos
+        self._recorded = None
+        self._in_string = False
+        self._escape = False
+        self._scalar = False
+
+    def _release(self, node: tuple, completed: List[tuple]):
+        """
+        Parst einen abgeschlossenen Kandidaten; ist er ungültig, werden
+        stattdessen seine inneren Kandidaten (in Textreihenfolge) geparst.
+        """
+        self._flush()
+        text = "".join(self._buffer)
+        self._buffer = [text]
+        pending = [node]
+        while pending:
+            start, end, depth, children = pending.pop()
+            try:
+                completed.append((json.loads(text[start - self._base:end - self._base]), depth, start))
+            except (json.JSONDecodeError, RecursionError):
+                if self._failed_spans is not None:
+                    self._failed_spans.append((start, end))
+                pending.extend(reversed(children))
+
+    def _flush(self):
+        """Übernimmt den bisher gelesenen Teil des aktuellen Teiltexts in den Puffer."""
+        if self._recorded is not None and self._recorded < self._pos:
+            self._buffer.append(self._text[self._recorded - self._text_start:self._pos - self._text_start])
+            self._recorded = self._pos
+
+    def _clear_buffer(self):
+        """Verwirft den Text, sobald kein gültiger Kandidat mehr offen ist."""
+        self._buffer = []
+        self._base = self._pos
+        self._recorded = None
+
+    def _invalidate(self, completed: List[tuple]):
+        """Verwirft alle offenen Kandidaten und liefert ihre abgeschlossenen inneren Werte."""
+        for frame in self._frames[self._first_valid:]:
+            for node in frame.children:
+                self._release(node, completed)
+            frame.children = []
+        self._first_valid = len(self._frames)
+        self._in_string = self._escape = self._scalar = False
+        self._clear_buffer()
+
+    def _open(self, char: str):
+        if self._first_valid == len(self._frames):
+            # Erster gültiger Kandidat: Text ab hier aufheben
+            self._buffer = []
+            self._base = self._recorded = self._pos - 1
+        self._frames.append(_Frame(self._pos - 1, "}" if char == "{" else "]"))
+
+    def _close(self, completed: List[tuple]):
+        frames = self._frames
+        index = len(frames) - 1
+        top = frames.pop()
+        node = (top.start, self._pos, index, top.children)
+        if index > self._first_valid:
+            # Innerhalb eines noch gültigen Kandidaten: erst bei Bedarf parsen
+            frames[-1].children.append(node)
+        else:
+            frames.append(top)
+            self._release(node, completed)
+            frames.pop()
+            self._first_valid = len(frames)
+            self._clear_buffer()
+
+    def _step(self, char: str, completed: List[tuple]) -> bool:
+        """
+        Verarbeitet ein Zeichen im obersten gültigen Kandidaten.
+
+        Returns:
+            bool: False, wenn das Zeichen die JSON-Syntax verletzt
+        """
+        top = self._frames[-1]
+        state = top.state
+        is_object = top.closer == "}"
+        if state == "value" or (state == "first" and not is_object):
+            top.state = "after"
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._open(char)
+            elif char in "-0123456789tfnNI":
+                self._scalar = True
+            elif state == "first" and char == "]":
+                self._close(completed)
+            else:
+                return False
+        elif state == "key" or state == "first":
+            if char == '"':
+                top.state = "colon"
+                self._in_string = True
+            elif state == "first" and char == "}":
+                self._close(completed)
+            else:
+                return False
+        elif state == "colon":
+            if char != ":":
+                return False
+            top.state = "value"
+        elif char == ",":
+            top.state = "key" if is_object else "value"
+        elif char == top.closer:
+            self._close(completed)
+        else:
+            return False
+        return True
+
+    def _feed(self, text: str) -> List[tuple]:
+        """Wie feed, liefert aber (Wert, Tiefe, Start)-Tupel; Tiefe 0 = nicht verschachtelt."""
+        completed = []
+        frames = self._frames
+        self._text, self._text_start = text, self._pos
+        if self._recorded is not None:
+            self._recorded = self._pos
+        i, n = 0, len(text)
+        while i < n:
+            if self._in_string and not self._escape:
+                # Gewöhnliche Zeichen eines Strings überspringen
+                match = _STRING_SPECIAL.search(text, i)
+                end = match.start() if match else n
+                if end > i:
+                    self._pos += end - i
+                    i = end
+                    continue
+            char = text[i]
+            i += 1
+            self._pos += 1
+            if self._first_valid < len(frames):
+                if self._in_string and char != "\n":
+                    if self._escape:
+                        self._escape = False
+                    elif char == "\\":
+                        self._escape = True
+                    elif char == '"':
+                        self._in_string = False
+                    continue
+                if self._scalar:
+                    if char.isalnum() or char in ".+-":
+                        continue
+                    self._scalar = False
+                if not self._in_string and (char.isspace() or self._step(char, completed)):
+                    continue
+                # Kein JSON (z.B. "{siehe [1]}" im Fließtext oder ein Zeilenumbruch in
+                # einem String): Kandidaten verwerfen, das Zeichen wird wie Fließtext behandelt
+                self._invalidate(completed)
+
+            # Fließtext und verworfene Kandidaten: nur Klammern zählen
+            if char in "{[":
+                if not _JSON_START.match(text, i - 1):
+                    self._open(char)
+                    continue
+                try:
+                    # Schneller Weg: vollständiger Wert im aktuellen Teiltext
+                    value, end = _DECODER.raw_decode(text, i - 1)
+                except (json.JSONDecodeError, RecursionError):
+                    self._open(char)
+                else:
+                    completed.append((value, len(frames), self._pos - 1))
+                    self._pos += end - i
+                    i = end
+            elif frames and char == frames[-1].closer:
+                if self._failed_spans is not None:
+                    self._failed_spans.append((frames[-1].start, self._pos))
+                frames.pop()
+                self._first_valid = len(frames)
+        self._flush()
+        self._text = ""
+        return completed
+
+    def _finish(self) -> List[tuple]:
+        """Wie finish, liefert aber (Wert, Tiefe, Start)-Tupel."""
+        completed = []
+        self._invalidate(completed)
+        self._reset_state()
+        return completed
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Verarbeitet den nächsten Teiltext.
+
+        Args:
+            text (str): Teiltext der Antwort
+
+        Returns:
+            list: Alle in diesem Teiltext abgeschlossenen, gültigen JSON-Werte
+        """
+        return [value for value, _, _ in self._feed(text)]
+
+    def finish(self) -> List[Any]:
+        """
+        Schließt die Verarbeitung ab.
+
+        Bleiben am Ende öffnende Klammern ohne Gegenstück übrig (z.B. eine
+        "{" im Fließtext vor dem eigentlichen JSON), werden die darin
+        abgeschlossenen Werte geliefert.
+
+        Returns:
+            list: Die dabei gefundenen JSON-Werte
+        """
+        return [value for value, _, _ in self._finish()]
+
+    def iter_values(self, chunks: Iterable[str]) -> Iterator[Any]:
+        """
+        Liefert JSON-Werte aus gestreamten Teiltexten, sobald sie vollständig sind.
+
+        Args:
+            chunks (iterable): Teiltexte, z.B. aus KIToolboxAPI.stream_answer
+
+        Yields:
+            Die gefundenen JSON-Werte in Reihenfolge ihres Auftretens
+        """
+        for chunk in chunks:
+            for value in self.feed(chunk):
+                yield value
+        for value in self.finish():
+            yield value
+
+
+def _strip_code_fences(text: str) -> List[str]:
+    """
+    Gibt die Inhalte von Markdown-Codeblöcken zurück (leer, falls keine vorhanden).
+    """
+    blocks = []
+    parts = text.split("```")
+    for i in range(1, len(parts), 2):
+        block = parts[i]
+        # Sprachkennung (z.B. "json") in der ersten Zeile entfernen
+        first_line, _, rest = block.partition("\n")
+        if first_line.strip() and not first_line.strip().startswith(("{", "[")):
+            block = rest
+        blocks.append(block)
+    return blocks
+
+
+def validate_schema(value: Any, schema: Optional[Dict[str, Any]]) -> bool:
+    """
+    Prüft einen Wert gegen ein einfaches Schema.
+
+    Unterstützt wird eine Teilmenge von JSON-Schema: "type" ("object",
+    "array", "string", "number", "integer", "boolean", "null"),
+    "required", "properties" und "items".
+
+    Args:
+        value: Der zu prüfende Wert
+        schema (dict, optional): Das Schema (None akzeptiert alles)
+
+    Returns:
+        bool: True, wenn der Wert dem Schema entspricht
+    """
+    if not schema:
+        return True
+
+    types = {
+        "object": dict,
+        "array": list,
+        "string": str,
+        "boolean": bool,
+        "null": type(None),
+    }
+    expected = schema.get("type")
+    if expected == "number":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+    elif expected == "integer":
+        if isinstance(value, bool) or not isinstance(value, int):
+            return False
+    elif expected in types and not isinstance(value, types[expected]):
+        return False
+
+    if isinstance(value, dict):
+        if any(key not in value for key in schema.get("required", [])):
+            return False
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value and not validate_schema(value[key], sub_schema):
+                return False
+    if isinstance(value, list) and "items" in schema:
+        return all(validate_schema(item, schema["items"]) for item in value)
+    return True
+
+
+def _outside_failed_spans(found: List[tuple], spans: List[tuple]) -> List[tuple]:
+    """
+    Entfernt Werte, die innerhalb eines abgeschlossenen, ungültigen Kandidaten
+    stehen (z.B. [1] in "{siehe [1]}").
+    """
+    # Verschachtelte Bereiche liegen ganz in ihrem äußeren: nur die äußersten behalten
+    outer: List[tuple] = []
+    for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if not outer or start >= outer[-1][1]:
+            outer.append((start, end))
+    starts = [start for start, _ in outer]
+    result = []
+    for value, depth, start in found:
+        index = bisect.bisect_right(starts, start) - 1
+        if index < 0 or start >= outer[index][1]:
+            result.append((value, depth, start))
+    return result
+
+
+def _find_values(text: str, schema: Optional[Dict[str, Any]] = None) -> List[tuple]:
+    """
+    Findet alle gültigen JSON-Werte eines Textes als (Wert, Tiefe, Start)-Tupel.
+
+    Inhalte von Codeblöcken werden bevorzugt; nur wenn diese nichts
+    Verwertbares enthalten, wird der gesamte Text durchsucht. Werte in
+    Klammern des Fließtexts, die sich wieder schließen, werden verworfen.
+    """
+    for source in ["\n".join(_strip_code_fences(text)), text]:
+        if not source:
+            continue
+        extractor = JsonExtractor()
+        extractor._failed_spans = []
+        found = extractor._feed(source) + extractor._finish()
+        found = _outside_failed_spans(found, extractor._failed_spans)
+        values = [entry for entry in found if validate_schema(entry[0], schema)]
+        if values:
+            return values
+    return []
+
+
+def extract_json_values(text: str, schema: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """
+    Findet alle gültigen Top-Level-JSON-Objekte und -Arrays in einem Text.
+
+    Inhalte von Codeblöcken werden bevorzugt; nur wenn diese nichts
+    Verwertbares enthalten, wird der gesamte Text durchsucht. Werte in
+    Klammern des Fließtexts zählen nicht: 'Text {siehe [1]} und {"a": 2}'
+    liefert nur {"a": 2}.
+
+    Args:
+        text (str): Die Antwort des Modells
+        schema (dict, optional): Schema, dem die Werte entsprechen müssen
+
+    Returns:
+        list: Die gefundenen JSON-Werte in Reihenfolge ihres Auftretens
+    """
+    return [value for value, _, _ in _find_values(text, schema)]
+
+
+def extract_json(text: str, schema: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+    """
+    Gibt den ersten gültigen JSON-Wert eines Textes zurück.
+
+    Werte in geschlossenen Klammern des Fließtexts werden ignoriert: in
+    '{siehe [1]} {"x": 1}' ist das Ergebnis {"x": 1}, nicht [1]. Werte
+    hinter einer nie geschlossenen Klammer (z.B. "Ergebnis {: {...}") werden
+    geliefert, haben aber Nachrang.
+
+    Args:
+        text (str): Die Antwort des Modells
+        schema (dict, optional): Schema, dem der Wert entsprechen muss
+
+    Returns:
+        Der erste passende JSON-Wert oder None
+    """
+    values = _find_values(text, schema)
+    if not values:
+        return None
+    return next((value for value, depth, _ in values if depth == 0), values[0][0])
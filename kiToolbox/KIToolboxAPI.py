@@ -1,9 +1,11 @@
 import json
-import requests
-from tqdm import tqdm
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional, Callable, TYPE_CHECKING
 
 from kiToolbox.BaseLlmAPI import BaseLlmAPI
+from kiToolbox.JsonExtractor import JsonExtractor, validate_schema
+
+if TYPE_CHECKING:
+    import requests
 
 
 class KIToolboxAPI(BaseLlmAPI):
@@ -17,6 +19,9 @@ class KIToolboxAPI(BaseLlmAPI):
     - claude-3-opus: Das leistungsstärkste Claude-3 Modell
     """
 
+    # Fehler der KI-Toolbox werden an den Aufrufer weitergereicht
+    _error_as_text = False
+
     def _get_default_model(self) -> str:
         """
         Gibt das Standardmodell für die KI-Toolbox zurück.
@@ -61,23 +66,122 @@ class KIToolboxAPI(BaseLlmAPI):
         # da die Antwort in einem anderen Format ist (zeilenweises JSON)
         return self.get_answer_text(self.parse_response(response_json))
 
-    def send_chat(self, params: Dict[str, Any]) -> requests.Response:
+    def send_chat(self, params: Dict[str, Any], stream: bool = False) -> "requests.Response":
         """
         Sendet eine Chat-Anfrage an die KI-Toolbox-API.
 
         Args:
             params (dict): Parameter für die Anfrage
+            stream (bool): Antwort nicht vorab vollständig laden, sondern
+                zeilenweise lesbar machen (siehe iter_events)
 
         Returns:
             requests.Response: Die HTTP-Antwort
         """
         url = f"{self.base_url}/send"
         payload = self._create_request_payload(params)
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+        self._observe_response(response)
         response.raise_for_status()
         return response
 
-    def parse_response(self, response: requests.Response) -> List[Dict[str, Any]]:
+    def iter_events(self, response: "requests.Response") -> Iterator[Dict[str, Any]]:
+        """
+        Liest die zeilenweise JSON-Antwort inkrementell, während sie eintrifft.
+
+        Args:
+            response: Eine mit stream=True gesendete HTTP-Antwort
+
+        Yields:
+            dict: Die geparsten JSON-Objekte (z.B. "chunk"- und "done"-Events)
+        """
+        for line in response.iter_lines():
+            self._count_response_bytes(len(line) + 1)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+    def stream_answer(self, params: Dict[str, Any],
+                      on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[str]:
+        """
+        Stellt eine Frage und liefert die Antwort stückweise, sobald Chunks eintreffen.
+
+        Der Speicherbedarf bleibt unabhängig von der Antwortlänge, da keine
+        Chunks zwischengespeichert werden. Liefert der Server nur ein
+        "done"-Event ohne vorherige Chunks, wird dessen Antworttext geliefert.
+
+        Args:
+            params (dict): Parameter für die Anfrage
+            on_done (callable, optional): Wird mit dem "done"-Event aufgerufen
+                (enthält z.B. die Thread-ID der Unterhaltung)
+
+        Yields:
+            str: Teiltexte der Antwort in Eingangsreihenfolge
+        """
+        with self.send_chat(params, stream=True) as response:
+            received_chunks = False
+            finished = False
+            for event in self.iter_events(response):
+                # Nach "done" den Rest der Antwort noch lesen (nicht abbrechen),
+                # damit die Verbindung vollständig gelesen in den Pool zurückgeht
+                if finished:
+                    continue
+                event_type = event.get("type")
+                if event_type == "chunk":
+                    received_chunks = True
+                    yield event.get("content", "")
+                elif event_type == "done":
+                    finished = True
+                    if on_done is not None:
+                        on_done(event)
+                    if not received_chunks and "response" in event:
+                        yield event["response"]
+
+    def stream_json(self, params: Dict[str, Any], schema: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Stellt eine Frage per Streaming und liefert JSON-Werte, sobald sie vollständig eingetroffen sind.
+
+        Das Parsen läuft parallel zum Empfang, sodass z.B. die Elemente einer
+        langen Antwort mit mehreren Objekten verarbeitet werden können,
+        bevor die Antwort vollständig ist.
+
+        Args:
+            params (dict): Parameter für die Anfrage
+            schema (dict, optional): Schema, dem die Werte entsprechen müssen
+
+        Yields:
+            Die gefundenen JSON-Werte in Reihenfolge ihres Auftretens
+        """
+        for value in JsonExtractor().iter_values(self.stream_answer(params)):
+            if validate_schema(value, schema):
+                yield value
+
+    def answer_question_streaming(self, params: Dict[str, Any],
+                                  on_chunk: Optional[Callable[[str], None]] = None,
+                                  on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+        """
+        Stellt eine Frage per Streaming und ruft für jeden Teiltext einen Callback auf.
+
+        Args:
+            params (dict): Parameter für die Anfrage
+            on_chunk (callable, optional): Wird mit jedem Teiltext aufgerufen
+            on_done (callable, optional): Wird mit dem "done"-Event aufgerufen
+
+        Returns:
+            str: Die vollständige Antwort
+        """
+        parts = []
+        for part in self.stream_answer(params, on_done):
+            if on_chunk is not None:
+                on_chunk(part)
+            parts.append(part)
+        return "".join(parts).strip()
+
+    def parse_response(self, response: "requests.Response") -> List[Dict[str, Any]]:
         """
         Parst die zeilenweise JSON-Antwort der KI-Toolbox-API.
 
@@ -120,14 +224,14 @@ class KIToolboxAPI(BaseLlmAPI):
         chunks = [obj["content"] for obj in parsed_objects if obj["type"] == "chunk"]
         return "".join(chunks).strip()
 
-    def answer_question(self, params: Dict[str, Any]) -> str:
+    def _send_question(self, params: Dict[str, Any]) -> str:
         """
-        Überschreibt die answer_question-Methode, um die spezielle
-        Verarbeitung der KI-Toolbox-API zu verwenden.
+        Überschreibt die _send_question-Methode, um die spezielle
+        Verarbeitung der KI-Toolbox-API zu verwenden. Die Antwort wird
+        gestreamt und beim Eintreffen geparst. Ein Callback in
+        params["on_done"] erhält das "done"-Event.
         """
-        resp = self.send_chat(params=params)
-        parsed = self.parse_response(resp)
-        return self.get_answer_text(parsed)
+        return self.answer_question_streaming(params, on_done=params.get("on_done"))
 
 
 def main():
@@ -0,0 +1,345 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+
+# Bucket-Grenzen des Latenz-Histogramms in Sekunden
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Verbindungsaufbauten des aktuellen Threads (Anzahl und Dauer inkl. TLS)
+_connect_timing = threading.local()
+
+# Wird erst beim Erstellen der ersten Session definiert (siehe create_timed_adapter)
+_timed_adapter_class = None
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """
+    Berechnet das q-Perzentil (0-100) einer sortierten Liste (Nearest-Rank-Methode).
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(q / 100.0 * len(sorted_values) + 0.5 - 1e-9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def reset_connect_timing():
+    """
+    Setzt die Verbindungsmessung des aktuellen Threads zurück.
+    """
+    _connect_timing.count = 0
+    _connect_timing.seconds = 0.0
+
+
+def get_connect_timing() -> Tuple[int, float]:
+    """
+    Gibt Anzahl und Gesamtdauer der seit dem letzten Zurücksetzen im
+    aktuellen Thread aufgebauten Verbindungen zurück.
+    """
+    return getattr(_connect_timing, "count", 0), getattr(_connect_timing, "seconds", 0.0)
+
+
+def _record_connect(seconds: float):
+    _connect_timing.count = getattr(_connect_timing, "count", 0) + 1
+    _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + seconds
+
+
+def create_timed_adapter(**kwargs):
+    """
+    Erstellt einen HTTPAdapter, der die Dauer jedes Verbindungsaufbaus
+    (TCP und TLS) misst.
+
+    Wiederverwendete Keep-Alive-Verbindungen verursachen keine Messung,
+    sodass die Verbindungszeit einer Anfrage bei warmem Pool 0 ist.
+    requests und urllib3 werden erst hier importiert.
+
+    Args:
+        **kwargs: Argumente für requests.adapters.HTTPAdapter
+
+    Returns:
+        requests.adapters.HTTPAdapter: Der Adapter
+    """
+    global _timed_adapter_class
+    if _timed_adapter_class is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        def timed_connect(connection_class):
+            def connect(self):
+                start = time.perf_counter()
+                try:
+                    connection_class.connect(self)
+                finally:
+                    _record_connect(time.perf_counter() - start)
+            return connect
+
+        timed_http = type("TimedHTTPConnection", (HTTPConnection,),
+                          {"connect": timed_connect(HTTPConnection)})
+        timed_https = type("TimedHTTPSConnection", (HTTPSConnection,),
+                           {"connect": timed_connect(HTTPSConnection)})
+        pool_classes = {
+            "http": type("TimedHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": timed_http}),
+            "https": type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": timed_https}),
+        }
+
+        class TimedHTTPAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **pool_kwargs):
+                super().init_poolmanager(*args, **pool_kwargs)
+                self.poolmanager.pool_classes_by_scheme = dict(pool_classes)
+
+        _timed_adapter_class = TimedHTTPAdapter
+    return _timed_adapter_class(**kwargs)
+
+
+class Histogram:
+    """
+    Kumulatives Histogramm im Prometheus-Format.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[tuple]:
+        """
+        Gibt (Obergrenze, kumulative Anzahl) je Bucket zurück, zuletzt "+Inf".
+        """
+        result, total = [], 0
+        for bound, count in zip(list(self.buckets) + [float("inf")], self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class JsonlTraceHook:
+    """
+    Schreibt jedes Anfrage-Ereignis als JSON-Zeile in eine Trace-Datei.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __call__(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class MetricsCollector:
+    """
+    Sammelt Kennzahlen der LLM-Anfragen und gibt sie an Hooks weiter.
+
+    Für jeden Aufruf von answer_question entsteht ein Ereignis mit Modell,
+    Cache-Status, Wiederholungen, Verbindungs-, Erstbyte- und Gesamtzeit,
+    Anfrage- und Antwortgröße sowie ggf. dem Fehler. Die Ereignisse werden
+    pro API und Modell aggregiert (Zähler, Latenz-Histogramm, Stichprobe
+    für Perzentile) und an alle Hooks übergeben, z.B. eine Callback-Funktion
+    oder einen JsonlTraceHook. Eine Instanz kann von mehreren APIs geteilt
+    werden.
+    """
+
+    def __init__(self, hooks: Optional[List[Callable[[Dict[str, Any]], None]]] = None,
+                 buckets: Iterable[float] = DEFAULT_BUCKETS, sample_size: int = 10000):
+        """
+        Args:
+            hooks (list, optional): Funktionen, die jedes Ereignis erhalten
+            buckets (iterable): Bucket-Grenzen des Latenz-Histogramms in Sekunden
+            sample_size (int): Anzahl der letzten Latenzen pro Modell für Perzentile
+        """
+        self.hooks = list(hooks or [])
+        self.buckets = tuple(buckets)
+        self.sample_size = sample_size
+        self._series: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Registriert eine Funktion, die jedes Anfrage-Ereignis erhält.
+        """
+        self.hooks.append(hook)
+
+    def _get_series(self, api: str, model: str) -> Dict[str, Any]:
+        key = (api, model)
+        series = self._series.get(key)
+        if series is None:
+            series = {
+                "requests": 0,
+                "errors": 0,
+                "retries": 0,
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "shared": 0,
+                "responses": 0,
+                "connections": 0,
+                "connect_s": 0.0,
+                "first_byte_s": 0.0,
+                "request_bytes": 0,
+                "response_bytes": 0,
+                "histogram": Histogram(self.buckets),
+                "latencies": deque(maxlen=self.sample_size),
+            }
+            self._series[key] = series
+        return series
+
+    def record(self, event: Dict[str, Any]):
+        """
+        Nimmt ein Anfrage-Ereignis auf und reicht es an die Hooks weiter.
+
+        Args:
+            event (dict): Ereignis mit den Schlüsseln api, model, cache
+                ("hit", "miss" oder None), shared, retries, connections,
+                connect_s, first_byte_s, total_s, request_bytes,
+                response_bytes und error
+        """
+        with self._lock:
+            series = self._get_series(event["api"], event["model"])
+            series["requests"] += 1
+            series["errors"] += 1 if event.get("error") else 0
+            series["retries"] += event.get("retries", 0)
+            if event.get("cache") == "hit":
+                series["cache_hits"] += 1
+            elif event.get("cache") == "miss":
+                series["cache_misses"] += 1
+            series["shared"] += 1 if event.get("shared") else 0
+            series["responses"] += 1 if event.get("first_byte_s") is not None else 0
+            series["connections"] += event.get("connections", 0)
+            series["connect_s"] += event.get("connect_s") or 0.0
+            series["first_byte_s"] += event.get("first_byte_s") or 0.0
+            series["request_bytes"] += event.get("request_bytes", 0)
+            series["response_bytes"] += event.get("response_bytes", 0)
+            series["histogram"].observe(event["total_s"])
+            series["latencies"].append(event["total_s"])
+
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                print(f"Fehler im Metrik-Hook: {e}")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Gibt die aggregierten Kennzahlen pro API und Modell zurück.
+
+        Returns:
+            list: Je API/Modell ein Dictionary mit Anzahlen, Cache-Trefferquote,
+                mittleren Teilzeiten und Latenz-Perzentilen
+        """
+        with self._lock:
+            rows = []
+            for (api, model), s in sorted(self._series.items()):
+                hist = s["histogram"]
+                sorted_latencies = sorted(s["latencies"])
+                lookups = s["cache_hits"] + s["cache_misses"]
+                rows.append({
+                    "api": api,
+                    "model": model,
+                    "requests": s["requests"],
+                    "errors": s["errors"],
+                    "retries": s["retries"],
+                    "cache_hit_ratio": s["cache_hits"] / lookups if lookups else None,
+                    "shared": s["shared"],
+                    "connections": s["connections"],
+                    "connect_mean_s": s["connect_s"] / s["connections"] if s["connections"] else None,
+                    "first_byte_mean_s": s["first_byte_s"] / s["responses"] if s["responses"] else None,
+                    "total_mean_s": hist.sum / hist.count if hist.count else None,
+                    "latency_p50_s": percentile(sorted_latencies, 50),
+                    "latency_p90_s": percentile(sorted_latencies, 90),
+                    "latency_p99_s": percentile(sorted_latencies, 99),
+                    "request_bytes": s["request_bytes"],
+                    "response_bytes": s["response_bytes"],
+                })
+            return rows
+
+    def to_prometheus(self, prefix: str = "llm") -> str:
+        """
+        Exportiert die Kennzahlen im Prometheus-Textformat.
+
+        Args:
+            prefix (str): Präfix der Metriknamen
+
+        Returns:
+            str: Der Export, z.B. zum Ausliefern unter /metrics oder für
+                den Textfile-Collector des Node-Exporters
+        """
+        counters = [
+            ("requests_total", "requests", "Anzahl der Anfragen"),
+            ("errors_total", "errors", "Anzahl fehlgeschlagener Anfragen"),
+            ("retries_total", "retries", "Anzahl der Wiederholungen"),
+            ("cache_hits_total", "cache_hits", "Anzahl der Cache-Treffer"),
+            ("cache_misses_total", "cache_misses", "Anzahl der Cache-Fehltreffer"),
+            ("shared_total", "shared", "Per Single-Flight geteilte Anfragen"),
+            ("responses_total", "responses", "Empfangene HTTP-Antworten"),
+            ("connections_total", "connections", "Neu aufgebaute Verbindungen"),
+            ("connect_seconds_total", "connect_s", "Summe der Verbindungszeiten"),
+            ("first_byte_seconds_total", "first_byte_s", "Summe der Zeiten bis zum ersten Byte"),
+            ("request_bytes_total", "request_bytes", "Gesendete Bytes"),
+            ("response_bytes_total", "response_bytes", "Empfangene Bytes"),
+        ]
+        lines = []
+        with self._lock:
+            series = sorted(self._series.items())
+            for name, field, help_text in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for (api, model), s in series:
+                    lines.append(f'{prefix}_{name}{{api="{api}",model="{model}"}} {s[field]}')
+
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Gesamtdauer der Anfragen")
+            lines.append(f"# TYPE {name} histogram")
+            for (api, model), s in series:
+                labels = f'api="{api}",model="{model}"'
+                hist = s["histogram"]
+                for bound, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "llm"):
+        """
+        Schreibt den Prometheus-Export atomar in eine Datei.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        """
+        Verwirft alle aggregierten Kennzahlen.
+        """
+        with self._lock:
+            self._series.clear()
+
+    def close(self):
+        """
+        Schließt alle Hooks mit close()-Methode (z.B. Trace-Dateien).
+        """
+        for hook in self.hooks:
+            close = getattr(hook, "close", None)
+            if close is not None:
+                close()
\ No newline at end of file
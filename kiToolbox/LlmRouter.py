@@ -0,0 +1,250 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Callable
+
+from kiToolbox.BaseLlmAPI import BaseLlmAPI
+
+
+class BackendStats:
+    """
+    Beobachtete Latenz und Fehlerrate eines Backends (exponentiell geglättet).
+    """
+
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.in_flight = 0
+
+    def record(self, latency: float, success: bool):
+        """
+        Aktualisiert die Statistik nach einer abgeschlossenen Anfrage.
+        """
+        self.requests += 1
+        a = self.smoothing
+        self.error_rate = (1 - a) * self.error_rate + a * (0.0 if success else 1.0)
+        if success:
+            self.consecutive_failures = 0
+            self.latency = latency if self.latency is None else (1 - a) * self.latency + a * latency
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+
+class LlmRouter:
+    """
+    Verteilt Anfragen auf mehrere LLM-Backends (Modelle oder Endpunkte).
+
+    Jede Anfrage geht an das schnellste gesunde Backend, gemessen an der
+    geglätteten Latenz; Backends ohne Messwert werden zuerst ausprobiert.
+    Ein Backend gilt als ungesund, wenn seine Fehlerrate über
+    max_error_rate steigt oder es mehrfach hintereinander scheitert; es
+    wird dann für cooldown Sekunden gemieden.
+
+    Mit Hedging wird eine Anfrage, die nach hedge_after Sekunden (bzw. nach
+    hedge_factor mal der üblichen Latenz des Backends) noch nicht
+    beantwortet ist, zusätzlich an das nächstbeste Backend geschickt; die
+    erste erfolgreiche Antwort gewinnt.
+    """
+
+    def __init__(self, backends: List[BaseLlmAPI], params: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            backends (list): Die Backend-Instanzen (z.B. KIToolboxAPI mit
+                verschiedenen Modellen oder base_urls)
+            params (dict, optional): Ein Dictionary mit folgenden Parametern:
+                - max_error_rate (float): Fehlerrate, ab der ein Backend gemieden wird (Standard: 0.5)
+                - max_consecutive_failures (int): Fehler in Folge bis zur Sperre (Standard: 3)
+                - cooldown (float): Sperrdauer in Sekunden (Standard: 30)
+                - hedge (bool): Hedged Requests aktivieren (Standard: False)
+                - hedge_after (float, optional): Feste Wartezeit bis zum Hedge in Sekunden
+                - hedge_factor (float): Vielfaches der Backend-Latenz bis zum Hedge (Standard: 2)
+                - max_workers (int): Threads für Hedged Requests (Standard: 16)
+        """
+        if not backends:
+            raise ValueError("At least one backend is required.")
+        params = params or {}
+        self.backends = list(backends)
+        self.stats = [BackendStats() for _ in self.backends]
+        self.max_error_rate = params.get("max_error_rate", 0.5)
+        self.max_consecutive_failures = params.get("max_consecutive_failures", 3)
+        self.cooldown = params.get("cooldown", 30.0)
+        self.hedge = params.get("hedge", False)
+        self.hedge_after = params.get("hedge_after")
+        self.hedge_factor = params.get("hedge_factor", 2.0)
+        self.hedged_requests = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=params.get("max_workers", 16),
+                                            thread_name_prefix="LlmRouter")
+
+    def _is_healthy(self, stats: BackendStats, now: float) -> bool:
+        return now >= stats.unhealthy_until and stats.error_rate <= self.max_error_rate
+
+    def _ranked_backends(self, exclude: Optional[set] = None) -> List[int]:
+        """
+        Sortiert die Backends: gesunde vor ungesunden, unbekannte Latenz
+        zuerst, sonst aufsteigend nach geglätteter Latenz und Auslastung.
+        """
+        now = time.monotonic()
+        exclude = exclude or set()
+        with self._lock:
+            def rank(i):
+                s = self.stats[i]
+                expected = (s.latency or 0.0) * (1 + s.in_flight)
+                return (not self._is_healthy(s, now), s.latency is not None, expected, s.in_flight)
+            return sorted((i for i in range(len(self.backends)) if i not in exclude), key=rank)
+
+    def _call_backend(self, index: int, request: Callable[[BaseLlmAPI], Any]) -> Any:
+        """
+        Führt die Anfrage auf einem Backend aus und aktualisiert dessen Statistik.
+        """
+        stats = self.stats[index]
+        with self._lock:
+            stats.in_flight += 1
+        start = time.perf_counter()
+        success = False
+        try:
+            result = request(self.backends[index])
+            success = True
+            return result
+        finally:
+            latency = time.perf_counter() - start
+            with self._lock:
+                stats.in_flight -= 1
+                stats.record(latency, success)
+                if not success and stats.consecutive_failures >= self.max_consecutive_failures:
+                    stats.unhealthy_until = time.monotonic() + self.cooldown
+                    # Nach der Sperre wird das Backend mit frischer Statistik erneut geprüft
+                    stats.consecutive_failures = 0
+                    stats.error_rate = 0.0
+
+    def _hedge_delay(self, index: int) -> Optional[float]:
+        if not self.hedge or len(self.backends) < 2:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        latency = self.stats[index].latency
+        return None if latency is None else self.hedge_factor * latency
+
+    def _route(self, request: Callable[[BaseLlmAPI], Any]) -> Any:
+        """
+        Führt eine Anfrage auf dem schnellsten gesunden Backend aus.
+
+        Scheitert ein Backend, wird das nächste versucht. Erst wenn alle
+        Backends gescheitert sind, wird der letzte Fehler weitergereicht.
+
+        Args:
+            request (callable): Erhält das gewählte Backend und sendet die
+                Anfrage; die Parameter werden so pro Backend (z.B. mit
+                dessen Modell) erstellt
+
+        Returns:
+            Das Ergebnis von request
+        """
+        ranked = self._ranked_backends()
+        primary = ranked[0]
+        delay = self._hedge_delay(primary)
+
+        if delay is None:
+            last_error = None
+            for index in ranked:
+                try:
+                    return self._call_backend(index, request)
+                except Exception as e:
+                    last_error = e
+            raise last_error
+
+        # Hedged Request: zweites Backend nach Ablauf der Wartezeit zuschalten
+        pending = {self._executor.submit(self._call_backend, primary, request): primary}
+        remaining = ranked[1:]
+        last_error = None
+        deadline = time.monotonic() + delay
+
+        while pending or remaining:
+            timeout = max(0.0, deadline - time.monotonic()) if remaining else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                for other in pending:
+                    other.cancel()
+                return result
+
+            # Hedge bei Zeitüberschreitung oder sofortiger Fehlerfall-Ausweichung
+            if remaining and (not pending or time.monotonic() >= deadline):
+                index = remaining.pop(0)
+                if pending:
+                    with self._lock:
+                        self.hedged_requests += 1
+                pending[self._executor.submit(self._call_backend, index, request)] = index
+                deadline = time.monotonic() + (self._hedge_delay(index) or delay)
+
+        raise last_error
+
+    def answer_question(self, params: Dict[str, Any]) -> str:
+        """
+        Beantwortet eine Frage über das schnellste gesunde Backend.
+
+        Args:
+            params (dict): Parameter wie bei BaseLlmAPI.answer_question
+
+        Returns:
+            str: Die Antwort des Modells
+        """
+        return self._route(lambda backend: backend.answer_question(params, raise_errors=True))
+
+    def generate_qa(self, params: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Generiert ein Frage-Antwort-Paar über das schnellste gesunde Backend.
+        """
+        return {
+            "question": params["prompt"],
+            "answer": self.answer_question(params)
+        }
+
+    def dict_to_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Konvertiert ein Dictionary über das schnellste gesunde Backend
+        (Parameter wie bei BaseLlmAPI.dict_to_dict).
+        """
+        def convert(backend: BaseLlmAPI) -> Dict[str, Any]:
+            # Parameter mit dem Modell des gewählten Backends (sofern nicht vorgegeben)
+            response = backend.answer_question(backend._build_conversion_params(params), raise_errors=True)
+            return backend._parse_conversion_response(response, params.get("schema"))
+
+        return self._route(convert)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Gibt die beobachteten Kennzahlen aller Backends zurück.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "backend": f"{b.__class__.__name__}({b.model}, {b.base_url})",
+                    "latency_s": s.latency,
+                    "error_rate": s.error_rate,
+                    "requests": s.requests,
+                    "failures": s.failures,
+                    "healthy": self._is_healthy(s, now),
+                }
+                for b, s in zip(self.backends, self.stats)
+            ]
+
+    def close(self):
+        """
+        Beendet den Thread-Pool und schließt alle Backends.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for backend in self.backends:
+            backend.close()
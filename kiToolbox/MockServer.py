@@ -0,0 +1,254 @@
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """
+    Beantwortet POST-Anfragen an <Pfad>/send im Zeilenformat der KI-Toolbox.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Kleine Chunks sofort senden (wie produktive Server), sonst verzögern
+    # Nagle-Algorithmus und Delayed ACK jede Antwort auf Keep-Alive-Verbindungen
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _write_chunk(self, data: bytes):
+        # HTTP/1.1 Chunked Transfer Encoding, damit Teilantworten sofort ankommen
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        mock = self.server.mock
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        plan = mock._begin_request(self.client_address)
+        try:
+            if not self.path.endswith("/send"):
+                self.send_error(404)
+                return
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError:
+                self.send_error(400, "Ungültiges JSON")
+                return
+
+            time.sleep(plan["latency"])
+
+            if plan["error"]:
+                self.send_response(mock.error_status)
+                if mock.retry_after is not None:
+                    self.send_header("Retry-After", str(mock.retry_after))
+                self.send_header("Content-Type", "application/json")
+                error_body = json.dumps({"error": "Simulierter Fehler"}).encode("utf-8")
+                self.send_header("Content-Length", str(len(error_body)))
+                self.end_headers()
+                self.wfile.write(error_body)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            parts = mock.build_answer(payload.get("prompt", ""))
+            for i, part in enumerate(parts):
+                if plan["disconnect"] and i == len(parts) // 2:
+                    # Verbindung mitten in der Antwort abbrechen
+                    self.close_connection = True
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+                    return
+                if i > 0 and mock.chunk_delay:
+                    time.sleep(mock.chunk_delay)
+                event = {"type": "chunk", "content": part}
+                self._write_chunk((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+
+            thread_id = payload.get("thread") or f"mock-thread-{plan['index']}"
+            done = {"type": "done", "response": "".join(parts), "thread": {"id": thread_id}}
+            self._write_chunk((json.dumps(done, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            mock._end_request()
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Vom Client abgebrochene Verbindungen sind im Test erwartbar
+        pass
+
+
+class MockKIToolboxServer:
+    """
+    Lokaler Testserver, der das Protokoll der KI-Toolbox nachbildet.
+
+    POST-Anfragen an <base_url>/send werden zeilenweise mit "chunk"-Events
+    und einem abschließenden "done"-Event beantwortet. Latenz bis zum
+    ersten Byte, Anzahl und Rate der Chunks sowie Fehler (HTTP-Status,
+    Verbindungsabbrüche) sind konfigurierbar, sodass der Client ohne
+    Netzwerk und Token reproduzierbar getestet und vermessen werden kann.
+    Der Server läuft in einem Hintergrund-Thread.
+
+    Beispiel:
+        with MockKIToolboxServer({"latency": 0.05}) as server:
+            api = KIToolboxAPI({"token_filepath": ..., "base_url": server.base_url})
+    """
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            params (dict, optional): Ein Dictionary mit folgenden Parametern:
+                - host (str): Adresse (Standard: "127.0.0.1")
+                - port (int): Port (Standard: 0 = beliebiger freier Port)
+                - latency (float): Wartezeit bis zur Antwort in Sekunden (Standard: 0)
+                - latency_jitter (float): Zufällige Zusatzlatenz, gleichverteilt in [0, latency_jitter]
+                - chunks (int): Anzahl der Chunks pro Antwort (Standard: 10)
+                - chunk_size (int): Zeichen pro Chunk (Standard: 20)
+                - chunk_rate (float, optional): Chunks pro Sekunde (Standard: unbegrenzt)
+                - error_rate (float): Anteil der Anfragen, die mit error_status scheitern (Standard: 0)
+                - error_status (int): HTTP-Status simulierter Fehler (Standard: 503)
+                - retry_after (float, optional): Wert des Retry-After-Headers bei Fehlern
+                - disconnect_rate (float): Anteil der Antworten, die mittendrin abbrechen (Standard: 0)
+                - seed (int, optional): Startwert des Zufallsgenerators
+        """
+        params = params or {}
+        self.host = params.get("host", "127.0.0.1")
+        self.port = params.get("port", 0)
+        self.latency = params.get("latency", 0.0)
+        self.latency_jitter = params.get("latency_jitter", 0.0)
+        self.chunks = params.get("chunks", 10)
+        self.chunk_size = params.get("chunk_size", 20)
+        chunk_rate = params.get("chunk_rate")
+        self.chunk_delay = 1.0 / chunk_rate if chunk_rate else 0.0
+        self.error_rate = params.get("error_rate", 0.0)
+        self.error_status = params.get("error_status", 503)
+        self.retry_after = params.get("retry_after")
+        self.disconnect_rate = params.get("disconnect_rate", 0.0)
+        self._random = random.Random(params.get("seed"))
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Setzt die Zähler des Servers zurück.
+        """
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.disconnects = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self._clients = set()
+
+    def _begin_request(self, client_address) -> Dict[str, Any]:
+        """
+        Zählt eine Anfrage und legt Latenz und Fehlerart fest.
+        """
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self._clients.add(client_address)
+            error = self._random.random() < self.error_rate
+            disconnect = not error and self._random.random() < self.disconnect_rate
+            self.errors += 1 if error else 0
+            self.disconnects += 1 if disconnect else 0
+            return {
+                "index": self.requests,
+                "latency": self.latency + self._random.uniform(0, self.latency_jitter),
+                "error": error,
+                "disconnect": disconnect,
+            }
+
+    def _end_request(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def build_answer(self, prompt: str) -> list:
+        """
+        Erzeugt die Chunks einer Antwort (deterministisch aus dem Prompt).
+        """
+        text = f"Antwort auf: {prompt} "
+        repeated = (text * (self.chunks * self.chunk_size // max(len(text), 1) + 1))
+        return [repeated[i * self.chunk_size:(i + 1) * self.chunk_size] for i in range(self.chunks)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gibt die Zähler des Servers zurück (Anfragen, Fehler, Verbindungen, maximale Parallelität).
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "disconnects": self.disconnects,
+                "connections": len(self._clients),
+                "max_in_flight": self.max_in_flight,
+            }
+
+    @property
+    def base_url(self) -> str:
+        """
+        Basis-URL für KIToolboxAPI (Anfragen gehen an base_url + "/send").
+        """
+        return f"http://{self.host}:{self.port}/api/v1/chat"
+
+    def start(self) -> str:
+        """
+        Startet den Server im Hintergrund.
+
+        Returns:
+            str: Die Basis-URL des Servers
+        """
+        self._server = _MockHTTPServer((self.host, self.port), _MockHandler)
+        self._server.mock = self
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                        name="MockKIToolboxServer")
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """
+        Beendet den Server.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    """
+    Startet den Testserver im Vordergrund.
+    """
+    server = MockKIToolboxServer({"port": 8765, "latency": 0.2, "chunk_rate": 50})
+    print(f"Mock-Server läuft unter {server.start()} (Beenden mit Strg+C)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
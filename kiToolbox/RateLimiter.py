@@ -0,0 +1,184 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Iterable
+
+
+class TokenBucket:
+    """
+    Clientseitiger Rate-Limiter nach dem Token-Bucket-Verfahren.
+
+    Der Bucket füllt sich mit rate Tokens pro Sekunde bis zur Kapazität
+    capacity (erlaubte Burst-Größe). Jede Anfrage verbraucht ein Token;
+    ist keines verfügbar, blockiert acquire(), bis genug nachgefüllt ist.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate (float): Nachfüllrate in Tokens (Anfragen) pro Sekunde
+            capacity (float, optional): Maximale Anzahl Tokens (Standard: max(1, rate))
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0):
+        """
+        Entnimmt Tokens und blockiert, bis diese verfügbar sind.
+
+        Args:
+            tokens (float): Anzahl benötigter Tokens
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Adaptive Begrenzung gleichzeitiger Anfragen nach dem AIMD-Prinzip.
+
+    Erfolgreiche Anfragen unterhalb der Ziel-Latenz erhöhen das Limit
+    additiv (um etwa 1 pro vollem Durchlauf des Limits). Fehler oder
+    Latenzen über dem Ziel senken es multiplikativ, höchstens einmal pro
+    cooldown Sekunden, damit ein Schwall gleichzeitiger Fehler das Limit
+    nicht sofort auf das Minimum drückt.
+    """
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 64,
+                 latency_target: Optional[float] = None, decrease_factor: float = 0.5,
+                 cooldown: float = 1.0):
+        """
+        Args:
+            initial (float): Anfangslimit
+            minimum (float): Untergrenze des Limits
+            maximum (float): Obergrenze des Limits
+            latency_target (float, optional): Latenz in Sekunden, ab der gedrosselt wird
+            decrease_factor (float): Faktor bei Drosselung
+            cooldown (float): Mindestabstand zwischen zwei Drosselungen in Sekunden
+        """
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wartet, bis eine Anfrage innerhalb des aktuellen Limits gestartet werden darf.
+        """
+        with self._condition:
+            while self.in_flight >= max(1, int(self.limit)):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False):
+        """
+        Gibt einen Platz frei und passt das Limit an.
+
+        Args:
+            latency (float, optional): Gemessene Latenz der Anfrage in Sekunden
+            overloaded (bool): Die Anfrage ist an Überlast gescheitert (z.B. 429, 503, Timeout)
+        """
+        with self._condition:
+            self.in_flight -= 1
+            too_slow = (self.latency_target is not None and latency is not None
+                        and latency > self.latency_target)
+            if overloaded or too_slow:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+            self._condition.notify_all()
+
+
+class RetryPolicy:
+    """
+    Wiederholungsstrategie mit exponentiellem Backoff und Jitter.
+
+    Wiederholt werden Verbindungsfehler, Timeouts und HTTP-Statuscodes aus
+    retry_statuses. Ein Retry-After-Header des Servers wird als
+    Mindestwartezeit berücksichtigt.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504)):
+        """
+        Args:
+            max_retries (int): Maximale Anzahl Wiederholungen
+            base_delay (float): Basiswartezeit in Sekunden
+            max_delay (float): Maximale Wartezeit in Sekunden
+            retry_statuses (iterable): HTTP-Statuscodes, die wiederholt werden
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Prüft, ob ein Fehler auf vorübergehende Überlast hindeutet.
+        """
+        import requests
+
+        if isinstance(error, requests.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in self.retry_statuses
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        """
+        Liest die Wartezeit aus einem Retry-After-Header (Sekunden oder HTTP-Datum).
+        """
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Berechnet die Wartezeit vor der nächsten Wiederholung ("Full Jitter").
+
+        Args:
+            attempt (int): Nummer der fehlgeschlagenen Anfrage (0 = erste)
+            error (Exception, optional): Der aufgetretene Fehler
+
+        Returns:
+            float: Wartezeit in Sekunden
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = self.retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, Any, Optional
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Normalisiert Payload-Werte, damit gleichwertige Anfragen denselben Schlüssel erhalten.
+    """
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(model: str, payload: Dict[str, Any]) -> str:
+    """
+    Erzeugt einen inhaltsbasierten Schlüssel aus Modell und normalisierter Payload.
+
+    Args:
+        model (str): Das verwendete Modell
+        payload (dict): Die Anfrage-Payload
+
+    Returns:
+        str: SHA-256-Hash als Hex-String
+    """
+    canonical = json.dumps(
+        {"model": model, "payload": _normalize(payload)},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistenter Antwort-Cache auf SQLite-Basis.
+
+    Einträge verfallen nach ttl Sekunden. Überschreitet der Cache max_entries
+    Einträge oder max_bytes Antwortgröße, werden die am längsten nicht
+    gelesenen Einträge (LRU) entfernt. Die Klasse ist threadsicher.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = 100000, max_bytes: Optional[int] = None):
+        """
+        Öffnet bzw. erstellt den Cache.
+
+        Args:
+            path (str): Pfad zur SQLite-Datei
+            ttl (float, optional): Lebensdauer eines Eintrags in Sekunden (None = unbegrenzt)
+            max_entries (int, optional): Maximale Anzahl Einträge (None = unbegrenzt)
+            max_bytes (int, optional): Maximale Gesamtgröße der Antworten in Bytes (None = unbegrenzt)
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Liest eine Antwort aus dem Cache.
+
+        Args:
+            key (str): Cache-Schlüssel
+
+        Returns:
+            str: Die gespeicherte Antwort oder None, falls nicht vorhanden bzw. abgelaufen
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return response
+
+    def set(self, key: str, response: str):
+        """
+        Speichert eine Antwort und entfernt bei Bedarf alte Einträge.
+
+        Args:
+            key (str): Cache-Schlüssel
+            response (str): Die zu speichernde Antwort
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        Entfernt abgelaufene Einträge und LRU-Einträge oberhalb der Größenlimits.
+        Muss mit gehaltenem Lock aufgerufen werden.
+        """
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+
+        if self.max_entries is not None:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                freed = 0
+                keys = []
+                for key, size in self._conn.execute(
+                        "SELECT key, size FROM responses ORDER BY last_access ASC"):
+                    keys.append((key,))
+                    freed += size
+                    if freed >= excess:
+                        break
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def clear(self):
+        """
+        Löscht alle Einträge.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gibt Kennzahlen des Caches zurück.
+
+        Returns:
+            dict: Anzahl Einträge, Gesamtgröße, Treffer, Fehlzugriffe und Trefferquote
+        """
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+    def close(self):
+        """
+        Schließt die Datenbankverbindung.
+        """
+        with self._lock:
+            self._conn.close()
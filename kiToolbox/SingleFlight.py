@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Callable, Dict
+
+
+class _Call:
+    """
+    Ein laufender Aufruf, auf dessen Ergebnis weitere Aufrufer warten.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Bündelt gleichzeitige identische Aufrufe zu einem einzigen (Single-Flight).
+
+    Ruft ein Thread do() mit einem Schlüssel auf, für den bereits ein Aufruf
+    läuft, wartet er auf dessen Ergebnis, statt die Funktion erneut
+    auszuführen. Alle Wartenden erhalten dasselbe Ergebnis bzw. dieselbe
+    Exception. Nach Abschluss wird der Schlüssel freigegeben; spätere
+    Aufrufe werden wieder ausgeführt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Führt func aus oder wartet auf den bereits laufenden Aufruf mit demselben Schlüssel.
+
+        Args:
+            key (str): Schlüssel der Anfrage
+            func (callable): Funktion ohne Argumente, die das Ergebnis liefert
+
+        Returns:
+            Das Ergebnis von func
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """
+        Gibt die Anzahl der aktuell laufenden Aufrufe zurück.
+        """
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,194 @@
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, Any, List, Optional
+
+from kiToolbox.KIToolboxAPI import KIToolboxAPI
+
+
+def get_thread_id(done_event: Dict[str, Any]) -> Optional[str]:
+    """
+    Liest die Thread-ID aus dem "done"-Event der KI-Toolbox.
+
+    Akzeptiert "thread" als String oder als Objekt mit "id" sowie "thread_id".
+    """
+    thread = done_event.get("thread", done_event.get("thread_id"))
+    if isinstance(thread, dict):
+        thread = thread.get("id")
+    return str(thread) if thread else None
+
+
+class ConversationThreadManager:
+    """
+    Verwaltet serverseitige Unterhaltungs-Threads der KI-Toolbox.
+
+    Jede Sitzung (session_id) ist an einen Server-Thread gebunden, sodass
+    Folgefragen kurz bleiben können und der Kontext nicht erneut gesendet
+    werden muss. Threads werden nach thread_ttl Sekunden Inaktivität oder
+    nach max_turns Fragen verworfen und beim nächsten Aufruf neu angelegt;
+    der neue Thread erhält dann die letzten context_turns Frage-Antwort-Paare
+    aus dem lokalen Protokoll als Kontext.
+
+    Alle Fragen und Antworten werden lokal protokolliert (im Speicher und
+    optional als JSONL-Datei pro Sitzung in store_dir), damit Sitzungen
+    eingesehen und erneut abgespielt werden können.
+    """
+
+    def __init__(self, api: KIToolboxAPI, params: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            api (KIToolboxAPI): Die zu verwendende API-Instanz
+            params (dict, optional): Ein Dictionary mit folgenden Parametern:
+                - store_dir (str, optional): Verzeichnis für die Protokolldateien
+                - thread_ttl (float): Inaktivitätsdauer in Sekunden bis zum Verwerfen (Standard: 1800)
+                - max_turns (int, optional): Maximale Fragen pro Thread
+                - context_turns (int): Anzahl Frage-Antwort-Paare als Kontext für neue Threads (Standard: 3)
+        """
+        params = params or {}
+        self.api = api
+        self.store_dir = params.get("store_dir")
+        self.thread_ttl = params.get("thread_ttl", 1800.0)
+        self.max_turns = params.get("max_turns")
+        self.context_turns = params.get("context_turns", 3)
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._transcripts: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+        if self.store_dir:
+            os.makedirs(self.store_dir, exist_ok=True)
+
+    def _transcript_path(self, session_id: str) -> str:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", session_id)
+        return os.path.join(self.store_dir, f"{safe_name}.jsonl")
+
+    def _get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Gibt die Sitzung zurück, sofern ihr Thread noch gültig ist.
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        expired = time.time() - session["last_used"] > self.thread_ttl
+        exhausted = self.max_turns is not None and session["turns"] >= self.max_turns
+        if expired or exhausted:
+            del self._sessions[session_id]
+            return None
+        return session
+
+    def _build_context_prompt(self, session_id: str, prompt: str) -> str:
+        """
+        Stellt einer Frage die letzten Frage-Antwort-Paare der Sitzung voran.
+        """
+        turns = self.transcript(session_id)[-self.context_turns:] if self.context_turns else []
+        if not turns:
+            return prompt
+        context = "\n\n".join(f"Frage: {t['prompt']}\nAntwort: {t['answer']}" for t in turns)
+        return f"Bisheriger Gesprächsverlauf:\n{context}\n\nNeue Frage: {prompt}"
+
+    def ask(self, session_id: str, prompt: str, **extra_params) -> str:
+        """
+        Stellt eine Frage innerhalb einer Sitzung.
+
+        Args:
+            session_id (str): Name der Sitzung
+            prompt (str): Die Frage (bei bestehendem Thread ohne Kontext)
+            **extra_params: Weitere Parameter für die Anfrage (z.B. model)
+
+        Returns:
+            str: Die Antwort des Modells
+        """
+        with self._lock:
+            session = self._get_session(session_id)
+            thread_id = session["thread"] if session else None
+
+        done_events = []
+        params = dict(extra_params, bypass_cache=True, on_done=done_events.append)
+        if thread_id:
+            params["prompt"] = prompt
+            params["thread"] = thread_id
+        else:
+            params["prompt"] = self._build_context_prompt(session_id, prompt)
+
+        answer = self.api.answer_question(params)
+
+        new_thread_id = get_thread_id(done_events[0]) if done_events else None
+        with self._lock:
+            thread_id = new_thread_id or thread_id
+            if thread_id:
+                session = self._sessions.setdefault(session_id, {"thread": thread_id, "turns": 0})
+                session["thread"] = thread_id
+                session["turns"] += 1
+                session["last_used"] = time.time()
+            self._record(session_id, {
+                "time": time.time(),
+                "thread": thread_id,
+                "prompt": prompt,
+                "answer": answer,
+            })
+        return answer
+
+    def _record(self, session_id: str, turn: Dict[str, Any]):
+        """
+        Hängt eine Frage-Antwort-Runde an das Protokoll an.
+        """
+        self._transcripts.setdefault(session_id, []).append(turn)
+        if self.store_dir:
+            with open(self._transcript_path(session_id), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(turn, ensure_ascii=False) + "\n")
+
+    def transcript(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Gibt das Protokoll einer Sitzung zurück (aus dem Speicher oder aus store_dir).
+
+        Returns:
+            list: Die Runden mit "time", "thread", "prompt" und "answer"
+        """
+        if session_id not in self._transcripts and self.store_dir:
+            path = self._transcript_path(session_id)
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._transcripts[session_id] = [json.loads(line) for line in f if line.strip()]
+        return list(self._transcripts.get(session_id, []))
+
+    def replay(self, session_id: str, new_session_id: Optional[str] = None) -> List[str]:
+        """
+        Spielt die Fragen einer Sitzung in einem neuen Thread erneut ab.
+
+        Args:
+            session_id (str): Die abzuspielende Sitzung
+            new_session_id (str, optional): Name der neuen Sitzung (Standard: "<session_id>-replay")
+
+        Returns:
+            list: Die neuen Antworten in Reihenfolge der Fragen
+        """
+        new_session_id = new_session_id or f"{session_id}-replay"
+        self.end_session(new_session_id)
+        return [self.ask(new_session_id, turn["prompt"]) for turn in self.transcript(session_id)]
+
+    def get_thread(self, session_id: str) -> Optional[str]:
+        """
+        Gibt die aktuelle Thread-ID einer Sitzung zurück (None, falls keine gültig ist).
+        """
+        with self._lock:
+            session = self._get_session(session_id)
+            return session["thread"] if session else None
+
+    def end_session(self, session_id: str):
+        """
+        Verwirft den Thread einer Sitzung; das lokale Protokoll bleibt erhalten.
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def expire_idle(self) -> int:
+        """
+        Verwirft alle Threads, die länger als thread_ttl inaktiv sind.
+
+        Returns:
+            int: Anzahl verworfener Threads
+        """
+        with self._lock:
+            expired = [sid for sid in list(self._sessions) if self._get_session(sid) is None]
+        return len(expired)
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import asyncio
+import tempfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+
+from kiToolbox.KIToolboxAPI import KIToolboxAPI
+from kiToolbox.LlmMetrics import percentile
+from kiToolbox.MockServer import MockKIToolboxServer
+
+
+def _summarize(name: str, latencies: List[float], first_chunk: List[float], errors: int,
+               elapsed: float, server: MockKIToolboxServer) -> Dict[str, Any]:
+    """
+    Fasst die Messwerte eines Szenarios zusammen.
+    """
+    sorted_latencies = sorted(latencies)
+    sorted_first = sorted(first_chunk)
+    stats = server.get_stats()
+    return {
+        "scenario": name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(latencies) / elapsed if elapsed > 0 else None,
+        "latency_p50_s": percentile(sorted_latencies, 50),
+        "latency_p90_s": percentile(sorted_latencies, 90),
+        "latency_p99_s": percentile(sorted_latencies, 99),
+        "first_chunk_p50_s": percentile(sorted_first, 50),
+        "connections": stats["connections"],
+        "server_max_in_flight": stats["max_in_flight"],
+    }
+
+
+def _timed(func: Callable[[int], Any], index: int) -> float:
+    start = time.perf_counter()
+    func(index)
+    return time.perf_counter() - start
+
+
+def run_scenario(name: str, api_params: Dict[str, Any], server: MockKIToolboxServer,
+                 num_requests: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Führt ein Benchmark-Szenario gegen den Mock-Server aus.
+
+    Szenarien:
+        - "sync_unpooled": nacheinander, ohne Keep-Alive (neue Verbindung je Anfrage)
+        - "sync_pooled": nacheinander über die persistente Session
+        - "threaded_pooled": concurrency Threads über die persistente Session
+        - "async": asyncio.gather über answer_question_async
+        - "streaming": nacheinander über stream_answer (misst auch die Zeit bis zum ersten Chunk)
+
+    Alle Prompts sind verschieden und umgehen den Cache, damit jede Anfrage
+    den Server erreicht.
+
+    Args:
+        name (str): Name des Szenarios
+        api_params (dict): Parameter für KIToolboxAPI (ohne base_url)
+        server (MockKIToolboxServer): Der laufende Mock-Server
+        num_requests (int): Anzahl der Anfragen
+        concurrency (int): Gleichzeitige Anfragen (threaded_pooled, async)
+
+    Returns:
+        dict: Durchsatz, Latenz-Perzentile, Fehler und Verbindungsanzahl
+    """
+    params = dict(api_params, base_url=server.base_url, max_concurrency=concurrency,
+                  pool_maxsize=max(concurrency, 10), max_retries=0)
+    if name == "sync_unpooled":
+        params["keep_alive"] = False
+
+    def question(index: int) -> Dict[str, Any]:
+        return {"prompt": f"Benchmark-Frage {index}", "bypass_cache": True}
+
+    server.reset_stats()
+    latencies: List[float] = []
+    first_chunk: List[float] = []
+    errors = 0
+
+    with KIToolboxAPI(params) as api:
+        start = time.perf_counter()
+        if name in ("sync_unpooled", "sync_pooled"):
+            for i in range(num_requests):
+                try:
+                    latencies.append(_timed(lambda j: api.answer_question(question(j)), i))
+                except Exception:
+                    errors += 1
+
+        elif name == "threaded_pooled":
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(_timed, lambda j: api.answer_question(question(j)), i)
+                           for i in range(num_requests)]
+                for future in futures:
+                    try:
+                        latencies.append(future.result())
+                    except Exception:
+                        errors += 1
+
+        elif name == "async":
+            async def run_all():
+                # Wie bei threaded_pooled nur die Bearbeitungszeit messen, nicht die Wartezeit
+                semaphore = asyncio.Semaphore(concurrency)
+
+                async def timed_async(index: int) -> float:
+                    async with semaphore:
+                        request_start = time.perf_counter()
+                        await api.answer_question_async(question(index))
+                        return time.perf_counter() - request_start
+
+                return await asyncio.gather(*(timed_async(i) for i in range(num_requests)),
+                                            return_exceptions=True)
+
+            for result in asyncio.run(run_all()):
+                if isinstance(result, Exception):
+                    errors += 1
+                else:
+                    latencies.append(result)
+
+        elif name == "streaming":
+            for i in range(num_requests):
+                request_start = time.perf_counter()
+                try:
+                    for j, _ in enumerate(api.stream_answer(question(i))):
+                        if j == 0:
+                            first_chunk.append(time.perf_counter() - request_start)
+                    latencies.append(time.perf_counter() - request_start)
+                except Exception:
+                    errors += 1
+
+        else:
+            raise ValueError(f"Unknown scenario: {name}")
+        elapsed = time.perf_counter() - start
+
+    return _summarize(name, latencies, first_chunk, errors, elapsed, server)
+
+
+SCENARIOS = ["sync_unpooled", "sync_pooled", "threaded_pooled", "async", "streaming"]
+
+
+def run_benchmarks(params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Startet einen Mock-Server und misst alle Szenarien nacheinander.
+
+    Args:
+        params (dict, optional): Ein Dictionary mit folgenden Parametern:
+            - scenarios (list): Zu messende Szenarien (Standard: alle aus SCENARIOS)
+            - num_requests (int): Anfragen pro Szenario (Standard: 200)
+            - concurrency (int): Gleichzeitige Anfragen (Standard: 16)
+            - server (dict): Parameter für MockKIToolboxServer (Latenz, Chunk-Rate, Fehler)
+            - output_path (str, optional): JSON-Datei für die Ergebnisse
+
+    Returns:
+        list: Ein Ergebnis-Dictionary pro Szenario
+    """
+    params = params or {}
+    scenarios = params.get("scenarios", SCENARIOS)
+    num_requests = params.get("num_requests", 200)
+    concurrency = params.get("concurrency", 16)
+    server_params = dict({"latency": 0.02, "seed": 0}, **params.get("server", {}))
+
+    # Der Mock-Server prüft den Token nicht; KIToolboxAPI benötigt dennoch eine Token-Datei
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        token_path = os.path.join(tmp_dir, "token.txt")
+        with open(token_path, 'w', encoding='utf-8') as f:
+            f.write("mock-token")
+        api_params = {"token_filepath": token_path}
+
+        results = []
+        with MockKIToolboxServer(server_params) as server:
+            for name in scenarios:
+                results.append(run_scenario(name, api_params, server, num_requests, concurrency))
+
+    output_path = params.get("output_path")
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({"params": {"num_requests": num_requests, "concurrency": concurrency,
+                                  "server": server_params},
+                       "results": results}, f, indent=2)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]):
+    """
+    Gibt die Ergebnisse als Tabelle aus.
+    """
+    def ms(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    print(f"{'Szenario':<16} {'Anfr.':>6} {'Fehler':>6} {'Anfr./s':>9} {'p50 ms':>8} "
+          f"{'p90 ms':>8} {'p99 ms':>8} {'1. Chunk':>9} {'Verb.':>6}")
+    for r in results:
+        throughput = "-" if r["throughput_per_s"] is None else f"{r['throughput_per_s']:.1f}"
+        print(f"{r['scenario']:<16} {r['requests']:>6} {r['errors']:>6} {throughput:>9} "
+              f"{ms(r['latency_p50_s']):>8} {ms(r['latency_p90_s']):>8} {ms(r['latency_p99_s']):>8} "
+              f"{ms(r['first_chunk_p50_s']):>9} {r['connections']:>6}")
+
+
+def main():
+    """
+    Misst den Durchsatz des KI-Toolbox-Clients gegen einen lokalen Mock-Server.
+
+    Aufruf aus dem Repository-Verzeichnis, z.B.:
+        python -m kiToolbox.benchmark --requests 500 --latency 0.05 --chunk-rate 200
+    """
+    parser = argparse.ArgumentParser(description="Benchmark des KI-Toolbox-Clients ohne Netzwerk")
+    parser.add_argument("--requests", type=int, default=200, help="Anfragen pro Szenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Gleichzeitige Anfragen")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--latency", type=float, default=0.02, help="Serverlatenz in Sekunden")
+    parser.add_argument("--chunks", type=int, default=10, help="Chunks pro Antwort")
+    parser.add_argument("--chunk-rate", type=float, default=None, help="Chunks pro Sekunde")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlerhafter Antworten")
+    parser.add_argument("--output", default=None, help="JSON-Datei für die Ergebnisse")
+    args = parser.parse_args()
+
+    results = run_benchmarks({
+        "scenarios": args.scenarios,
+        "num_requests": args.requests,
+        "concurrency": args.concurrency,
+        "server": {
+            "latency": args.latency,
+            "chunks": args.chunks,
+            "chunk_rate": args.chunk_rate,
+            "error_rate": args.error_rate,
+        },
+        "output_path": args.output,
+    })
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -62,6 +62,22 @@ def main():
         print("\nErgebnis-Dictionary:")
         print(json.dumps(dict_result, indent=2, ensure_ascii=False))
 
+        # 3. Beispiel: Mehrere Prompts parallel verarbeiten
+        print("\n=== Batch-Beispiel ===")
+        batch_params = [
+            {"prompt": f"Erkläre in einem Satz, wofür {wirkstoff} eingesetzt wird.", "model": "gpt-4o"}
+            for wirkstoff in ["Aspirin", "Ibuprofen", "Paracetamol"]
+        ]
+
+        batch_results = api.generate_qa_batch(
+            batch_params,
+            output_path=os.path.join(current_dir, "batch_results.jsonl")
+        )
+        for result in batch_results:
+            print(f"- {result.get('question', '')}: {result.get('answer', result.get('error'))}")
+        print(f"Statistik: {api.last_batch_stats}")
+        print(f"Kennzahlen: {api.metrics.summary()}")
+
         print("\n=== Beispiele erfolgreich abgeschlossen! ===")
 
     except Exception as e:
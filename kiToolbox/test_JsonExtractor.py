@@ -0,0 +1,36 @@
+import unittest
+
+from kiToolbox.JsonExtractor import JsonExtractor, extract_json, extract_json_values
+
+
+class ExtractJsonEdgeCaseTest(unittest.TestCase):
+
+    def test_citation_brackets_in_prose_are_ignored(self):
+        text = 'Text {siehe [1]} und {"a": 2}'
+        self.assertEqual(extract_json_values(text), [{"a": 2}])
+        self.assertEqual(extract_json(text), {"a": 2})
+        self.assertEqual(extract_json('{siehe [1]} {"x":1}'), {"x": 1})
+        self.assertIsNone(extract_json("Text {siehe [1]}"))
+
+    def test_unclosed_prose_bracket_does_not_hide_value(self):
+        self.assertEqual(extract_json('Ergebnis {: {"a": 1}'), {"a": 1})
+        self.assertEqual(extract_json_values('Quelle [1] und {"a": 1}'), [[1], {"a": 1}])
+
+    def test_code_fences_are_preferred(self):
+        text = 'Vorher {"b": 0}\n```json\n{"a": 1}\n```'
+        self.assertEqual(extract_json(text), {"a": 1})
+
+    def test_many_stray_brackets(self):
+        text = "{ x " * 2000 + '{"a": 1}'
+        self.assertEqual(extract_json(text), {"a": 1})
+        self.assertIsNone(extract_json("{" * 2000 + '{"a": 1}' + "} x" * 2000))
+
+    def test_streamed_values_are_delivered_when_complete(self):
+        extractor = JsonExtractor()
+        self.assertEqual(extractor.feed('Hier: {"a": [1, '), [])
+        self.assertEqual(extractor.feed('2]} und [3]'), [{"a": [1, 2]}, [3]])
+        self.assertEqual(extractor.finish(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import json
+import tempfile
+import unittest
+from typing import Dict, Any
+
+from kiToolbox.KIToolboxAPI import KIToolboxAPI
+from kiToolbox.LlmRouter import LlmRouter
+
+
+class _RecordingAPI(KIToolboxAPI):
+    """
+    Backend ohne Netzwerk, das die gesendeten Payloads aufzeichnet.
+    """
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self.payloads = []
+
+    def _send_question(self, params: Dict[str, Any]) -> str:
+        self.payloads.append(self._create_request_payload(params))
+        return json.dumps({"backend": self.model})
+
+
+class LlmRouterConversionTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        token_filepath = os.path.join(self._tmp_dir.name, "token.txt")
+        with open(token_filepath, 'w', encoding='utf-8') as f:
+            f.write("test-token")
+        self.backends = [_RecordingAPI({"token_filepath": token_filepath, "model": model, "single_flight": False})
+                         for model in ("model-A", "model-B")]
+        self.router = LlmRouter(self.backends)
+
+    def tearDown(self):
+        self.router.close()
+        self._tmp_dir.cleanup()
+
+    def _convert_on(self, index: int, **params) -> Dict[str, Any]:
+        # Alle anderen Backends sperren, damit die Anfrage an index geht
+        for i, stats in enumerate(self.router.stats):
+            stats.unhealthy_until = 0.0 if i == index else float("inf")
+        return self.router.dict_to_dict(dict({"input_dict": {"a": 1}, "conversion_prompt": "Kopiere"}, **params))
+
+    def test_dict_to_dict_sends_model_of_chosen_backend(self):
+        for index, model in enumerate(("model-A", "model-B")):
+            result = self._convert_on(index)
+            self.assertEqual(result, {"backend": model})
+            self.assertEqual(self.backends[index].payloads[-1]["model"], model)
+        self.assertEqual([len(backend.payloads) for backend in self.backends], [1, 1])
+
+    def test_dict_to_dict_keeps_model_set_by_caller(self):
+        self._convert_on(1, model="model-C")
+        self.assertEqual(self.backends[1].payloads[-1]["model"], "model-C")
+
+
+if __name__ == "__main__":
+    unittest.main()
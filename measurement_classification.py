@@ -0,0 +1,273 @@
+import numpy as np
+
+from measurement_statistics import factorize_groups
+
+
+def _code_dtype(n_categories):
+    """Smallest signed integer type for category codes (-1 = invalid)."""
+    return np.int8 if n_categories < 127 else np.int16 if n_categories < 32767 else np.int32
+
+
+class SpecificationLimits:
+    """
+    Classification of measurement values against a list of limits.
+
+    n limits split the value range into n + 1 categories, e.g. the limits
+    [0.1, 0.5, 0.8] give "too low", "optimal", "elevated" and "too high".
+    Whole arrays are binned at once instead of an if/elif chain per value:
+    for a few limits by summing one vectorized comparison per limit (the
+    code is the number of limits reached), for many limits with a single
+    np.searchsorted call. NaN values get the code -1.
+    """
+
+    # Up to this many limits, comparisons are faster than a binary search
+    max_comparison_limits = 8
+
+    def __init__(self, limits, labels=None, boundary="upper"):
+        """
+        Initialize the classification.
+
+        Args:
+            limits (array-like): Increasing category limits
+            labels (list, optional): Names of the len(limits) + 1 categories.
+                If None, the categories are numbered.
+            boundary (str): Category of values exactly on a limit: "upper"
+                (value >= limit belongs to the higher category, as in
+                "0.1 <= value < 0.5") or "lower" (value <= limit stays in
+                the lower category)
+        """
+        self.limits = np.asarray(limits, dtype=float)
+        if self.limits.ndim != 1 or np.any(np.diff(self.limits) <= 0):
+            raise ValueError("Limits must be a strictly increasing 1D sequence.")
+        if boundary not in ("upper", "lower"):
+            raise ValueError(f"Unknown boundary: {boundary}. Use 'upper' or 'lower'.")
+        self.n_categories = len(self.limits) + 1
+        self.labels = list(labels) if labels is not None else [str(i) for i in range(self.n_categories)]
+        if len(self.labels) != self.n_categories:
+            raise ValueError(f"Expected {self.n_categories} labels for {len(self.limits)} limits, "
+                             f"got {len(self.labels)}.")
+        self.boundary = boundary
+        self._side = "right" if boundary == "upper" else "left"
+
+    def classify(self, values):
+        """
+        Assign a category code to every value.
+
+        Args:
+            values (array-like): Measurement values
+
+        Returns:
+            numpy.ndarray: Category codes (index into self.labels), -1 for NaN
+        """
+        values = np.asarray(values, dtype=float)
+        dtype = _code_dtype(self.n_categories)
+        if len(self.limits) <= self.max_comparison_limits:
+            codes = np.zeros(values.shape, dtype=dtype)
+            for limit in self.limits:
+                codes += values >= limit if self.boundary == "upper" else values > limit
+        else:
+            codes = np.searchsorted(self.limits, values, side=self._side).astype(dtype)
+        nan_mask = np.isnan(values)
+        if nan_mask.any():
+            codes[nan_mask] = -1
+        return codes
+
+    def classify_with_counts(self, values):
+        """
+        Assign category codes and count the values per category.
+
+        Args:
+            values (array-like): Measurement values
+
+        Returns:
+            tuple: (codes, counts) - codes as in classify and the number of
+                values per category (NaN values are not counted)
+        """
+        codes = self.classify(values)
+        counts = np.bincount(codes[codes >= 0], minlength=self.n_categories)
+        return codes, counts
+
+    def count(self, values):
+        """
+        Count the values per category.
+
+        Args:
+            values (array-like): Measurement values
+
+        Returns:
+            dict: Number of values per category label
+        """
+        _, counts = self.classify_with_counts(values)
+        return dict(zip(self.labels, counts.tolist()))
+
+    def label_codes(self, codes):
+        """
+        Translate category codes into labels ("invalid" for -1).
+
+        Args:
+            codes (numpy.ndarray): Category codes from classify
+
+        Returns:
+            numpy.ndarray: Category labels
+        """
+        names = np.array(self.labels + ["invalid"], dtype=object)
+        return names[np.asarray(codes)]
+
+
+class ProductLimitTable:
+    """
+    Classification against product-specific specification limits.
+
+    Every product has its own limits, all with the same categories. The
+    limits are stored as a matrix (products x limits); for a stream of
+    values with product labels, every value is compared with the limits of
+    its product in one vectorized pass per limit column, so the cost does
+    not grow with the number of products.
+    """
+
+    def __init__(self, limits_by_product, labels=None, boundary="upper"):
+        """
+        Initialize the limit table.
+
+        Args:
+            limits_by_product (dict): Increasing limits per product,
+                e.g. {"A-100": [0.1, 0.5, 0.8], "B-200": [0.2, 0.6, 0.9]}
+            labels (list, optional): Names of the categories (as in SpecificationLimits)
+            boundary (str): "upper" or "lower" (as in SpecificationLimits)
+        """
+        schemes = {product: SpecificationLimits(limits, labels, boundary)
+                   for product, limits in limits_by_product.items()}
+        n_limits = {len(scheme.limits) for scheme in schemes.values()}
+        if len(n_limits) != 1:
+            raise ValueError("All products need the same number of limits.")
+
+        self.products, order = factorize_groups(np.array(list(schemes)))
+        first = next(iter(schemes.values()))
+        self.labels = first.labels
+        self.n_categories = first.n_categories
+        self.boundary = boundary
+        matrix = np.array([scheme.limits for scheme in schemes.values()])
+        self.limit_matrix = np.empty_like(matrix)
+        self.limit_matrix[order] = matrix
+
+    @classmethod
+    def from_table(cls, table, product_column, limit_columns, labels=None, boundary="upper"):
+        """
+        Build the limit table from a columnar table, e.g. a pandas DataFrame read from CSV.
+
+        Args:
+            table: Column mapping (dict of arrays or DataFrame)
+            product_column (str): Name of the product column
+            limit_columns (list): Names of the limit columns in increasing order
+            labels (list, optional): Names of the categories
+            boundary (str): "upper" or "lower"
+
+        Returns:
+            ProductLimitTable: The limit table
+        """
+        products = np.asarray(table[product_column])
+        matrix = np.column_stack([np.asarray(table[column], dtype=float) for column in limit_columns])
+        return cls(dict(zip(products.tolist(), matrix)), labels, boundary)
+
+    def encode_products(self, products):
+        """
+        Look up the row of every product in the limit matrix.
+
+        The result can be passed as product_codes to classify and
+        classify_with_counts, e.g. to encode the product column of a
+        stream only once.
+
+        Args:
+            products (array-like): Product label per value
+
+        Returns:
+            numpy.ndarray: Row index per value, -1 for unknown products
+        """
+        products = np.asarray(products)
+        idx = np.searchsorted(self.products, products)
+        idx = np.clip(idx, 0, len(self.products) - 1)
+        return np.where(self.products[idx] == products, idx, -1)
+
+    def classify(self, values, products=None, product_codes=None):
+        """
+        Assign a category code to every value using the limits of its product.
+
+        Args:
+            values (array-like): Measurement values
+            products (array-like, optional): Product label per value
+            product_codes (numpy.ndarray, optional): Product rows from
+                encode_products (instead of products)
+
+        Returns:
+            numpy.ndarray: Category codes, -1 for NaN values and unknown products
+        """
+        values = np.asarray(values, dtype=float)
+        if product_codes is None:
+            product_codes = self.encode_products(products)
+        known = product_codes >= 0
+        rows = np.where(known, product_codes, 0)
+
+        codes = np.zeros(values.shape, dtype=_code_dtype(self.n_categories))
+        for j in range(self.limit_matrix.shape[1]):
+            column = self.limit_matrix[:, j][rows]
+            if self.boundary == "upper":
+                codes += values >= column
+            else:
+                codes += values > column
+        codes[~known | np.isnan(values)] = -1
+        return codes
+
+    def classify_with_counts(self, values, products=None, product_codes=None):
+        """
+        Assign category codes and count them per product and category.
+
+        Args:
+            values (array-like): Measurement values
+            products (array-like, optional): Product label per value
+            product_codes (numpy.ndarray, optional): Product rows from
+                encode_products (instead of products)
+
+        Returns:
+            tuple: (codes, counts) - codes as in classify and a matrix
+                (products x categories) in the order of self.products
+        """
+        if product_codes is None:
+            product_codes = self.encode_products(products)
+        codes = self.classify(values, product_codes=product_codes)
+        valid = codes >= 0
+        flat = product_codes[valid].astype(np.int64) * self.n_categories + codes[valid]
+        counts = np.bincount(flat, minlength=len(self.products) * self.n_categories)
+        return codes, counts.reshape(len(self.products), self.n_categories)
+
+
+# Example: classification of simulated readings
+if __name__ == "__main__":
+    import time
+
+    labels = ["Zu niedrig", "Optimal", "Erhöht", "Zu hoch"]
+    scheme = SpecificationLimits([0.1, 0.5, 0.8], labels)
+    print(scheme.count([0.05, 0.2, 0.67, 0.9]))
+
+    rng = np.random.default_rng(0)
+    n_values = 20_000_000
+    readings = rng.uniform(0.0, 1.0, n_values)
+
+    start = time.perf_counter()
+    codes, counts = scheme.classify_with_counts(readings)
+    print(f"{n_values} values classified in {time.perf_counter() - start:.2f} s: "
+          f"{dict(zip(labels, counts.tolist()))}")
+
+    table = ProductLimitTable({
+        "A-100": [0.1, 0.5, 0.8],
+        "B-200": [0.2, 0.6, 0.9],
+        "C-300": [0.05, 0.4, 0.7],
+    }, labels)
+    products = table.products[rng.integers(0, len(table.products), n_values)]
+    start = time.perf_counter()
+    product_codes = table.encode_products(products)
+    print(f"Product column encoded in {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    codes, counts = table.classify_with_counts(readings, product_codes=product_codes)
+    print(f"{n_values} values with per-product limits in {time.perf_counter() - start:.2f} s")
+    for product, row in zip(table.products, counts):
+        print(f"  {product}: {dict(zip(labels, row.tolist()))}")
@@ -0,0 +1,323 @@
+import numpy as np
+
+
+def factorize_groups(groups):
+    """
+    Map group labels to consecutive integer codes.
+
+    Args:
+        groups (array-like): Group label per value (numbers or strings)
+
+    Returns:
+        tuple: (labels, codes) - sorted unique labels and the code of every value
+    """
+    groups = np.asarray(groups)
+    if groups.dtype.kind in "iu" and len(groups) > 0:
+        # Small non-negative integer labels (e.g. sample numbers) need no sorting
+        low, high = groups.min(), groups.max()
+        if low >= 0 and high < 4 * len(groups) + 1024:
+            present = np.bincount(groups) > 0
+            labels = np.flatnonzero(present).astype(groups.dtype)
+            lookup = np.cumsum(present) - 1
+            return labels, lookup[groups]
+    labels, codes = np.unique(groups, return_inverse=True)
+    return labels, codes.ravel()
+
+
+def _segment_bounds(codes, n_groups):
+    """Start and end index of every group in values sorted by group code."""
+    counts = np.bincount(codes, minlength=n_groups)
+    ends = np.cumsum(counts)
+    return ends - counts, ends, counts
+
+
+def _sort_within_groups(values, codes, n_groups):
+    """
+    Sort values by (group code, value).
+
+    Instead of a lexsort over two keys, the values are scaled into [0, 1)
+    and added to the group code, so a single argsort of one float key
+    orders every group segment by value. This is several times faster
+    than np.lexsort. Values closer than about 1e-9 of the data range may
+    swap places, which does not affect interpolated percentiles
+    noticeably. For very many groups, where the key would lose that
+    resolution, or with infinite values, np.lexsort is used.
+    """
+    low, high = values.min(), values.max()
+    if n_groups > 2 ** 20 or not np.isfinite(high - low):
+        return values[np.lexsort((values, codes))]
+    span = (high - low) * (1.0 + 1e-9) if high > low else 1.0
+    key = codes + (values - low) / span
+    return values[np.argsort(key)]
+
+
+def _sorted_percentiles(sorted_values, starts, counts, q):
+    """
+    Linear-interpolated percentile q (0-100) of every group segment.
+
+    Same definition as numpy.percentile with the default "linear" method.
+    """
+    position = starts + (q / 100.0) * np.maximum(counts - 1, 0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, starts + np.maximum(counts - 1, 0))
+    fraction = position - lower
+    return sorted_values[lower] * (1.0 - fraction) + sorted_values[upper] * fraction
+
+
+def _finish(labels, count, mean, m2, minimum, maximum, ddof, decimals=None, extra=None):
+    """Assemble the result dictionary from the per-group moments."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dof = count - ddof
+        sd = np.where(dof > 0, np.sqrt(np.maximum(m2, 0.0) / np.where(dof > 0, dof, 1)), np.nan)
+        rsd = np.where(mean != 0, 100.0 * sd / np.abs(mean), np.nan)
+
+    result = {
+        "group": labels,
+        "count": count,
+        "mean": mean,
+        "sd": sd,
+        "rsd_percent": rsd,
+        "min": minimum,
+        "max": maximum,
+    }
+    if extra:
+        result.update(extra)
+    if decimals is not None:
+        for key, value in result.items():
+            if key not in ("group", "count"):
+                result[key] = np.round(value, decimals)
+    return result
+
+
+def group_statistics(values, groups=None, percentiles=(), median=True, ddof=1, decimals=None):
+    """
+    Compute descriptive statistics of measurement values per group.
+
+    All groups are processed together with vectorized reductions: counts
+    and sums via bincount, the spread via a second pass over the centered
+    values (numerically stable), and min/max, median and percentiles from
+    one sort of the values by (group, value), where every group is a
+    contiguous segment. When neither median nor percentiles are requested,
+    a cheaper stable sort by group code is used instead. NaN values are
+    ignored.
+
+    Args:
+        values (array-like): Measurement values
+        groups (array-like, optional): Group label per value (e.g. sample ID).
+            If None, all values form one group.
+        percentiles (iterable): Percentiles (0-100) to compute, e.g. (5, 95)
+        median (bool): Whether to compute the median
+        ddof (int): Delta degrees of freedom of the standard deviation
+            (1 = sample standard deviation)
+        decimals (int, optional): Round all statistics to this many decimals
+
+    Returns:
+        dict: Arrays with one entry per group: "group", "count", "mean",
+            "sd", "rsd_percent", "min", "max", optionally "median" and
+            "p<q>" for every percentile (e.g. "p95")
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    if groups is None:
+        groups = np.zeros(len(values), dtype=np.int64)
+    else:
+        groups = np.asarray(groups).ravel()
+        if len(groups) != len(values):
+            raise ValueError(f"Got {len(groups)} group labels for {len(values)} values.")
+
+    valid = ~np.isnan(values)
+    if not valid.all():
+        values = values[valid]
+        groups = groups[valid]
+
+    labels, codes = factorize_groups(groups)
+    n_groups = len(labels)
+    if n_groups == 0:
+        empty = np.array([], dtype=float)
+        extra = {f"p{q:g}": empty for q in percentiles}
+        if median:
+            extra["median"] = empty
+        return _finish(labels, np.array([], dtype=np.int64), empty, empty, empty, empty, ddof,
+                       decimals, extra)
+
+    count = np.bincount(codes, minlength=n_groups)
+    mean = np.bincount(codes, weights=values, minlength=n_groups) / count
+    centered = values - mean[codes]
+    m2 = np.bincount(codes, weights=centered * centered, minlength=n_groups)
+
+    starts, _, _ = _segment_bounds(codes, n_groups)
+    extra = {}
+    if median or percentiles:
+        sorted_values = _sort_within_groups(values, codes, n_groups)
+        # Exact extremes regardless of near-ties in the sort key
+        minimum = np.minimum.reduceat(sorted_values, starts)
+        maximum = np.maximum.reduceat(sorted_values, starts)
+        if median:
+            extra["median"] = _sorted_percentiles(sorted_values, starts, count, 50.0)
+        for q in percentiles:
+            extra[f"p{q:g}"] = _sorted_percentiles(sorted_values, starts, count, float(q))
+    else:
+        # Only min/max needed: a stable sort by group code is enough
+        order = np.argsort(codes, kind="stable")
+        grouped = values[order]
+        minimum = np.minimum.reduceat(grouped, starts)
+        maximum = np.maximum.reduceat(grouped, starts)
+
+    return _finish(labels, count, mean, m2, minimum, maximum, ddof, decimals, extra)
+
+
+def table_statistics(table, value_column, group_column=None, **kwargs):
+    """
+    Compute group statistics for a columnar table.
+
+    Args:
+        table: Any column mapping, e.g. a dict of arrays or a pandas DataFrame
+        value_column (str): Name of the value column
+        group_column (str, optional): Name of the group column
+        **kwargs: Further arguments for group_statistics
+
+    Returns:
+        dict: Result of group_statistics (use pandas.DataFrame(result) for a table)
+    """
+    values = np.asarray(table[value_column])
+    groups = np.asarray(table[group_column]) if group_column is not None else None
+    return group_statistics(values, groups, **kwargs)
+
+
+class RunningStatistics:
+    """
+    Streaming group statistics for data that does not fit in memory.
+
+    Chunks of values are reduced per group with the same vectorized
+    bincount reductions as group_statistics and merged into the running
+    totals with the parallel form of Welford's algorithm (Chan et al.),
+    so the result matches a single pass over all data without storing it.
+    Median and percentiles need all values and are not available here.
+    """
+
+    def __init__(self, ddof=1):
+        """
+        Initialize empty running statistics.
+
+        Args:
+            ddof (int): Delta degrees of freedom of the standard deviation
+        """
+        self.ddof = ddof
+        self._slots = {}
+        self._labels = []
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.minimum = np.zeros(0)
+        self.maximum = np.zeros(0)
+
+    def _get_slots(self, labels):
+        """Return the storage slot of every label, adding new groups."""
+        slots = np.empty(len(labels), dtype=np.int64)
+        for i, label in enumerate(labels.tolist()):
+            slot = self._slots.get(label)
+            if slot is None:
+                slot = len(self._labels)
+                self._slots[label] = slot
+                self._labels.append(label)
+            slots[i] = slot
+
+        n_new = len(self._labels) - len(self.count)
+        if n_new > 0:
+            self.count = np.concatenate([self.count, np.zeros(n_new, dtype=np.int64)])
+            self.mean = np.concatenate([self.mean, np.zeros(n_new)])
+            self.m2 = np.concatenate([self.m2, np.zeros(n_new)])
+            self.minimum = np.concatenate([self.minimum, np.full(n_new, np.inf)])
+            self.maximum = np.concatenate([self.maximum, np.full(n_new, -np.inf)])
+        return slots
+
+    def update(self, values, groups=None):
+        """
+        Add a chunk of values.
+
+        Args:
+            values (array-like): Measurement values of the chunk
+            groups (array-like, optional): Group label per value. If None,
+                all values belong to one group.
+        """
+        chunk = group_statistics(values, groups, median=False, ddof=0)
+        if len(chunk["group"]) == 0:
+            return
+        slots = self._get_slots(chunk["group"])
+
+        n_a = self.count[slots].astype(float)
+        n_b = chunk["count"].astype(float)
+        n = n_a + n_b
+        delta = chunk["mean"] - self.mean[slots]
+        self.mean[slots] += delta * n_b / n
+        self.m2[slots] += chunk["sd"] ** 2 * n_b + delta * delta * n_a * n_b / n
+        self.count[slots] += chunk["count"]
+        self.minimum[slots] = np.minimum(self.minimum[slots], chunk["min"])
+        self.maximum[slots] = np.maximum(self.maximum[slots], chunk["max"])
+
+    def result(self, decimals=None):
+        """
+        Return the statistics of all values added so far.
+
+        Args:
+            decimals (int, optional): Round all statistics to this many decimals
+
+        Returns:
+            dict: Same keys as group_statistics without median and
+                percentiles, groups sorted by label
+        """
+        labels = np.array(self._labels)
+        order = np.argsort(labels, kind="stable") if len(labels) else np.array([], dtype=np.int64)
+        return _finish(labels[order], self.count[order], self.mean[order], self.m2[order],
+                       self.minimum[order], self.maximum[order], self.ddof, decimals)
+
+
+def csv_statistics(filepath, value_column, group_column=None, chunksize=1_000_000, ddof=1, decimals=None):
+    """
+    Compute group statistics of a large CSV file chunk by chunk.
+
+    Args:
+        filepath (str): Path to the CSV file
+        value_column (str): Name of the value column
+        group_column (str, optional): Name of the group column
+        chunksize (int): Rows per chunk
+        ddof (int): Delta degrees of freedom of the standard deviation
+        decimals (int, optional): Round all statistics to this many decimals
+
+    Returns:
+        dict: Result of RunningStatistics.result
+    """
+    import pandas as pd
+
+    columns = [value_column] if group_column is None else [value_column, group_column]
+    running = RunningStatistics(ddof=ddof)
+    for chunk in pd.read_csv(filepath, usecols=columns, chunksize=chunksize):
+        groups = chunk[group_column].to_numpy() if group_column is not None else None
+        running.update(chunk[value_column].to_numpy(dtype=float), groups)
+    return running.result(decimals)
+
+
+# Example: statistics of simulated QC readings for several samples
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n_values, n_samples = 5_000_000, 2000
+    sample_ids = rng.integers(0, n_samples, n_values)
+    readings = 0.05 + 0.002 * rng.standard_normal(n_values) + 0.0001 * (sample_ids % 7)
+
+    start = time.perf_counter()
+    stats = group_statistics(readings, sample_ids, percentiles=(5, 95), decimals=5)
+    print(f"group_statistics: {n_values} values, {n_samples} groups in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    running = RunningStatistics()
+    for chunk_start in range(0, n_values, 500_000):
+        chunk = slice(chunk_start, chunk_start + 500_000)
+        running.update(readings[chunk], sample_ids[chunk])
+    streamed = running.result(decimals=5)
+    print(f"RunningStatistics: {time.perf_counter() - start:.2f} s")
+
+    for key in ("count", "mean", "sd", "rsd_percent", "min", "max", "median", "p5", "p95"):
+        print(f"  sample 0 {key}: {stats[key][0]}")
+    print(f"Streaming mean/sd match: {np.allclose(stats['mean'], streamed['mean'])} / "
+          f"{np.allclose(stats['sd'], streamed['sd'], atol=1e-5)}")
@@ -0,0 +1,273 @@
+import numpy as np
+
+
+class NoiseModel:
+    """
+    Base class for noise models used by the spectral data generator.
+
+    A noise model turns a block of clean signals into additive noise. The
+    block may be a single spectrum (1D array) or a batch of spectra with
+    shape (batch, points); all random numbers for the block are drawn in
+    one call so that large training sets are not bound by per-spectrum
+    RNG overhead.
+    """
+
+    default_params = {}
+
+    def __init__(self, noise_level, params=None):
+        """
+        Initialize the noise model.
+
+        Args:
+            noise_level (float): Overall noise scale (standard deviation or count scale)
+            params (dict, optional): Model-specific parameters
+        """
+        self.noise_level = noise_level
+        self.params = self.default_params.copy()
+        if params:
+            self.params.update({k: v for k, v in params.items() if k in self.default_params})
+
+    def generate(self, y, rng=None):
+        """
+        Generate noise for the given clean signal(s).
+
+        Args:
+            y (numpy.ndarray): Clean signal, shape (points,) or (batch, points)
+            rng (numpy.random.Generator, optional): Random generator. If None,
+                the global numpy random state is used.
+
+        Returns:
+            numpy.ndarray: Noise with the same shape as y
+        """
+        raise NotImplementedError("Subclasses must implement generate")
+
+    def apply(self, y, rng=None):
+        """
+        Add noise to the given clean signal(s).
+
+        Args:
+            y (numpy.ndarray): Clean signal, shape (points,) or (batch, points)
+            rng (numpy.random.Generator, optional): Random generator
+
+        Returns:
+            numpy.ndarray: Noisy signal(s)
+        """
+        y = np.asarray(y, dtype=float)
+        if self.noise_level <= 0:
+            return y
+        return y + self.generate(y, rng)
+
+
+class GaussianNoise(NoiseModel):
+    """
+    White Gaussian noise with standard deviation noise_level.
+    """
+
+    def generate(self, y, rng=None):
+        rng = np.random if rng is None else rng
+        return rng.normal(0, self.noise_level, size=np.shape(y))
+
+
+class PoissonNoise(NoiseModel):
+    """
+    Shot noise. The signal is interpreted as y / noise_level expected counts.
+
+    For expected counts above ``normal_threshold`` the Poisson distribution is
+    replaced by its normal approximation N(lam, lam), which is considerably
+    cheaper to sample. The relative skewness error of the approximation is
+    1 / sqrt(lam), i.e. about 3 % at the default threshold of 1000 counts.
+    Set ``normal_threshold`` to None to always sample exactly.
+    """
+
+    default_params = {
+        "normal_threshold": 1000.0,
+    }
+
+    def _sample_counts(self, lam, rng):
+        threshold = self.params["normal_threshold"]
+        if threshold is None or lam.size == 0 or lam.max() <= threshold:
+            return rng.poisson(lam).astype(float)
+
+        counts = np.empty_like(lam)
+        large = lam > threshold
+        counts[~large] = rng.poisson(lam[~large])
+        lam_large = lam[large]
+        counts[large] = np.rint(lam_large + np.sqrt(lam_large) * rng.standard_normal(lam_large.shape))
+        return np.maximum(counts, 0)
+
+    def generate(self, y, rng=None):
+        rng = np.random if rng is None else rng
+        lam = np.maximum(y, 0) / self.noise_level
+        return self._sample_counts(lam, rng) * self.noise_level - y
+
+
+class PoissonGaussianNoise(PoissonNoise):
+    """
+    Detector-realistic mixed noise: shot noise on the signal plus Gaussian
+    read noise of the electronics.
+
+    The shot-noise count scale is noise_level (the detector gain); the read
+    noise is an additional Gaussian term with standard deviation
+    ``read_noise``.
+    """
+
+    default_params = {
+        "normal_threshold": 1000.0,
+        "read_noise": 0.005,
+    }
+
+    def generate(self, y, rng=None):
+        rng = np.random if rng is None else rng
+        shot = super().generate(y, rng)
+        return shot + rng.normal(0, self.params["read_noise"], size=np.shape(y))
+
+
+class ColoredNoise(NoiseModel):
+    """
+    Colored noise with a 1/f^alpha power spectrum, synthesized via FFT.
+
+    White noise is transformed with a real FFT, shaped by a precomputed
+    spectral filter and transformed back. The filter is normalized so that
+    the resulting noise has standard deviation noise_level. Filters are
+    cached per (points, alpha), so repeated calls only pay for the FFTs;
+    the cache keeps at most max_cached_filters filters and max_cache_bytes
+    bytes and drops the oldest entries first (e.g. when the number of
+    points changes from spectrum to spectrum).
+
+    alpha = 0 gives white noise, alpha = 1 pink (flicker) noise and
+    alpha = 2 brown noise (random-walk-like drift).
+    """
+
+    default_params = {
+        "alpha": 1.0,
+    }
+
+    # Limits of the filter cache shared by all instances
+    max_cached_filters = 32
+    max_cache_bytes = 64 * 2 ** 20
+
+    _filter_cache = {}
+    _cache_bytes = 0
+
+    @classmethod
+    def _get_filter(cls, n, alpha):
+        key = (n, float(alpha))
+        spectral_filter = ColoredNoise._filter_cache.get(key)
+        if spectral_filter is None:
+            freqs = np.fft.rfftfreq(n)
+            spectral_filter = np.zeros_like(freqs)
+            spectral_filter[1:] = freqs[1:] ** (-alpha / 2.0)
+
+            # Interior bins appear twice in the full spectrum, DC and Nyquist once
+            weights = np.full(len(freqs), 2.0)
+            weights[0] = 1.0
+            if n % 2 == 0:
+                weights[-1] = 1.0
+            power = np.sum(weights * spectral_filter ** 2) / n
+            if power > 0:
+                spectral_filter /= np.sqrt(power)
+
+            cls._store_filter(key, spectral_filter)
+        return spectral_filter
+
+    @classmethod
+    def _store_filter(cls, key, spectral_filter):
+        """Cache a filter within the size limits, dropping the oldest first."""
+        if spectral_filter.nbytes > cls.max_cache_bytes:
+            return
+        cache = ColoredNoise._filter_cache
+        while cache and (len(cache) >= cls.max_cached_filters
+                         or ColoredNoise._cache_bytes + spectral_filter.nbytes > cls.max_cache_bytes):
+            ColoredNoise._cache_bytes -= cache.pop(next(iter(cache))).nbytes
+        cache[key] = spectral_filter
+        ColoredNoise._cache_bytes += spectral_filter.nbytes
+
+    def generate(self, y, rng=None):
+        rng = np.random if rng is None else rng
+        shape = np.shape(y)
+        n = shape[-1]
+        if n < 2:
+            return np.zeros(shape)
+        white = rng.standard_normal(shape)
+        spectrum = np.fft.rfft(white, axis=-1) * self._get_filter(n, self.params["alpha"])
+        return np.fft.irfft(spectrum, n=n, axis=-1) * self.noise_level
+
+
+class DriftNoise(NoiseModel):
+    """
+    Slow detector drift modelled as a Gaussian random walk.
+
+    The step size is chosen so that the drift at the last point has a
+    standard deviation of noise_level, independent of the number of points.
+    """
+
+    def generate(self, y, rng=None):
+        rng = np.random if rng is None else rng
+        shape = np.shape(y)
+        n = shape[-1]
+        steps = rng.normal(0, self.noise_level / np.sqrt(max(n, 1)), size=shape)
+        return np.cumsum(steps, axis=-1)
+
+
+class CompositeNoise(NoiseModel):
+    """
+    Sum of several independent noise models.
+    """
+
+    def __init__(self, models):
+        """
+        Initialize the composite noise model.
+
+        Args:
+            models (list): List of NoiseModel instances
+        """
+        super().__init__(max([m.noise_level for m in models], default=0))
+        self.models = models
+
+    def generate(self, y, rng=None):
+        noise = np.zeros(np.shape(y))
+        for model in self.models:
+            if model.noise_level > 0:
+                noise += model.generate(y, rng)
+        return noise
+
+
+# Registry of available noise types
+NOISE_MODELS = {
+    "gaussian": GaussianNoise,
+    "poisson": PoissonNoise,
+    "poisson_gaussian": PoissonGaussianNoise,
+    "colored": ColoredNoise,
+    "pink": ColoredNoise,
+    "drift": DriftNoise,
+}
+
+
+def create_noise_model(noise_type, noise_level, params=None):
+    """
+    Create a noise model from its name.
+
+    Args:
+        noise_type (str or list): Name of the noise type, or a list of names
+            for a composite model
+        noise_level (float): Noise scale
+        params (dict, optional): Model-specific parameters. For composite
+            models, a per-type scale can be given as "<type>_level".
+
+    Returns:
+        NoiseModel: The noise model (unknown types default to gaussian)
+    """
+    params = params or {}
+
+    if isinstance(noise_type, (list, tuple)):
+        models = [
+            create_noise_model(name, params.get(f"{name}_level", noise_level), params)
+            for name in noise_type
+        ]
+        return CompositeNoise(models)
+
+    model_class = NOISE_MODELS.get(noise_type, GaussianNoise)
+    model_params = dict(params)
+    if noise_type == "pink":
+        model_params["alpha"] = 1.0
+    return model_class(noise_level, model_params)
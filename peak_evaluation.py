@@ -0,0 +1,362 @@
+import os
+import sys
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def match_peaks(true_positions, detected_positions, tolerance):
+    """
+    Match detected peaks to true peaks within a position tolerance.
+
+    All peaks are merged into one sorted sequence and split wherever two
+    neighbours are more than tolerance apart; every possible match lies
+    inside one of these clusters. Clusters with exactly one true and one
+    detected peak (the usual case) are matched at once with vectorized
+    operations. Only the remaining ambiguous clusters (several candidates
+    on one side) are solved with the Hungarian algorithm, which maximizes
+    the number of matches and then minimizes the total position error.
+
+    Args:
+        true_positions (array-like): Positions of the true peaks
+        detected_positions (array-like): Positions of the detected peaks
+        tolerance (float): Maximum position difference of a match
+
+    Returns:
+        tuple: (true_index, detected_index) - indices of the matched pairs,
+            ordered by true index
+    """
+    true_positions = np.asarray(true_positions, dtype=float)
+    detected_positions = np.asarray(detected_positions, dtype=float)
+    n_true = len(true_positions)
+    empty = np.zeros(0, dtype=np.int64)
+    if n_true == 0 or len(detected_positions) == 0:
+        return empty, empty
+
+    # Merged sequence: indices < n_true are true peaks, the rest detected peaks
+    positions = np.concatenate([true_positions, detected_positions])
+    order = np.argsort(positions, kind="stable")
+    cluster = np.concatenate([[0], np.cumsum(np.diff(positions[order]) > tolerance)])
+    is_true = order < n_true
+    n_clusters = cluster[-1] + 1
+    true_count = np.bincount(cluster[is_true], minlength=n_clusters)
+    detected_count = np.bincount(cluster[~is_true], minlength=n_clusters)
+
+    # One-to-one clusters: the two members are within tolerance by construction
+    simple = (true_count == 1) & (detected_count == 1)
+    in_simple = simple[cluster]
+    simple_true = order[in_simple & is_true]
+    simple_detected = order[in_simple & ~is_true] - n_true
+    # Both are in cluster order, so the pairs line up
+    pairs_true = [simple_true]
+    pairs_detected = [simple_detected]
+
+    ambiguous = np.flatnonzero((true_count > 0) & (detected_count > 0) & ~simple)
+    if len(ambiguous):
+        from scipy.optimize import linear_sum_assignment
+
+        starts = np.searchsorted(cluster, ambiguous, side="left")
+        ends = np.searchsorted(cluster, ambiguous, side="right")
+        for start, end in zip(starts, ends):
+            members = order[start:end]
+            t_idx = members[members < n_true]
+            d_idx = members[members >= n_true] - n_true
+            cost = np.abs(true_positions[t_idx][:, np.newaxis] - detected_positions[d_idx][np.newaxis, :])
+            # Pairs beyond the tolerance cost more than any set of valid pairs
+            feasible = cost <= tolerance
+            cost = np.where(feasible, cost, tolerance * (len(members) + 1))
+            rows, cols = linear_sum_assignment(cost)
+            keep = feasible[rows, cols]
+            pairs_true.append(t_idx[rows[keep]])
+            pairs_detected.append(d_idx[cols[keep]])
+
+    true_index = np.concatenate(pairs_true)
+    detected_index = np.concatenate(pairs_detected)
+    by_true = np.argsort(true_index, kind="stable")
+    return true_index[by_true], detected_index[by_true]
+
+
+def _relative_error(estimated, reference):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(reference != 0, (estimated - reference) / np.abs(reference), np.nan)
+
+
+def _nan_stat(func, values):
+    return float(func(values)) if len(values) and not np.all(np.isnan(values)) else float("nan")
+
+
+def evaluate_peaks(true_peaks, detected_peaks, tolerance):
+    """
+    Score detected peaks of one run against the true peaks.
+
+    Args:
+        true_peaks: Column mapping with "position", "height" and optionally "area"
+        detected_peaks: Column mapping with "position" and optionally "height" and "area"
+        tolerance (float): Maximum position difference of a match
+
+    Returns:
+        dict: Counts ("n_true", "n_detected", "tp", "fp", "fn"), "precision",
+            "recall", "f1" and error statistics of the matched peaks:
+            "position_mae", "position_bias", "height_mare" and "area_mare"
+            (mean absolute relative errors, NaN if a column is missing)
+    """
+    true_positions = np.asarray(true_peaks["position"], dtype=float)
+    detected_positions = np.asarray(detected_peaks["position"], dtype=float)
+    true_index, detected_index = match_peaks(true_positions, detected_positions, tolerance)
+
+    tp = len(true_index)
+    n_true, n_detected = len(true_positions), len(detected_positions)
+    precision = tp / n_detected if n_detected else float("nan")
+    recall = tp / n_true if n_true else float("nan")
+    f1 = 2 * tp / (n_true + n_detected) if n_true + n_detected else float("nan")
+
+    position_error = detected_positions[detected_index] - true_positions[true_index]
+    result = {
+        "n_true": n_true,
+        "n_detected": n_detected,
+        "tp": tp,
+        "fp": n_detected - tp,
+        "fn": n_true - tp,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "position_mae": _nan_stat(np.mean, np.abs(position_error)),
+        "position_bias": _nan_stat(np.mean, position_error),
+    }
+    for column in ("height", "area"):
+        if column in true_peaks and column in detected_peaks:
+            error = _relative_error(np.asarray(detected_peaks[column], dtype=float)[detected_index],
+                                    np.asarray(true_peaks[column], dtype=float)[true_index])
+            result[f"{column}_mare"] = _nan_stat(np.nanmean, np.abs(error))
+        else:
+            result[f"{column}_mare"] = float("nan")
+    return result
+
+
+def detect_peaks(x, y, params=None):
+    """
+    Default detector: smoothing, baseline correction and local maxima.
+
+    Uses ChunkedChromatogramProcessor on the whole signal as one block.
+
+    Args:
+        x (numpy.ndarray): X-axis values
+        y (numpy.ndarray): Signal values
+        params (dict, optional): Parameters for ChunkedChromatogramProcessor
+            (default: baseline_window 201, min_distance 10, min_height 0.1)
+
+    Returns:
+        dict: Detected peaks with "position" and "height" (baseline corrected)
+    """
+    from chunked_processing import ChunkedChromatogramProcessor
+
+    params = dict({"baseline_window": 201, "min_distance": 10, "min_height": 0.1}, **(params or {}))
+    processor = ChunkedChromatogramProcessor(params)
+    positions, heights = [], []
+    for block in processor.process_blocks([(x, y)]):
+        peaks = block["peak"]
+        positions.append(block["x"][peaks])
+        heights.append(block["corrected"][peaks])
+    return {"position": np.concatenate(positions), "height": np.concatenate(heights)}
+
+
+# Detectors already called once in this process
+_warmed_up = set()
+
+
+def _evaluate_file(task):
+    """Load, detect and score one run (module level, so it can run in worker processes)."""
+    from resampling import load_chromatogram
+    import pandas as pd
+
+    run_id, data_path, truth_path, detector, detector_params, tolerance = task
+    x, y = load_chromatogram(data_path)
+    true_peaks = pd.read_csv(truth_path)
+    if "area" not in true_peaks.columns:
+        from peak_profiles import peak_areas
+
+        lorentz = true_peaks["lorentz_width"].to_numpy(dtype=float) if "lorentz_width" in true_peaks else None
+        true_peaks["area"] = peak_areas(true_peaks["type"].to_numpy(dtype=str),
+                                        true_peaks["height"].to_numpy(dtype=float),
+                                        true_peaks["width"].to_numpy(dtype=float), lorentz)
+
+    if detector not in _warmed_up:
+        # Exclude one-time costs (lazy imports, caches) of the first call in a process from the timing
+        detector(x, y, detector_params)
+        _warmed_up.add(detector)
+    start = time.perf_counter()
+    detected = detector(x, y, detector_params)
+    detect_s = time.perf_counter() - start
+
+    result = {"run_id": run_id, "n_points": len(x), "detect_s": detect_s}
+    result.update(evaluate_peaks(true_peaks, detected, tolerance))
+    return result
+
+
+def find_runs(output_dir):
+    """
+    Pair the chromatogram files of a generated dataset with their true peaks.
+
+    Args:
+        output_dir (str): Output directory of SpectralDataGenerator (with
+            "data" and "peak_info" subdirectories)
+
+    Returns:
+        list: (run_id, data_path, peak_info_path) for every run with both files
+    """
+    runs = []
+    for truth_path in sorted(glob.glob(os.path.join(output_dir, "peak_info", "*_peak_info.csv"))):
+        run_id = os.path.basename(truth_path)[:-len("_peak_info.csv")]
+        data_path = os.path.join(output_dir, "data", f"{run_id}.csv")
+        if os.path.exists(data_path):
+            runs.append((run_id, data_path, truth_path))
+    return runs
+
+
+def summarize(results):
+    """
+    Aggregate per-run results over a dataset.
+
+    Precision and recall are computed from the summed counts (every peak
+    weighs the same); the error statistics are averaged over the runs
+    weighted by their number of matches.
+
+    Args:
+        results (list): Per-run result dicts from evaluate_dataset
+
+    Returns:
+        dict: Totals with the same keys as evaluate_peaks plus "runs",
+            "detect_s" (summed) and "points_per_s"
+    """
+    counts = {key: sum(r[key] for r in results) for key in ("n_true", "n_detected", "tp", "fp", "fn")}
+    summary = {"runs": len(results)}
+    summary.update(counts)
+    tp = counts["tp"]
+    summary["precision"] = tp / counts["n_detected"] if counts["n_detected"] else float("nan")
+    summary["recall"] = tp / counts["n_true"] if counts["n_true"] else float("nan")
+    total = counts["n_true"] + counts["n_detected"]
+    summary["f1"] = 2 * tp / total if total else float("nan")
+
+    weights = np.array([r["tp"] for r in results], dtype=float)
+    for key in ("position_mae", "position_bias", "height_mare", "area_mare"):
+        values = np.array([r[key] for r in results], dtype=float)
+        valid = ~np.isnan(values) & (weights > 0)
+        summary[key] = float(np.average(values[valid], weights=weights[valid])) if valid.any() else float("nan")
+
+    summary["detect_s"] = sum(r["detect_s"] for r in results)
+    n_points = sum(r["n_points"] for r in results)
+    summary["points_per_s"] = n_points / summary["detect_s"] if summary["detect_s"] > 0 else float("nan")
+    return summary
+
+
+def evaluate_dataset(output_dir, detector=detect_peaks, detector_params=None, tolerance=0.05, processes=None):
+    """
+    Score a peak detector against the true peaks of a generated dataset.
+
+    Every run is loaded, processed and scored in a separate worker
+    process. The detector must be a module-level function (so it can be
+    sent to the workers) with the signature detector(x, y, params) that
+    returns a column mapping with "position" and optionally "height" and
+    "area".
+
+    Args:
+        output_dir (str): Output directory of SpectralDataGenerator
+        detector (callable): Peak detector (default: detect_peaks)
+        detector_params (dict, optional): Parameters passed to the detector
+        tolerance (float): Maximum position difference of a match
+        processes (int, optional): Number of worker processes (default:
+            number of CPUs, 1 = run in this process)
+
+    Returns:
+        tuple: (results, summary) - one result dict per run and the totals from summarize
+    """
+    tasks = [(run_id, data_path, truth_path, detector, detector_params, tolerance)
+             for run_id, data_path, truth_path in find_runs(output_dir)]
+    if processes == 1 or len(tasks) <= 1:
+        results = [_evaluate_file(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_evaluate_file, tasks, chunksize=max(1, len(tasks) // 64)))
+    return results, summarize(results)
+
+
+def print_summary(results, summary, max_rows=20):
+    """
+    Print the per-run results and the totals as a table.
+
+    Args:
+        results (list): Per-run results from evaluate_dataset
+        summary (dict): Totals from summarize
+        max_rows (int): Maximum number of per-run rows (worst F1 first)
+    """
+    def fmt(value, digits=3):
+        return "-" if value != value else f"{value:.{digits}f}"
+
+    header = (f"{'Run':<24} {'true':>5} {'det.':>5} {'TP':>5} {'prec.':>6} {'recall':>6} "
+              f"{'pos. MAE':>9} {'height':>7} {'area':>7} {'ms':>8}")
+    print(header)
+    for r in sorted(results, key=lambda r: (r["f1"] if r["f1"] == r["f1"] else -1.0))[:max_rows]:
+        print(f"{r['run_id']:<24} {r['n_true']:>5} {r['n_detected']:>5} {r['tp']:>5} "
+              f"{fmt(r['precision']):>6} {fmt(r['recall']):>6} {fmt(r['position_mae'], 4):>9} "
+              f"{fmt(r['height_mare']):>7} {fmt(r['area_mare']):>7} {r['detect_s'] * 1000:>8.1f}")
+    if len(results) > max_rows:
+        print(f"... {len(results) - max_rows} more runs")
+    print("-" * len(header))
+    print(f"{'Total (' + str(summary['runs']) + ' runs)':<24} {summary['n_true']:>5} {summary['n_detected']:>5} "
+          f"{summary['tp']:>5} {fmt(summary['precision']):>6} {fmt(summary['recall']):>6} "
+          f"{fmt(summary['position_mae'], 4):>9} {fmt(summary['height_mare']):>7} "
+          f"{fmt(summary['area_mare']):>7} {summary['detect_s'] * 1000:>8.1f}")
+    print(f"Detection throughput: {summary['points_per_s']:.0f} points/s")
+
+
+def check_summary(summary, min_precision=None, min_recall=None, max_position_mae=None, min_points_per_s=None):
+    """
+    Compare the totals with quality and speed limits.
+
+    Args:
+        summary (dict): Totals from summarize
+        min_precision (float, optional): Minimum precision
+        min_recall (float, optional): Minimum recall
+        max_position_mae (float, optional): Maximum mean absolute position error
+        min_points_per_s (float, optional): Minimum detection throughput
+
+    Returns:
+        list: Error messages, empty if all limits are met
+    """
+    failures = []
+    if min_precision is not None and not summary["precision"] >= min_precision:
+        failures.append(f"precision {summary['precision']:.3f} < {min_precision}")
+    if min_recall is not None and not summary["recall"] >= min_recall:
+        failures.append(f"recall {summary['recall']:.3f} < {min_recall}")
+    if max_position_mae is not None and not summary["position_mae"] <= max_position_mae:
+        failures.append(f"position MAE {summary['position_mae']:.4f} > {max_position_mae}")
+    if min_points_per_s is not None and not summary["points_per_s"] >= min_points_per_s:
+        failures.append(f"throughput {summary['points_per_s']:.0f} points/s < {min_points_per_s}")
+    return failures
+
+
+# Main program: generate a dataset, score the default detector and exit with status 1 on regressions
+if __name__ == "__main__":
+    import tempfile
+    from data_generation import SpectralDataGenerator
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generator = SpectralDataGenerator({"output_dir": tmp_dir, "num_points": 2000, "num_peaks": 8,
+                                           "peak_types": ["gaussian", "lorentzian", "voigt"]})
+        np.random.seed(0)
+        generator.generate_dataset(n_spectra=40, save=True, plot=False)
+
+        start = time.perf_counter()
+        results, summary = evaluate_dataset(tmp_dir, tolerance=0.05)
+        print(f"Evaluated {summary['runs']} runs in {time.perf_counter() - start:.2f} s\n")
+        print_summary(results, summary, max_rows=10)
+
+    failures = check_summary(summary, min_precision=0.5, min_recall=0.5, max_position_mae=0.02)
+    if failures:
+        print("\nEvaluation regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("All evaluation checks passed.")
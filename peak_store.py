@@ -0,0 +1,338 @@
+import os
+import glob
+
+import numpy as np
+
+from measurement_statistics import factorize_groups
+
+# Numeric columns of a peak table
+PEAK_COLUMNS = ("position", "height", "width", "area")
+
+# Version of the file layout written by PeakStore.save
+STORE_FORMAT_VERSION = 1
+
+
+class PeakStore:
+    """
+    Columnar store for the peak tables of many runs with indexed queries.
+
+    All peaks are held in one array per column, sorted by position, so a
+    retention-time window is found with two binary searches and returned
+    as a contiguous slice (O(log n + k)). A second index orders the rows by
+    (run, position) with the start offset of every run, so the peaks of
+    one run, or of one run within a window, are found the same way.
+    Run IDs and peak shapes are stored as integer codes into sorted label
+    arrays. Indexes on other columns (e.g. area) are built on first use.
+    The store is saved as an uncompressed or compressed .npz file
+    containing only plain arrays, including the indexes, so loading it
+    needs no sorting.
+    """
+
+    def __init__(self, run_ids, positions, heights, widths, areas=None, shapes=None):
+        """
+        Build the store from row-wise peak data.
+
+        Args:
+            run_ids (array-like): Run ID per peak (e.g. file name or sample number)
+            positions (array-like): Peak positions (retention times)
+            heights (array-like): Peak heights
+            widths (array-like): Peak widths
+            areas (array-like, optional): Peak areas (NaN if None)
+            shapes (array-like, optional): Peak shape per peak, e.g. "gaussian"
+                ("unknown" if None)
+        """
+        positions = np.asarray(positions, dtype=float)
+        n = len(positions)
+        columns = {
+            "position": positions,
+            "height": np.asarray(heights, dtype=float),
+            "width": np.asarray(widths, dtype=float),
+            "area": np.asarray(areas, dtype=float) if areas is not None else np.full(n, np.nan),
+        }
+        for name, values in columns.items():
+            if len(values) != n:
+                raise ValueError(f"Column '{name}' has {len(values)} values, expected {n}.")
+        run_ids = np.asarray(run_ids)
+        shapes = np.asarray(shapes) if shapes is not None else np.full(n, "unknown")
+        if len(run_ids) != n or len(shapes) != n:
+            raise ValueError(f"Expected {n} run IDs and shapes.")
+
+        runs, run_codes = factorize_groups(run_ids) if n else (run_ids[:0], np.zeros(0, dtype=np.int64))
+        shape_labels, shape_codes = factorize_groups(shapes) if n else (np.array([], dtype=str), np.zeros(0))
+
+        # Rows sorted by position, ties by run
+        order = np.lexsort((run_codes, positions))
+        columns = {name: values[order] for name, values in columns.items()}
+        columns["run"] = run_codes[order].astype(np.int32)
+        columns["shape"] = shape_codes[order].astype(np.int16)
+        self._set_data(runs, shape_labels, columns)
+
+    def _set_data(self, runs, shapes, columns, run_order=None):
+        """Store the sorted columns and build (or reuse) the run index."""
+        self.runs = np.asarray(runs)
+        self.shapes = np.asarray(shapes)
+        self.columns = columns
+        if run_order is None:
+            # Stable sort keeps the position order within every run
+            run_order = np.argsort(columns["run"], kind="stable")
+        self._run_order = run_order
+        self._run_positions = columns["position"][run_order]
+        counts = np.bincount(columns["run"], minlength=len(self.runs))
+        self._run_ends = np.cumsum(counts)
+        self._run_starts = self._run_ends - counts
+        self._value_indexes = {"position": None}
+
+    @classmethod
+    def from_tables(cls, tables):
+        """
+        Build the store from one peak table per run.
+
+        Args:
+            tables (dict): Peak table per run ID; every table is a column
+                mapping (dict of arrays or DataFrame) with "position",
+                "height", "width" and optionally "area" and "shape" (or
+                "type", as in the _peak_info.csv files)
+
+        Returns:
+            PeakStore: The store
+        """
+        parts = {name: [] for name in ("run", "position", "height", "width", "area", "shape")}
+        for run_id, table in tables.items():
+            n = len(np.asarray(table["position"]))
+            shape_column = "shape" if "shape" in table else "type" if "type" in table else None
+            parts["run"].append(np.full(n, run_id))
+            for name in ("position", "height", "width"):
+                parts[name].append(np.asarray(table[name], dtype=float))
+            parts["area"].append(np.asarray(table["area"], dtype=float) if "area" in table
+                                 else np.full(n, np.nan))
+            parts["shape"].append(np.asarray(table[shape_column]).astype(str) if shape_column
+                                  else np.full(n, "unknown"))
+
+        if not tables:
+            return cls([], [], [], [])
+        joined = {name: np.concatenate(values) for name, values in parts.items()}
+        return cls(joined["run"], joined["position"], joined["height"], joined["width"],
+                   joined["area"], joined["shape"])
+
+    @classmethod
+    def from_peak_info_dir(cls, directory):
+        """
+        Collect all *_peak_info.csv files of a directory into one store.
+
+        The run ID is the file name without "_peak_info.csv". Missing areas
+        are computed from the peak shape parameters (see peak_profiles.peak_areas).
+
+        Args:
+            directory (str): Directory with _peak_info.csv files (e.g. output_dir/peak_info)
+
+        Returns:
+            PeakStore: The store
+        """
+        import pandas as pd
+        from peak_profiles import peak_areas
+
+        tables = {}
+        for filepath in sorted(glob.glob(os.path.join(directory, "*_peak_info.csv"))):
+            df = pd.read_csv(filepath)
+            if "area" not in df.columns:
+                lorentz = df["lorentz_width"].to_numpy(dtype=float) if "lorentz_width" in df.columns else None
+                df["area"] = peak_areas(df["type"].to_numpy(dtype=str), df["height"].to_numpy(dtype=float),
+                                        df["width"].to_numpy(dtype=float), lorentz)
+            tables[os.path.basename(filepath)[:-len("_peak_info.csv")]] = df
+        return cls.from_tables(tables)
+
+    def __len__(self):
+        return len(self.columns["position"])
+
+    def _rows(self, index):
+        """Peak table of the given rows (slice or index array) with run and shape labels."""
+        table = {"run_id": self.runs[self.columns["run"][index]]}
+        for name in PEAK_COLUMNS:
+            table[name] = self.columns[name][index]
+        table["shape"] = self.shapes[self.columns["shape"][index]]
+        return table
+
+    def _run_code(self, run_id):
+        """Code of a run ID, or None if the store has no peaks of that run."""
+        if len(self.runs) == 0:
+            return None
+        code = int(np.searchsorted(self.runs, run_id))
+        if code < len(self.runs) and self.runs[code] == run_id:
+            return code
+        return None
+
+    def position_range(self, low, high, run_id=None):
+        """
+        Peaks with low <= position <= high, ordered by position.
+
+        Args:
+            low (float): Lower position limit
+            high (float): Upper position limit
+            run_id (optional): Restrict the query to one run
+
+        Returns:
+            dict: Peak table with "run_id", "position", "height", "width",
+                "area" and "shape" (use pandas.DataFrame(result) for a table)
+        """
+        if run_id is None:
+            positions = self.columns["position"]
+            start = np.searchsorted(positions, low, side="left")
+            end = np.searchsorted(positions, high, side="right")
+            return self._rows(slice(start, end))
+
+        code = self._run_code(run_id)
+        if code is None:
+            return self._rows(slice(0, 0))
+        run_start, run_end = self._run_starts[code], self._run_ends[code]
+        positions = self._run_positions[run_start:run_end]
+        start = run_start + np.searchsorted(positions, low, side="left")
+        end = run_start + np.searchsorted(positions, high, side="right")
+        return self._rows(self._run_order[start:end])
+
+    def near(self, position, tolerance, run_id=None):
+        """
+        Peaks within position +- tolerance, e.g. near(4.2, 0.05).
+
+        Args:
+            position (float): Target position
+            tolerance (float): Allowed deviation
+            run_id (optional): Restrict the query to one run
+
+        Returns:
+            dict: Peak table as in position_range
+        """
+        return self.position_range(position - tolerance, position + tolerance, run_id)
+
+    def run(self, run_id):
+        """
+        All peaks of one run, ordered by position.
+
+        Args:
+            run_id: Run ID
+
+        Returns:
+            dict: Peak table as in position_range
+        """
+        return self.position_range(-np.inf, np.inf, run_id)
+
+    def _value_index(self, column):
+        """Row order sorted by a column, built on first use."""
+        if column not in PEAK_COLUMNS:
+            raise ValueError(f"Unknown column: {column}. Use one of {PEAK_COLUMNS}.")
+        index = self._value_indexes.get(column)
+        if index is None and column != "position":
+            index = np.argsort(self.columns[column], kind="stable")
+            self._value_indexes[column] = index
+        return index
+
+    def value_range(self, column, low=-np.inf, high=np.inf):
+        """
+        Peaks with low <= column value <= high, ordered by that value.
+
+        Args:
+            column (str): "position", "height", "width" or "area"
+            low (float): Lower limit
+            high (float): Upper limit
+
+        Returns:
+            dict: Peak table as in position_range
+        """
+        if column == "position":
+            return self.position_range(low, high)
+        index = self._value_index(column)
+        values = self.columns[column][index]
+        start = np.searchsorted(values, low, side="left")
+        end = np.searchsorted(values, high, side="right")
+        return self._rows(index[start:end])
+
+    def runs_where(self, column, low=-np.inf, high=np.inf):
+        """
+        Runs with at least one peak with low <= column value <= high.
+
+        Example: runs_where("area", low=5.0) lists all runs with a peak area of at least 5.
+
+        Args:
+            column (str): "position", "height", "width" or "area"
+            low (float): Lower limit
+            high (float): Upper limit
+
+        Returns:
+            numpy.ndarray: Sorted run IDs
+        """
+        return np.unique(self.value_range(column, low, high)["run_id"])
+
+    def save(self, filepath, compressed=False):
+        """
+        Save the store as a binary .npz file.
+
+        Args:
+            filepath (str): Target file (".npz" is appended by numpy if missing)
+            compressed (bool): Whether to compress the arrays (smaller, slower)
+        """
+        arrays = {f"column_{name}": values for name, values in self.columns.items()}
+        arrays.update({
+            "version": np.array(STORE_FORMAT_VERSION),
+            "runs": self.runs,
+            "shapes": self.shapes.astype(str),
+            # Row numbers fit in 32 bits for any practical store
+            "run_order": self._run_order.astype(np.int32 if len(self) < 2 ** 31 else np.int64),
+        })
+        (np.savez_compressed if compressed else np.savez)(filepath, **arrays)
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Load a store saved with save.
+
+        Args:
+            filepath (str): Path to the .npz file
+
+        Returns:
+            PeakStore: The store
+        """
+        with np.load(filepath, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != STORE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported peak store version: {version}")
+            columns = {key[len("column_"):]: data[key] for key in data.files if key.startswith("column_")}
+            store = cls.__new__(cls)
+            store._set_data(data["runs"], data["shapes"], columns, data["run_order"])
+        return store
+
+
+# Example: a store of simulated peak tables from many runs
+if __name__ == "__main__":
+    import time
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    n_runs, peaks_per_run = 5000, 40
+    tables = {}
+    for run in range(n_runs):
+        positions = np.sort(rng.uniform(1, 20, peaks_per_run))
+        heights = rng.uniform(0.1, 2.0, peaks_per_run)
+        widths = rng.uniform(0.02, 0.1, peaks_per_run)
+        tables[f"chromatogram-{run:05d}"] = {
+            "position": positions, "height": heights, "width": widths,
+            "area": heights * widths * np.sqrt(2 * np.pi), "shape": np.full(peaks_per_run, "gaussian"),
+        }
+
+    start = time.perf_counter()
+    store = PeakStore.from_tables(tables)
+    print(f"{len(store)} peaks of {n_runs} runs indexed in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    hits = store.near(4.2, 0.05)
+    print(f"Peaks at 4.2 +- 0.05: {len(hits['position'])} ({(time.perf_counter() - start) * 1000:.2f} ms)")
+    start = time.perf_counter()
+    large = store.runs_where("area", low=0.45)
+    print(f"Runs with area >= 0.45: {len(large)} ({(time.perf_counter() - start) * 1000:.2f} ms)")
+    print(f"Peaks of run 42 between 5 and 6: {store.position_range(5, 6, 'chromatogram-00042')['position']}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "peaks.npz")
+        store.save(path)
+        start = time.perf_counter()
+        loaded = PeakStore.load(path)
+        print(f"Saved {os.path.getsize(path) / 1e6:.1f} MB, loaded in {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"same query result: {np.array_equal(loaded.near(4.2, 0.05)['run_id'], hits['run_id'])}")
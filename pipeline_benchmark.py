@@ -0,0 +1,314 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import itertools
+import subprocess
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Stages of the pipeline in the order they are run
+STAGES = ["generate", "save_csv", "load_csv", "save_binary", "load_binary",
+          "smooth", "baseline", "detect", "fit"]
+
+# Default workloads: (points per trace, peaks per trace, spectra per batch, noise type)
+DEFAULT_WORKLOADS = [
+    (1_000, 5, 200, "gaussian"),
+    (100_000, 20, 20, "gaussian"),
+    (100_000, 20, 20, "poisson_gaussian"),
+    (1_000_000, 50, 4, "gaussian"),
+]
+
+
+def build_workloads(points, peaks, batch_sizes, noise_types):
+    """
+    Build all combinations of the workload parameters.
+
+    Args:
+        points (list): Points per trace, e.g. [1000, 100000, 10000000]
+        peaks (list): Peaks per trace
+        batch_sizes (list): Spectra per workload
+        noise_types (list): Noise types of SpectralDataGenerator
+
+    Returns:
+        list: One workload dict per combination
+    """
+    return [{"name": f"{n}pts-{p}peaks-{b}x-{noise}", "num_points": n, "num_peaks": p,
+             "batch_size": b, "noise_type": noise}
+            for n, p, b, noise in itertools.product(points, peaks, batch_sizes, noise_types)]
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _odd(n):
+    return int(n) | 1
+
+
+def _fit_peaks(x, y, positions, half_window, max_peaks):
+    """Fit a Gaussian to the neighbourhood of the largest detected peaks."""
+    from scipy.optimize import curve_fit
+
+    def gaussian(t, height, position, sigma, offset):
+        return height * np.exp(-0.5 * ((t - position) / sigma) ** 2) + offset
+
+    # Fitting cost should not grow with the sampling rate: at most ~400 points per window
+    stride = max(1, (2 * half_window) // 400)
+    fitted = failed = 0
+    for position in positions[:max_peaks]:
+        center = int(np.searchsorted(x, position))
+        window = slice(max(center - half_window, 0), min(center + half_window + 1, len(x)), stride)
+        xs, ys = x[window], y[window]
+        p0 = (ys.max() - ys.min(), position, (xs[-1] - xs[0]) / 6 or 1.0, ys.min())
+        try:
+            curve_fit(gaussian, xs, ys, p0=p0, maxfev=2000)
+            fitted += 1
+        except (RuntimeError, ValueError):
+            failed += 1
+    return fitted, failed
+
+
+def run_workload(workload, max_fit_peaks=20):
+    """
+    Run all pipeline stages for one workload and measure them.
+
+    Every spectrum of the batch is generated with SpectralDataGenerator,
+    written to and read back from CSV and from a binary .npy file,
+    smoothed (Savitzky-Golay), baseline corrected (morphological opening),
+    searched for peaks and the largest peaks are fitted with a Gaussian.
+    Window lengths scale with the number of points.
+
+    Args:
+        workload (dict): Workload from build_workloads
+        max_fit_peaks (int): Maximum number of fitted peaks per spectrum
+
+    Returns:
+        dict: The workload, seconds and throughput (spectra/s, points/s)
+            per stage, detected/fitted peak counts and the peak RSS in MB
+    """
+    from data_generation import SpectralDataGenerator
+    from resampling import load_chromatogram
+    from chunked_processing import savgol_stream, rolling_extreme_stream, peak_stream
+    # The stages import these lazily; load them here so import time is not counted as stage time
+    import pandas, scipy.signal, scipy.ndimage, scipy.optimize  # noqa: F401
+
+    n_points = workload["num_points"]
+    batch_size = workload["batch_size"]
+    baseline_window = _odd(max(n_points // 50, 3))
+    min_distance = max(n_points // 1000, 2)
+    seconds = dict.fromkeys(STAGES, 0.0)
+    counts = {"detected": 0, "fitted": 0, "fit_failed": 0}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        seconds[stage] += time.perf_counter() - start
+        return result
+
+    np.random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generator = SpectralDataGenerator({
+            "output_dir": tmp_dir,
+            "num_points": n_points,
+            "num_peaks": workload["num_peaks"],
+            "noise_type": workload["noise_type"],
+        })
+        binary_path = os.path.join(tmp_dir, "spectrum.npy")
+        for _ in range(batch_size):
+            x, y, _ = timed("generate", generator.generate_spectrum)
+
+            csv_path = timed("save_csv", generator.save_spectrum, x, y, "spectrum.csv")
+            x, y = timed("load_csv", load_chromatogram, csv_path)
+            timed("save_binary", np.save, binary_path, np.column_stack([x, y]))
+            x, y = timed("load_binary", np.load, binary_path).T
+
+            smoothed = timed("smooth", savgol_stream(11, 3).feed, y, True)
+            baseline = timed("baseline", lambda s: rolling_extreme_stream(baseline_window, "max").feed(
+                rolling_extreme_stream(baseline_window, "min").feed(s, True), True), smoothed)
+            corrected = smoothed - baseline
+            peaks = timed("detect", peak_stream(0.1, min_distance).feed, corrected, True)
+
+            # Largest peaks first
+            peak_index = np.flatnonzero(peaks)
+            peak_index = peak_index[np.argsort(corrected[peak_index])[::-1]]
+            half_window = max(int(0.3 / (x[1] - x[0])), 5)
+            fitted, failed = timed("fit", _fit_peaks, x, corrected, x[peak_index], half_window, max_fit_peaks)
+            counts["detected"] += len(peak_index)
+            counts["fitted"] += fitted
+            counts["fit_failed"] += failed
+
+    stages = {}
+    for stage, value in seconds.items():
+        stages[stage] = {
+            "seconds": value,
+            "spectra_per_s": batch_size / value if value > 0 else None,
+            "points_per_s": batch_size * n_points / value if value > 0 else None,
+        }
+    total = sum(seconds.values())
+    return {
+        "workload": workload,
+        "stages": stages,
+        "total_s": total,
+        "spectra_per_s": batch_size / total if total > 0 else None,
+        "points_per_s": batch_size * n_points / total if total > 0 else None,
+        "peaks": counts,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_benchmarks(workloads, isolate=True, max_fit_peaks=20):
+    """
+    Run several workloads.
+
+    With isolate=True every workload runs in a freshly started
+    interpreter, so the peak RSS belongs to that workload alone and no
+    caches or imports carry over between workloads.
+
+    Args:
+        workloads (list): Workloads from build_workloads
+        isolate (bool): Whether to run every workload in its own process
+        max_fit_peaks (int): Maximum number of fitted peaks per spectrum
+
+    Returns:
+        list: One result dict per workload (see run_workload)
+    """
+    results = []
+    for workload in workloads:
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results.append(executor.submit(run_workload, workload, max_fit_peaks).result())
+        else:
+            results.append(run_workload(workload, max_fit_peaks))
+    return results
+
+
+def environment_info():
+    """
+    Describe the environment of a benchmark run.
+
+    Returns:
+        dict: Time stamp, git commit, Python/NumPy versions, platform and CPU count
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(filepath, results):
+    """
+    Write the results with the environment description to a JSON file.
+
+    Args:
+        filepath (str): Output file
+        results (list): Results from run_benchmarks
+    """
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump({"environment": environment_info(), "results": results}, f, indent=2)
+
+
+def compare_results(baseline, results, tolerance=0.25, min_seconds=0.01):
+    """
+    Compare stage times with an earlier run.
+
+    Args:
+        baseline (dict): Content of an earlier results file
+        results (list): Current results from run_benchmarks
+        tolerance (float): Allowed relative slowdown (0.25 = 25 %)
+        min_seconds (float): Stages faster than this in both runs are
+            ignored (too noisy)
+
+    Returns:
+        list: Error messages for every slower stage
+    """
+    previous = {r["workload"]["name"]: r for r in baseline["results"]}
+    failures = []
+    for result in results:
+        name = result["workload"]["name"]
+        if name not in previous:
+            continue
+        for stage, current in result["stages"].items():
+            before = previous[name]["stages"].get(stage, {}).get("seconds")
+            now = current["seconds"]
+            if before is None or max(before, now) < min_seconds:
+                continue
+            if now > before * (1.0 + tolerance):
+                failures.append(f"{name} {stage}: {now:.3f} s (before {before:.3f} s, +{now / before - 1:.0%})")
+    return failures
+
+
+def print_results(results):
+    """
+    Print the stage times and throughput of all workloads as a table.
+
+    Args:
+        results (list): Results from run_benchmarks
+    """
+    print(f"{'Workload':<38} " + " ".join(f"{stage:>11}" for stage in STAGES)
+          + f" {'spectra/s':>10} {'Mpts/s':>8} {'RSS MB':>7}")
+    for r in results:
+        times = " ".join(f"{r['stages'][stage]['seconds'] * 1000:>9.1f}ms" for stage in STAGES)
+        rss = "-" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:.0f}"
+        print(f"{r['workload']['name']:<38} {times} {r['spectra_per_s']:>10.2f} "
+              f"{r['points_per_s'] / 1e6:>8.2f} {rss:>7}")
+
+
+# Main program: run the workloads, write the results and exit with status 1 on regressions
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of the chromatogram pipeline")
+    parser.add_argument("--points", type=int, nargs="+", help="Points per trace, e.g. 1000 100000 10000000")
+    parser.add_argument("--peaks", type=int, nargs="+", default=[20], help="Peaks per trace")
+    parser.add_argument("--batch", type=int, nargs="+", default=[10], help="Spectra per workload")
+    parser.add_argument("--noise", nargs="+", default=["gaussian"], help="Noise types")
+    parser.add_argument("--max-fit-peaks", type=int, default=20, help="Fitted peaks per spectrum")
+    parser.add_argument("--no-isolate", action="store_true", help="Run all workloads in this process")
+    parser.add_argument("--output", default="pipeline_benchmark.json", help="JSON file for the results")
+    parser.add_argument("--baseline", default=None, help="Earlier results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    if args.points:
+        workloads = build_workloads(args.points, args.peaks, args.batch, args.noise)
+    else:
+        workloads = [dict(name=f"{n}pts-{p}peaks-{b}x-{noise}", num_points=n, num_peaks=p,
+                          batch_size=b, noise_type=noise) for n, p, b, noise in DEFAULT_WORKLOADS]
+
+    start = time.perf_counter()
+    results = run_benchmarks(workloads, isolate=not args.no_isolate, max_fit_peaks=args.max_fit_peaks)
+    print_results(results)
+    print(f"\nTotal benchmark time: {time.perf_counter() - start:.1f} s")
+    write_results(args.output, results)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures = compare_results(json.load(f), results, args.tolerance)
+        if failures:
+            print("\nPerformance regressions:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("No performance regressions.")
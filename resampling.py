@@ -0,0 +1,241 @@
+import os
+import hashlib
+import numpy as np
+
+
+def axis_key(x):
+    """
+    Collision-safe key of an axis, for caches keyed by axis values.
+
+    Uniform axes (as from numpy.linspace) are described exactly by their
+    first and last value and the number of points, all other axes by a
+    cryptographic digest of their values.
+
+    Args:
+        x (numpy.ndarray): Axis values
+
+    Returns:
+        tuple: Hashable key; equal keys mean equal axes
+    """
+    x = np.ascontiguousarray(x, dtype=float)
+    n = len(x)
+    if n >= 2 and np.array_equal(x, np.linspace(x[0], x[-1], n)):
+        return ("uniform", float(x[0]), float(x[-1]), n)
+    return ("digest", n, hashlib.blake2b(x.tobytes(), digest_size=20).hexdigest())
+
+
+class ResamplingPlan:
+    """
+    Precomputed linear interpolation from a source axis onto a target axis.
+
+    The plan stores, for every target point, the index of the right-hand
+    source neighbour and the interpolation weight. Applying the plan to any
+    number of signals recorded on the same source axis is then a pair of
+    gathers and a weighted sum, without searching the axis again.
+    """
+
+    def __init__(self, x_source, x_target, fill_value=np.nan):
+        """
+        Build the index and weight tables.
+
+        Args:
+            x_source (numpy.ndarray): Strictly increasing source axis
+            x_target (numpy.ndarray): Target axis
+            fill_value (float): Value for target points outside the source
+                range. Use None to extrapolate with the edge values.
+        """
+        x_source = np.asarray(x_source, dtype=float)
+        x_target = np.asarray(x_target, dtype=float)
+        if len(x_source) < 2:
+            raise ValueError("Source axis needs at least two points.")
+
+        idx = np.searchsorted(x_source, x_target)
+        idx = np.clip(idx, 1, len(x_source) - 1)
+        left = x_source[idx - 1]
+        right = x_source[idx]
+        weight = (x_target - left) / (right - left)
+
+        self.index = idx
+        self.weight = np.clip(weight, 0.0, 1.0)
+        self.outside = (x_target < x_source[0]) | (x_target > x_source[-1])
+        self.fill_value = fill_value
+        self.n_source = len(x_source)
+        self.n_target = len(x_target)
+
+    def apply(self, y):
+        """
+        Resample signal(s) recorded on the source axis.
+
+        Args:
+            y (numpy.ndarray): Signal(s), shape (points,) or (batch, points)
+
+        Returns:
+            numpy.ndarray: Resampled signal(s) on the target axis
+        """
+        y = np.asarray(y, dtype=float)
+        if y.shape[-1] != self.n_source:
+            raise ValueError(
+                f"Signal length {y.shape[-1]} does not match source axis length {self.n_source}."
+            )
+        result = y[..., self.index - 1] * (1.0 - self.weight) + y[..., self.index] * self.weight
+        if self.fill_value is not None:
+            result[..., self.outside] = self.fill_value
+        return result
+
+
+def build_common_axis(axes, num_points=None, mode="intersection"):
+    """
+    Build a uniform axis covering a set of chromatogram axes.
+
+    Args:
+        axes (list): List of x-axis arrays
+        num_points (int, optional): Number of points. If None, the median
+            sampling interval of all axes is kept.
+        mode (str): "intersection" (range covered by all axes) or "union"
+
+    Returns:
+        numpy.ndarray: Common uniform axis
+    """
+    starts = np.array([a[0] for a in axes], dtype=float)
+    ends = np.array([a[-1] for a in axes], dtype=float)
+
+    if mode == "union":
+        x_min, x_max = starts.min(), ends.max()
+    else:
+        x_min, x_max = starts.max(), ends.min()
+    if x_max <= x_min:
+        raise ValueError("The axes do not overlap.")
+
+    if num_points is None:
+        step = np.median([np.median(np.diff(a)) for a in axes])
+        num_points = int(round((x_max - x_min) / step)) + 1
+
+    return np.linspace(x_min, x_max, num_points)
+
+
+class Resampler:
+    """
+    Puts batches of chromatograms with different axes onto a common axis.
+
+    Resampling plans are cached per (source axis, target axis) pair, so
+    runs recorded with the same instrument settings reuse the precomputed
+    tables, and all chromatograms sharing an axis are resampled together
+    in one vectorized operation.
+    """
+
+    def __init__(self, fill_value=np.nan, max_cached_plans=256):
+        """
+        Initialize the resampler.
+
+        Args:
+            fill_value (float): Value for points outside a source axis (None to extrapolate)
+            max_cached_plans (int): Maximum number of cached plans
+        """
+        self.fill_value = fill_value
+        self.max_cached_plans = max_cached_plans
+        self._plans = {}
+
+    def get_plan(self, x_source, x_target):
+        """
+        Get the (cached) resampling plan for an axis pair.
+
+        Args:
+            x_source (numpy.ndarray): Source axis
+            x_target (numpy.ndarray): Target axis
+
+        Returns:
+            ResamplingPlan: The resampling plan
+        """
+        key = (axis_key(x_source), axis_key(x_target))
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= self.max_cached_plans:
+                self._plans.pop(next(iter(self._plans)))
+            plan = ResamplingPlan(x_source, x_target, self.fill_value)
+            self._plans[key] = plan
+        return plan
+
+    def resample_batch(self, axes, signals, x_target=None, num_points=None, mode="intersection"):
+        """
+        Resample a batch of chromatograms onto a common axis.
+
+        Args:
+            axes (list): x-axis array of each chromatogram
+            signals (list): y-values of each chromatogram
+            x_target (numpy.ndarray, optional): Target axis. If None, a common
+                axis is built with build_common_axis.
+            num_points (int, optional): Number of points of the built axis
+            mode (str): "intersection" or "union" for the built axis
+
+        Returns:
+            tuple: (x_target, resampled) with resampled of shape (batch, points)
+        """
+        if len(axes) != len(signals):
+            raise ValueError("Number of axes and signals must match.")
+        if x_target is None:
+            x_target = build_common_axis(axes, num_points=num_points, mode=mode)
+
+        resampled = np.empty((len(signals), len(x_target)))
+
+        # Group chromatograms that share a source axis
+        groups = {}
+        for i, x in enumerate(axes):
+            groups.setdefault(axis_key(x), []).append(i)
+
+        for indices in groups.values():
+            plan = self.get_plan(axes[indices[0]], x_target)
+            block = np.stack([np.asarray(signals[i], dtype=float) for i in indices])
+            resampled[indices] = plan.apply(block)
+
+        return x_target, resampled
+
+
+def load_chromatogram(filepath):
+    """
+    Load x and y values of a chromatogram CSV file.
+
+    Uses the columns 'x' and 'y' if present, otherwise the first two columns.
+
+    Args:
+        filepath (str): Path to the CSV file
+
+    Returns:
+        tuple: (x, y) as NumPy arrays
+    """
+    import pandas as pd
+
+    df = pd.read_csv(filepath)
+    if "x" in df.columns and "y" in df.columns:
+        return df["x"].to_numpy(dtype=float), df["y"].to_numpy(dtype=float)
+    return df.iloc[:, 0].to_numpy(dtype=float), df.iloc[:, 1].to_numpy(dtype=float)
+
+
+def load_aligned_chromatograms(directory, num_points=None, mode="intersection", resampler=None):
+    """
+    Load all chromatogram CSV files of a directory onto a common axis.
+
+    Component files (*_components.csv) are skipped.
+
+    Args:
+        directory (str): Directory with CSV files
+        num_points (int, optional): Number of points of the common axis
+        mode (str): "intersection" or "union"
+        resampler (Resampler, optional): Resampler to reuse cached plans
+
+    Returns:
+        tuple: (filenames, x_common, y_matrix) with y_matrix of shape (files, points)
+    """
+    filenames = sorted(
+        f for f in os.listdir(directory)
+        if f.lower().endswith(".csv") and not f.endswith("_components.csv")
+    )
+    axes, signals = [], []
+    for filename in filenames:
+        x, y = load_chromatogram(os.path.join(directory, filename))
+        axes.append(x)
+        signals.append(y)
+
+    if resampler is None:
+        resampler = Resampler()
+    x_common, y_matrix = resampler.resample_batch(axes, signals, num_points=num_points, mode=mode)
+    return filenames, x_common, y_matrix